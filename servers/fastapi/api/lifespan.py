@@ -3,7 +3,13 @@ import os
 
 from fastapi import FastAPI
 
+from clients.comfyui_client import close_comfyui_clients
 from services.database import create_db_and_tables
+from services.document_parse_pool import DOCUMENT_PARSE_POOL
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.libreoffice_pool import LIBREOFFICE_POOL
+from services.pdf_rasterizer import PDF_RASTERIZER
+from services.pptx_render_pool import PPTX_RENDER_POOL
 from utils.get_env import get_app_data_directory_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
@@ -15,9 +21,18 @@ async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
     Initializes the application data directory and checks LLM model availability.
+    The icons index and the docling converters warm up in the background so
+    startup does not wait for them.
 
     """
     os.makedirs(get_app_data_directory_env(), exist_ok=True)
+    ICON_FINDER_SERVICE.start_warm_up()
+    DOCUMENT_PARSE_POOL.start_warm_up()
     await create_db_and_tables()
     await check_llm_and_image_provider_api_or_model_availability()
     yield
+    await close_comfyui_clients()
+    PPTX_RENDER_POOL.shutdown()
+    PDF_RASTERIZER.shutdown()
+    DOCUMENT_PARSE_POOL.shutdown()
+    await LIBREOFFICE_POOL.shutdown()
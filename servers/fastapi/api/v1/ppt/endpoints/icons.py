@@ -1,5 +1,6 @@
 from typing import List
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from services.icon_finder_service import ICON_FINDER_SERVICE
 
 ICONS_ROUTER = APIRouter(prefix="/icons", tags=["Icons"])
@@ -8,3 +9,15 @@ ICONS_ROUTER = APIRouter(prefix="/icons", tags=["Icons"])
 @ICONS_ROUTER.get("/search", response_model=List[str])
 async def search_icons(query: str, limit: int = 20):
     return await ICON_FINDER_SERVICE.search_icons(query, limit)
+
+
+@ICONS_ROUTER.get("/ready")
+async def get_icons_index_readiness():
+    # 503 until the background warm-up has loaded the index, for readiness probes
+    return JSONResponse(
+        status_code=200 if ICON_FINDER_SERVICE.is_ready else 503,
+        content={
+            "ready": ICON_FINDER_SERVICE.is_ready,
+            "load_seconds": ICON_FINDER_SERVICE.load_seconds,
+        },
+    )
@@ -12,7 +12,7 @@ from services.image_generation_service import ImageGenerationService
 from utils.asset_directory_utils import get_images_directory
 import os
 import uuid
-from utils.file_utils import get_file_name_with_random_uuid
+from utils.file_utils import get_file_name_with_random_uuid, save_upload_file
 
 IMAGES_ROUTER = APIRouter(prefix="/images", tags=["Images"])
 
@@ -69,8 +69,7 @@ async def upload_image(
             get_images_directory(), os.path.basename(new_filename)
         )
 
-        with open(image_path, "wb") as f:
-            f.write(await file.read())
+        await save_upload_file(file, image_path)
 
         image_asset = ImageAsset(path=image_path, is_uploaded=True)
         if teacher:
@@ -126,8 +125,15 @@ async def delete_uploaded_image_by_id(
 
 # ============ Adaptive Image Endpoints ============
 
+import json
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from services.adaptive_image_service import AdaptiveImageService, AdaptiveImageResponse
+from models.sse_response import SSECompleteResponse, SSEResponse
+from services.adaptive_image_service import (
+    IMAGE_SEARCH_DEADLINE_SECONDS,
+    AdaptiveImageService,
+    AdaptiveImageResponse,
+)
 
 
 class AdaptiveImageRequest(BaseModel):
@@ -184,6 +190,98 @@ async def search_multiple_sources(query: str, per_source: int = 2):
         )
 
 
+def _sse_images(source: str, images) -> str:
+    return SSEResponse(
+        event="response",
+        data=json.dumps(
+            {
+                "type": "images",
+                "source": source,
+                "images": [each.model_dump(mode="json") for each in images],
+            }
+        ),
+    ).to_string()
+
+
+@IMAGES_ROUTER.post("/adaptive/stream")
+async def stream_adaptive_image(
+    request: AdaptiveImageRequest, deadline: float = IMAGE_SEARCH_DEADLINE_SECONDS
+):
+    """
+    Streaming variant of /adaptive. Sends the decision first, then the images
+    of each source as soon as it responds, and finally the full response.
+    """
+    adaptive_service = AdaptiveImageService(get_images_directory())
+
+    async def inner():
+        decision, reason = await adaptive_service.decide_image_source(request.prompt)
+        yield SSEResponse(
+            event="response",
+            data=json.dumps({"type": "decision", "decision": decision, "reason": reason}),
+        ).to_string()
+
+        all_images = []
+        if decision == "search":
+            async for source, images in adaptive_service.stream_multiple_sources(
+                request.prompt, 2, deadline
+            ):
+                if images:
+                    all_images.extend(images)
+                    yield _sse_images(source, images)
+
+            if not all_images:
+                decision = "generate"
+                reason = "Search returned no results, falling back to AI generation"
+
+        if decision == "generate":
+            all_images = await adaptive_service.generate_alternatives(
+                request.prompt, request.language
+            )
+            yield _sse_images(all_images[0].source, all_images)
+        else:
+            all_images = adaptive_service.interleave_sources(all_images)
+
+        yield SSECompleteResponse(
+            key="result",
+            value=AdaptiveImageResponse(
+                decision=decision, reason=reason, images=all_images
+            ).model_dump(mode="json"),
+        ).to_string()
+
+    return StreamingResponse(inner(), media_type="text/event-stream")
+
+
+@IMAGES_ROUTER.get("/search-multiple/stream")
+async def stream_search_multiple_sources(
+    query: str,
+    per_source: int = 2,
+    deadline: float = IMAGE_SEARCH_DEADLINE_SECONDS,
+):
+    """
+    Streaming variant of /search-multiple. Sends each source's images as it
+    responds; sources that miss the deadline are dropped.
+    """
+    adaptive_service = AdaptiveImageService(get_images_directory())
+
+    async def inner():
+        all_images = []
+        async for source, images in adaptive_service.stream_multiple_sources(
+            query, per_source, deadline
+        ):
+            all_images.extend(images)
+            yield _sse_images(source, images)
+
+        yield SSECompleteResponse(
+            key="images",
+            value=[
+                each.model_dump(mode="json")
+                for each in adaptive_service.interleave_sources(all_images)
+            ],
+        ).to_string()
+
+    return StreamingResponse(inner(), media_type="text/event-stream")
+
+
 @IMAGES_ROUTER.get("/details", response_model=ImageAsset)
 async def get_image_details(
     url: str,
@@ -213,3 +311,43 @@ async def get_image_details(
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=f"Failed to retrieve details: {str(e)}")
+
+
+# ============ Image Derivatives ============
+
+from typing import Dict, Literal
+from services.image_derivatives_service import IMAGE_DERIVATIVES_SERVICE
+
+MAX_DERIVATIVE_SOURCES = 100
+
+
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+
+
+class ImageDerivativesRequest(BaseModel):
+    sources: List[str]
+    consumer: Literal["editor", "pdf"] = "editor"
+
+
+@IMAGES_ROUTER.post("/derivatives", response_model=Dict[str, List[ImageVariant]])
+async def get_image_derivatives(request: ImageDerivativesRequest):
+    """
+    Resized variants of slide images, keyed by their `__image_url__`, for the
+    editor and the PDF export to use as srcset. Sources without derivatives
+    are left out and load their original.
+    """
+    if len(request.sources) > MAX_DERIVATIVE_SOURCES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_DERIVATIVE_SOURCES} sources per request",
+        )
+    derivatives = {}
+    for source in set(request.sources):
+        variants = IMAGE_DERIVATIVES_SERVICE.get_variant_urls(
+            source, request.consumer
+        )
+        if variants:
+            derivatives[source] = variants
+    return derivatives
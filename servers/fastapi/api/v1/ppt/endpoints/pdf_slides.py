@@ -3,11 +3,14 @@ import shutil
 import tempfile
 import subprocess
 from typing import List, Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
 from services.documents_loader import DocumentsLoader
+from services.pdf_rasterizer import PDF_RASTERIZER
 from utils.asset_directory_utils import get_images_directory
+from utils.file_utils import save_upload_file
 import uuid
 from constants.documents import PDF_MIME_TYPES
 
@@ -28,16 +31,24 @@ class PdfSlidesResponse(BaseModel):
 
 @PDF_SLIDES_ROUTER.post("/process", response_model=PdfSlidesResponse)
 async def process_pdf_slides(
-    pdf_file: UploadFile = File(..., description="PDF file to process")
+    pdf_file: UploadFile = File(..., description="PDF file to process"),
+    lazy: bool = Query(
+        False,
+        description="Return page URLs at once and render the pages on demand",
+    ),
 ):
     """
     Process a PDF file to extract slide screenshots.
 
     This endpoint:
     1. Validates the uploaded PDF file
-    2. Uses ImageMagick to convert PDF pages to PNG images
+    2. Renders the PDF pages to PNG images with pdfium
     3. Returns screenshot URLs for each slide/page
 
+    With `lazy=true` nothing is rendered up front: the URLs point at
+    /pdf-slides/pages, which renders each page on first request while the
+    rest are rendered in the background.
+
     Note: Font installation is not needed since PDFs already have fonts embedded.
     """
 
@@ -63,11 +74,29 @@ async def process_pdf_slides(
         try:
             # Save uploaded PDF file
             pdf_path = os.path.join(temp_dir, "presentation.pdf")
-            with open(pdf_path, "wb") as f:
-                pdf_content = await pdf_file.read()
-                f.write(pdf_content)
+            saved_pdf = await save_upload_file(
+                pdf_file, pdf_path, 100 * 1024 * 1024
+            )
+
+            if lazy:
+                document_id, page_count = await PDF_RASTERIZER.register(
+                    pdf_path, saved_pdf.sha256
+                )
+                PDF_RASTERIZER.start_background_render(document_id, page_count)
+                slides_data = [
+                    PdfSlideData(
+                        slide_number=page_number,
+                        screenshot_url=PDF_RASTERIZER.get_page_url(
+                            document_id, page_number
+                        ),
+                    )
+                    for page_number in range(1, page_count + 1)
+                ]
+                return PdfSlidesResponse(
+                    success=True, slides=slides_data, total_slides=page_count
+                )
 
-            # Generate screenshots from PDF using ImageMagick
+            # Generate screenshots from PDF
             screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
                 pdf_path, temp_dir
             )
@@ -109,8 +138,19 @@ async def process_pdf_slides(
                 success=True, slides=slides_data, total_slides=len(slides_data)
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Error processing PDF slides: {str(e)}")
             raise HTTPException(
                 status_code=500, detail=f"Failed to process PDF: {str(e)}"
             )
+
+
+@PDF_SLIDES_ROUTER.get("/pages/{document_id}/{page_number}")
+async def get_pdf_page(document_id: str, page_number: int):
+    """Serves a page of a PDF processed with `lazy=true`, rendering it if needed."""
+    page_path = await PDF_RASTERIZER.get_page(document_id, page_number)
+    if page_path is None:
+        raise HTTPException(status_code=404, detail="PDF page not found")
+    return FileResponse(page_path, media_type="image/png")
@@ -1,25 +1,43 @@
+import io
 import os
 import shutil
 import zipfile
 import tempfile
-import subprocess
 import uuid
-from typing import List, Optional, Dict
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from typing import Callable, List, Optional, Dict, Union
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import aiohttp
 import asyncio
 import xml.etree.ElementTree as ET
 import re
 
+from models.saved_upload_file import SavedUploadFile
+from models.sse_response import (
+    SSECompleteResponse,
+    SSEErrorResponse,
+    SSEStatusResponse,
+)
 from services.documents_loader import DocumentsLoader
+from services.font_store_service import FONT_STORE_SERVICE
+from services.google_fonts_service import GOOGLE_FONTS_SERVICE, get_google_fonts_url
+from services.libreoffice_pool import (
+    LIBREOFFICE_POOL,
+    convert_pptx_to_pdf_cold_start,
+    write_font_alias_config,
+)
+from services.pptx_slides_job_service import PPTX_SLIDES_JOB_SERVICE
+from services.temp_file_service import TEMP_FILE_SERVICE
 from utils.asset_directory_utils import get_images_directory
+from utils.file_utils import save_upload_file
 import uuid
 from constants.documents import POWERPOINT_TYPES
 
 
 PPTX_SLIDES_ROUTER = APIRouter(prefix="/pptx-slides", tags=["PPTX Slides"])
 
+SLIDE_XML_PATTERN = re.compile(r"^ppt/slides/slide(\d+)\.xml$")
+
 
 class SlideData(BaseModel):
     slide_number: int
@@ -42,6 +60,26 @@ class PptxSlidesResponse(BaseModel):
     fonts: Optional[FontAnalysisResult] = None
 
 
+class ExtractedSlides(BaseModel):
+    """Slide XMLs read from the package once and shared by every stage."""
+
+    slide_xmls: List[str]
+    # Raw font names per slide, in slide order
+    slide_fonts: List[List[str]]
+
+    @property
+    def slide_count(self) -> int:
+        return len(self.slide_xmls)
+
+    def get_raw_fonts(self) -> List[str]:
+        return sorted({font for fonts in self.slide_fonts for font in fonts if font})
+
+
+class PptxSlidesJobResponse(BaseModel):
+    id: str
+    status: str
+
+
 # NEW: Fonts-only router and response for PPTX
 class PptxFontsResponse(BaseModel):
     success: bool
@@ -215,46 +253,17 @@ def extract_fonts_from_oxml(xml_content: str) -> List[str]:
         return []
 
 
-async def check_google_font_availability(font_name: str) -> bool:
-    """
-    Check if a font is available in Google Fonts.
-
-    Args:
-        font_name: Name of the font to check
-
-    Returns:
-        True if font is available in Google Fonts, False otherwise
-    """
-    try:
-        formatted_name = font_name.replace(" ", "+")
-        url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.head(
-                url, timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                return response.status == 200
-
-    except Exception as e:
-        print(f"Error checking Google Font availability for {font_name}: {e}")
-        return False
-
-
-async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResult:
+async def analyze_fonts_in_all_slides(slides: ExtractedSlides) -> FontAnalysisResult:
     """
     Analyze fonts across all slides and determine Google Fonts availability.
 
     Args:
-        slide_xmls: List of OXML content strings from all slides
+        slides: Slide XMLs and the fonts already extracted from each of them
 
     Returns:
         FontAnalysisResult with supported and unsupported fonts
     """
-    # Extract fonts from all slides
-    raw_fonts = set()
-    for xml_content in slide_xmls:
-        slide_fonts = extract_fonts_from_oxml(xml_content)
-        raw_fonts.update(slide_fonts)
+    raw_fonts = slides.get_raw_fonts()
 
     # Normalize to root families (e.g., "Montserrat Italic" -> "Montserrat")
     normalized_fonts = {normalize_font_family_name(f) for f in raw_fonts}
@@ -264,19 +273,15 @@ async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResu
     if not normalized_fonts:
         return FontAnalysisResult(internally_supported_fonts=[], not_supported_fonts=[])
 
-    # Check each normalized font's availability in Google Fonts concurrently
-    tasks = [check_google_font_availability(font) for font in normalized_fonts]
-    results = await asyncio.gather(*tasks)
-
     internally_supported_fonts = []
     not_supported_fonts = []
 
-    for font, is_available in zip(normalized_fonts, results):
-        if is_available:
-            formatted_name = font.replace(" ", "+")
-            google_fonts_url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
+    # Looked up in the local Google Fonts index, no request per font
+    for font in normalized_fonts:
+        family = GOOGLE_FONTS_SERVICE.get_family(font)
+        if family:
             internally_supported_fonts.append(
-                {"name": font, "google_fonts_url": google_fonts_url}
+                {"name": family, "google_fonts_url": get_google_fonts_url(family)}
             )
         else:
             not_supported_fonts.append(font)
@@ -286,20 +291,28 @@ async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResu
     )
 
 
-@PPTX_SLIDES_ROUTER.post("/process", response_model=PptxSlidesResponse)
+@PPTX_SLIDES_ROUTER.post(
+    "/process", response_model=Union[PptxSlidesResponse, PptxSlidesJobResponse]
+)
 async def process_pptx_slides(
     pptx_file: UploadFile = File(..., description="PPTX file to process"),
     fonts: Optional[List[UploadFile]] = File(None, description="Optional font files"),
+    job: bool = Query(
+        False,
+        description="Return a job id at once and report progress at /jobs/{id}/stream",
+    ),
 ):
     """
     Process a PPTX file to extract slide screenshots and XML content.
 
     This endpoint:
     1. Validates the uploaded PPTX file
-    2. Installs any provided font files
+    2. Registers any provided font files for this conversion
     3. Unzips the PPTX to extract slide XMLs
     4. Uses LibreOffice to generate slide screenshots
     5. Returns both screenshot URLs and XML content for each slide
+
+    With `job=true` the processing runs in the background instead.
     """
 
     # Validate PPTX file
@@ -319,33 +332,109 @@ async def process_pptx_slides(
             detail="PPTX file exceeded max upload size of 100 MB",
         )
 
-    # Create temporary directory for processing
-    with tempfile.TemporaryDirectory() as temp_dir:
-        if True:
-            # Save uploaded PPTX file
-            pptx_path = os.path.join(temp_dir, "presentation.pptx")
-            with open(pptx_path, "wb") as f:
-                pptx_content = await pptx_file.read()
-                f.write(pptx_content)
+    # Uploads are closed once the response is sent, so save them first
+    upload_dir = TEMP_FILE_SERVICE.create_temp_dir()
+    try:
+        pptx_path = os.path.join(upload_dir, "presentation.pptx")
+        await save_upload_file(pptx_file, pptx_path, 100 * 1024 * 1024)
+        font_files = [
+            await save_upload_file(
+                font_file,
+                os.path.join(
+                    upload_dir,
+                    f"font_{index}{os.path.splitext(font_file.filename or '')[1]}",
+                ),
+            )
+            for index, font_file in enumerate(fonts or [])
+        ]
+    except BaseException:
+        TEMP_FILE_SERVICE.cleanup_temp_dir(upload_dir)
+        raise
+
+    if job:
+
+        async def run(processing_job):
+            try:
+                response = await _process_pptx(
+                    pptx_path, font_files, processing_job.set_stage
+                )
+            finally:
+                TEMP_FILE_SERVICE.cleanup_temp_dir(upload_dir)
+            return response.model_dump(mode="json")
+
+        processing_job = PPTX_SLIDES_JOB_SERVICE.start(run)
+        return PptxSlidesJobResponse(id=processing_job.id, status=processing_job.status)
 
-            # Install fonts if provided
-            if fonts:
-                await _install_fonts(fonts, temp_dir)
+    try:
+        return await _process_pptx(pptx_path, font_files, lambda stage: None)
+    finally:
+        TEMP_FILE_SERVICE.cleanup_temp_dir(upload_dir)
+
+
+@PPTX_SLIDES_ROUTER.get("/jobs/{id}")
+async def get_pptx_slides_job(id: str):
+    processing_job = PPTX_SLIDES_JOB_SERVICE.get(id)
+    if not processing_job:
+        raise HTTPException(status_code=404, detail="PPTX processing job not found")
+    return processing_job.to_dict()
+
+
+@PPTX_SLIDES_ROUTER.get("/jobs/{id}/stream")
+async def stream_pptx_slides_job(id: str):
+    processing_job = PPTX_SLIDES_JOB_SERVICE.get(id)
+    if not processing_job:
+        raise HTTPException(status_code=404, detail="PPTX processing job not found")
+
+    async def inner():
+        async for stage in processing_job.iterate_stages():
+            yield SSEStatusResponse(status=stage).to_string()
+        if processing_job.status == "completed":
+            yield SSECompleteResponse(
+                key="result", value=processing_job.result
+            ).to_string()
+        else:
+            yield SSEErrorResponse(detail=processing_job.error).to_string()
+
+    return StreamingResponse(inner(), media_type="text/event-stream")
+
+
+async def _process_pptx(
+    pptx_path: str,
+    font_files: List[SavedUploadFile],
+    report_stage: Callable[[str], None],
+) -> PptxSlidesResponse:
+    """Runs the processing pipeline, reporting each stage as it starts."""
+    # Each conversion runs LibreOffice and rasterizes every page, so cap them
+    async with PPTX_SLIDES_JOB_SERVICE.get_semaphore():
+        # Create temporary directory for processing
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Register uploaded fonts for this conversion only
+            font_directory = None
+            if font_files:
+                font_directory = await asyncio.to_thread(
+                    FONT_STORE_SERVICE.add_fonts, font_files
+                )
 
-            # Extract slide XMLs from PPTX
-            slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+            # Extract slide XMLs and their fonts from PPTX
+            report_stage("extract")
+            slides = await asyncio.to_thread(_extract_slides, pptx_path)
 
             # Convert PPTX to PDF
-            pdf_path = await _convert_pptx_to_pdf(pptx_path, temp_dir)
+            report_stage("convert")
+            pdf_path = await _convert_pptx_to_pdf(
+                pptx_path, temp_dir, slides, font_directory
+            )
 
-            # Generate screenshots using LibreOffice
+            # Generate screenshots from the PDF pages
+            report_stage("rasterize")
             screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
                 pdf_path, temp_dir
             )
             print(f"Screenshot paths: {screenshot_paths}")
 
             # Analyze fonts across all slides
-            font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
+            report_stage("font_analysis")
+            font_analysis = await analyze_fonts_in_all_slides(slides)
             print(
                 f"Font analysis completed: {len(font_analysis.internally_supported_fonts)} supported, {len(font_analysis.not_supported_fonts)} not supported"
             )
@@ -358,8 +447,8 @@ async def process_pptx_slides(
 
             slides_data = []
 
-            for i, (xml_content, screenshot_path) in enumerate(
-                zip(slide_xmls, screenshot_paths), 1
+            for i, (xml_content, raw_slide_fonts, screenshot_path) in enumerate(
+                zip(slides.slide_xmls, slides.slide_fonts, screenshot_paths), 1
             ):
                 # Move screenshot to permanent location
                 screenshot_filename = f"slide_{i}.png"
@@ -381,7 +470,6 @@ async def process_pptx_slides(
                     screenshot_url = "/static/images/placeholder.jpg"
 
                 # Compute normalized fonts for this slide
-                raw_slide_fonts = extract_fonts_from_oxml(xml_content)
                 normalized_fonts = sorted(
                     {normalize_font_family_name(f) for f in raw_slide_fonts if f}
                 )
@@ -403,6 +491,11 @@ async def process_pptx_slides(
             )
 
 
+@PPTX_SLIDES_ROUTER.get("/conversion/metrics")
+async def get_libreoffice_pool_metrics():
+    return LIBREOFFICE_POOL.get_metrics()
+
+
 # NEW: Fonts-only endpoint leveraging the same font extraction/analysis
 @PPTX_FONTS_ROUTER.post("/process", response_model=PptxFontsResponse)
 async def process_pptx_fonts(
@@ -420,188 +513,107 @@ async def process_pptx_fonts(
             detail=f"Invalid file type. Expected PPTX file, got {pptx_file.content_type}",
         )
 
-    # Create temporary directory for processing
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Save uploaded PPTX file
-        pptx_path = os.path.join(temp_dir, "presentation.pptx")
-        with open(pptx_path, "wb") as f:
-            pptx_content = await pptx_file.read()
-            f.write(pptx_content)
-
-        # Extract slide XMLs from PPTX
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
-
-        # Analyze fonts across all slides (same logic as in /pptx-slides)
-        font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
-
-        return PptxFontsResponse(
-            success=True,
-            fonts=font_analysis,
-        )
+    # Only the slide XMLs are needed, read straight from the saved upload
+    upload_dir = TEMP_FILE_SERVICE.create_temp_dir()
+    try:
+        pptx_path = os.path.join(upload_dir, "presentation.pptx")
+        await save_upload_file(pptx_file, pptx_path, 100 * 1024 * 1024)
+        slides = await asyncio.to_thread(_extract_slides, pptx_path)
+    finally:
+        TEMP_FILE_SERVICE.cleanup_temp_dir(upload_dir)
+
+    # Analyze fonts across all slides (same logic as in /pptx-slides)
+    font_analysis = await analyze_fonts_in_all_slides(slides)
+
+    return PptxFontsResponse(
+        success=True,
+        fonts=font_analysis,
+    )
 
 
-def _create_font_alias_config(raw_fonts: List[str]) -> str:
-    """Create a temporary fontconfig configuration that aliases variant family names to normalized root families.
-    Returns the path to the config file.
-    """
-    # Build mapping from raw -> normalized where different
+def _get_font_aliases(raw_fonts: List[str]) -> Dict[str, str]:
+    """Maps variant family names to their normalized root families."""
     mappings: Dict[str, str] = {}
     for f in raw_fonts:
         normalized = normalize_font_family_name(f)
         if normalized and normalized != f:
             mappings[f] = normalized
-    # Create config only if we have mappings
-    fd, fonts_conf_path = tempfile.mkstemp(prefix="fonts_alias_", suffix=".conf")
-    os.close(fd)
-    with open(fonts_conf_path, "w", encoding="utf-8") as cfg:
-        cfg.write(
-            """<?xml version='1.0'?>
-<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">
-<fontconfig>
-  <include>/etc/fonts/fonts.conf</include>
-"""
-        )
-        for src, dst in mappings.items():
-            cfg.write(
-                f"""
-  <match target="pattern">
-    <test name="family" compare="eq">
-      <string>{src}</string>
-    </test>
-    <edit name="family" mode="assign" binding="strong">
-      <string>{dst}</string>
-    </edit>
-  </match>
-"""
-            )
-        cfg.write("\n</fontconfig>\n")
-    return fonts_conf_path
-
-
-async def _install_fonts(fonts: List[UploadFile], temp_dir: str) -> None:
-    """Install provided font files to the system."""
-    fonts_dir = os.path.join(temp_dir, "fonts")
-    os.makedirs(fonts_dir, exist_ok=True)
-
-    for font_file in fonts:
-        # Save font file
-        font_path = os.path.join(fonts_dir, font_file.filename)
-        with open(font_path, "wb") as f:
-            font_content = await font_file.read()
-            f.write(font_content)
-
-        # Install font (copy to system fonts directory)
-        try:
-            subprocess.run(
-                ["cp", font_path, "/usr/share/fonts/truetype/"],
-                check=True,
-                capture_output=True,
-            )
-        except subprocess.CalledProcessError as e:
-            print(f"Warning: Failed to install font {font_file.filename}: {e}")
-
-    # Refresh font cache
-    try:
-        subprocess.run(["fc-cache", "-f", "-v"], check=True, capture_output=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Warning: Failed to refresh font cache: {e}")
-
+    return mappings
 
-def _extract_slide_xmls(pptx_path: str, temp_dir: str) -> List[str]:
-    """Extract slide XML content from PPTX file."""
-    slide_xmls = []
-    extract_dir = os.path.join(temp_dir, "pptx_extract")
 
+def _extract_slides(pptx: Union[str, bytes]) -> ExtractedSlides:
+    """
+    Reads only ppt/slides/slideN.xml from the package (a path or its bytes),
+    in slide order, and extracts each slide's fonts from that single parse.
+    Media parts are never decompressed.
+    """
     try:
-        # Unzip PPTX file
-        with zipfile.ZipFile(pptx_path, "r") as zip_ref:
-            zip_ref.extractall(extract_dir)
-
-        # Look for slides in ppt/slides/ directory
-        slides_dir = os.path.join(extract_dir, "ppt", "slides")
-
-        if not os.path.exists(slides_dir):
-            raise Exception("No slides directory found in PPTX file")
-
-        # Get all slide XML files and sort them numerically
-        slide_files = [
-            f
-            for f in os.listdir(slides_dir)
-            if f.startswith("slide") and f.endswith(".xml")
-        ]
-        slide_files.sort(key=lambda x: int(x.replace("slide", "").replace(".xml", "")))
+        source = io.BytesIO(pptx) if isinstance(pptx, bytes) else pptx
+        with zipfile.ZipFile(source, "r") as zip_ref:
+            slide_members = sorted(
+                (int(match.group(1)), name)
+                for name in zip_ref.namelist()
+                if (match := SLIDE_XML_PATTERN.match(name))
+            )
+            if not slide_members:
+                raise Exception("No slides directory found in PPTX file")
 
-        # Read XML content from each slide
-        for slide_file in slide_files:
-            slide_path = os.path.join(slides_dir, slide_file)
-            with open(slide_path, "r", encoding="utf-8") as f:
-                slide_xmls.append(f.read())
+            slide_xmls = [
+                zip_ref.read(name).decode("utf-8") for _, name in slide_members
+            ]
 
-        return slide_xmls
+        return ExtractedSlides(
+            slide_xmls=slide_xmls,
+            slide_fonts=[extract_fonts_from_oxml(xml) for xml in slide_xmls],
+        )
 
     except Exception as e:
         raise Exception(f"Failed to extract slide XMLs: {str(e)}")
 
 
-async def _convert_pptx_to_pdf(pptx_path: str, temp_dir: str) -> str:
-    """Generate PNG screenshots of PPTX slides using LibreOffice + ImageMagick."""
+async def _convert_pptx_to_pdf(
+    pptx_path: str,
+    temp_dir: str,
+    slides: ExtractedSlides,
+    font_directory: Optional[str] = None,
+) -> str:
+    """
+    Convert the PPTX to PDF with LibreOffice, on a pooled worker if enabled.
+    Fonts in `font_directory` are visible to this conversion only.
+    """
     screenshots_dir = os.path.join(temp_dir, "screenshots")
     os.makedirs(screenshots_dir, exist_ok=True)
 
     try:
-        # First, get the number of slides by extracting XMLs
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
-        slide_count = len(slide_xmls)
-
-        # Build font alias config to force variant families to resolve to normalized root families
-        raw_fonts: List[str] = []
-        for xml in slide_xmls:
-            raw_fonts.extend(extract_fonts_from_oxml(xml))
-        raw_fonts = list({f for f in raw_fonts if f})
-        fonts_conf_path = _create_font_alias_config(raw_fonts)
-        env = os.environ.copy()
-        env["FONTCONFIG_FILE"] = fonts_conf_path
-
-        print(f"Found {slide_count} slides in presentation")
-
-        # Step 1: Convert PPTX to PDF using LibreOffice
+        # Alias variant families to their normalized root families
+        font_aliases = _get_font_aliases(slides.get_raw_fonts())
+        font_directories = [font_directory] if font_directory else []
+        font_cache_directory = (
+            FONT_STORE_SERVICE.cache_directory if font_directory else None
+        )
+
+        print(f"Found {slides.slide_count} slides in presentation")
+
         print("Starting LibreOffice PDF conversion...")
-        pdf_filename = "temp_presentation.pdf"
-        pdf_path = os.path.join(screenshots_dir, pdf_filename)
-
-        try:
-            result = subprocess.run(
-                [
-                    "libreoffice",
-                    "--headless",
-                    "--convert-to",
-                    "pdf",
-                    "--outdir",
-                    screenshots_dir,
-                    pptx_path,
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-                timeout=500,
-                env=env,
+        if LIBREOFFICE_POOL.is_enabled():
+            actual_pdf_path = await LIBREOFFICE_POOL.convert(
+                pptx_path,
+                screenshots_dir,
+                font_aliases,
+                font_directories,
+                font_cache_directory,
+            )
+        else:
+            fonts_conf_path = os.path.join(temp_dir, "fonts_alias.conf")
+            write_font_alias_config(
+                fonts_conf_path, font_aliases, font_directories, font_cache_directory
+            )
+            env = os.environ.copy()
+            env["FONTCONFIG_FILE"] = fonts_conf_path
+            actual_pdf_path = await convert_pptx_to_pdf_cold_start(
+                pptx_path, screenshots_dir, env, LIBREOFFICE_POOL.job_timeout
             )
 
-            print(f"LibreOffice PDF conversion output: {result.stdout}")
-            if result.stderr:
-                print(f"LibreOffice PDF conversion warnings: {result.stderr}")
-        except subprocess.TimeoutExpired:
-            raise Exception("LibreOffice PDF conversion timed out after 120 seconds")
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if e.stderr else str(e)
-            raise Exception(f"LibreOffice PDF conversion failed: {error_msg}")
-
-        # Find the generated PDF file (LibreOffice uses original filename)
-        pdf_files = [f for f in os.listdir(screenshots_dir) if f.endswith(".pdf")]
-        if not pdf_files:
-            raise Exception("LibreOffice failed to generate PDF file")
-
-        actual_pdf_path = os.path.join(screenshots_dir, pdf_files[0])
         print(f"Generated PDF: {actual_pdf_path}")
         return actual_pdf_path
 
@@ -7,7 +7,16 @@ import random
 import traceback
 from typing import Annotated, List, Literal, Optional, Tuple
 import dirtyjson
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path
+from pathvalidate import sanitize_filename
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+)
 from fastapi.responses import StreamingResponse
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -41,7 +50,12 @@ from services.teacher_template_service import apply_teacher_templates_to_request
 from utils.get_layout_by_name import get_layout_by_name
 from services.image_generation_service import ImageGenerationService
 from utils.dict_utils import deep_update
-from utils.export_utils import export_presentation
+from utils.export_utils import (
+    PPTX_MEDIA_TYPE,
+    export_presentation,
+    get_content_disposition,
+    iterate_in_chunks,
+)
 from utils.latex_sanitizer import sanitize_latex_escapes
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from models.sql.slide import SlideModel
@@ -51,7 +65,8 @@ from services.database import get_async_session
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.concurrent_service import CONCURRENT_SERVICE
 from models.sql.presentation import PresentationModel
-from services.pptx_presentation_creator import PptxPresentationCreator
+from services.pptx_render_pool import PPTX_RENDER_POOL
+from services.export_cache_service import EXPORT_CACHE_SERVICE
 from models.sql.async_presentation_generation_status import (
     AsyncPresentationGenerationTaskModel,
 )
@@ -141,6 +156,7 @@ async def delete_presentation(
 
     await sql_session.delete(presentation)
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(id)
 
 
 @PRESENTATION_ROUTER.post("/create", response_model=PresentationModel)
@@ -447,6 +463,7 @@ async def update_presentation(
         sql_session.add_all(slides)
 
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(presentation.id)
 
     return PresentationWithSlides(
         **presentation.model_dump(),
@@ -457,19 +474,36 @@ async def update_presentation(
 @PRESENTATION_ROUTER.post("/export/pptx", response_model=str)
 async def export_presentation_as_pptx(
     pptx_model: Annotated[PptxPresentationModel, Body()],
+    stream: Annotated[
+        bool,
+        Query(description="Return the .pptx file itself instead of its path"),
+    ] = False,
 ):
     temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
 
-    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-    await pptx_creator.create_ppt()
+    if stream:
+        # Built in memory: no write to and read from the exports directory
+        pptx_bytes = await PPTX_RENDER_POOL.render(pptx_model, temp_dir, None)
+        filename = f"{sanitize_filename(pptx_model.name or 'presentation')}.pptx"
+        return StreamingResponse(
+            iterate_in_chunks(pptx_bytes),
+            media_type=PPTX_MEDIA_TYPE,
+            headers={
+                "Content-Length": str(len(pptx_bytes)),
+                "Content-Disposition": get_content_disposition(filename),
+            },
+        )
 
     export_directory = get_exports_directory()
     pptx_path = os.path.join(
         export_directory, f"{pptx_model.name or uuid.uuid4()}.pptx"
     )
-    pptx_creator.save(pptx_path)
+    return await PPTX_RENDER_POOL.render(pptx_model, temp_dir, pptx_path)
 
-    return pptx_path
+
+@PRESENTATION_ROUTER.get("/export/pptx/metrics")
+async def get_pptx_render_metrics():
+    return PPTX_RENDER_POOL.get_metrics()
 
 
 @PRESENTATION_ROUTER.post("/export", response_model=PresentationPathAndEditPath)
@@ -492,6 +526,7 @@ async def export_presentation_as_pptx_or_pdf(
         id,
         presentation.title or str(uuid.uuid4()),
         export_as,
+        sql_session,
     )
 
     return PresentationPathAndEditPath(
@@ -812,7 +847,10 @@ async def generate_presentation_handler(
 
         # 9. Export
         presentation_and_path = await export_presentation(
-            presentation_id, presentation.title or str(uuid.uuid4()), request.export_as
+            presentation_id,
+            presentation.title or str(uuid.uuid4()),
+            request.export_as,
+            sql_session,
         )
 
         response = PresentationPathAndEditPath(
@@ -967,9 +1005,13 @@ async def edit_presentation_with_new_content(
 
     sql_session.add_all(new_slides)
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(presentation.id)
 
     presentation_and_path = await export_presentation(
-        presentation.id, presentation.title or str(uuid.uuid4()), data.export_as
+        presentation.id,
+        presentation.title or str(uuid.uuid4()),
+        data.export_as,
+        sql_session,
     )
 
     return PresentationPathAndEditPath(
@@ -1009,7 +1051,10 @@ async def derive_presentation_from_existing_one(
     await sql_session.commit()
 
     presentation_and_path = await export_presentation(
-        new_presentation.id, new_presentation.title or str(uuid.uuid4()), data.export_as
+        new_presentation.id,
+        new_presentation.title or str(uuid.uuid4()),
+        data.export_as,
+        sql_session,
     )
 
     return PresentationPathAndEditPath(
@@ -6,6 +6,7 @@ import uuid
 from models.sql.presentation import PresentationModel
 from models.sql.slide import SlideModel
 from services.database import get_async_session
+from services.export_cache_service import EXPORT_CACHE_SERVICE
 from models.sql.teacher import TeacherModel
 from services.auth import get_optional_current_teacher
 from services.image_generation_service import ImageGenerationService
@@ -65,6 +66,7 @@ async def edit_slide(
     slide.speaker_note = edited_slide_content.get("__speaker_note__", "")
     sql_session.add_all(new_assets)
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(presentation.id)
 
     return slide
 
@@ -0,0 +1,116 @@
+"""
+First-document latency of docling parsing.
+
+Compares the previous behaviour, where every request built a new
+DoclingService and so loaded docling's pipelines again while parsing its
+first document, with the shared converter warmed at startup. Each round
+parses a PDF, whose pipeline loads the layout models, then a PPTX.
+
+Needs docling (the full image). Run from servers/fastapi:
+    python -m benchmarks.docling_warm_up [requests]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from pptx import Presentation
+
+from services.docling_service import (
+    DOCLING_AVAILABLE,
+    DoclingService,
+    get_docling_service,
+    warm_up_docling_service,
+)
+from services.pdf_rasterizer import get_pdf_page_count
+
+
+def create_documents(temp_dir):
+    pptx_path = os.path.join(temp_dir, "notes.pptx")
+    presentation = Presentation()
+    for slide_index in range(5):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {slide_index + 1}"
+        slide.placeholders[1].text = "Photosynthesis converts light into energy"
+    presentation.save(pptx_path)
+
+    pdf_path = os.path.join(temp_dir, "notes.pdf")
+    # A one page PDF with a line of text, small enough to write by hand
+    stream = b"BT /F1 18 Tf 72 720 Td (The rock cycle) Tj ET"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(content))
+        content += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_at = len(content)
+    content += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    content += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    content += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref_at,
+    )
+    with open(pdf_path, "wb") as f:
+        f.write(content)
+    assert get_pdf_page_count(pdf_path) == 1
+
+    return [pdf_path, pptx_path]
+
+
+def parse_all(docling_service, file_paths):
+    latencies = []
+    for file_path in file_paths:
+        started_at = time.perf_counter()
+        docling_service.parse_to_markdown(file_path)
+        latencies.append(time.perf_counter() - started_at)
+    return latencies
+
+
+def report(name, rounds):
+    first = [latencies[0] for latencies in rounds]
+    total = [sum(latencies) for latencies in rounds]
+    print(
+        f"{name:<28} first document {sum(first) / len(first) * 1000:8.0f} ms  "
+        f"whole request {sum(total) / len(total) * 1000:8.0f} ms"
+    )
+
+
+def main():
+    if not DOCLING_AVAILABLE:
+        print("docling is not installed; run this in the full image")
+        return
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = create_documents(temp_dir)
+        print(f"{requests} requests x {len(file_paths)} documents (pdf, pptx)")
+
+        # Before: a new service per request, timed from its construction
+        rounds = []
+        for _ in range(requests):
+            started_at = time.perf_counter()
+            docling_service = DoclingService()
+            latencies = parse_all(docling_service, file_paths)
+            latencies[0] += time.perf_counter() - started_at - sum(latencies)
+            rounds.append(latencies)
+        report("new converter per request", rounds)
+
+        # After: warmed once at startup, then shared
+        started_at = time.perf_counter()
+        warm_up_docling_service()
+        print(f"{'startup warm-up':<28} {(time.perf_counter() - started_at) * 1000:8.0f} ms")
+        rounds = [
+            parse_all(get_docling_service(), file_paths) for _ in range(requests)
+        ]
+        report("warmed shared converter", rounds)
+
+
+if __name__ == "__main__":
+    main()
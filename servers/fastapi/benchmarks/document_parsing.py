@@ -0,0 +1,105 @@
+"""
+Document parsing throughput with several concurrent uploads.
+
+Builds text-heavy PPTX decks and parses them as concurrent
+DocumentsLoader.load_documents calls, comparing the previous behaviour
+(docling called synchronously on the event loop, one file at a time) with
+the document parse pool. Also reports the worst event-loop stall, which is
+what other requests see while documents parse.
+
+Needs docling (the full image). Run from servers/fastapi:
+    python -m benchmarks.document_parsing [uploads] [files_per_upload]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from pptx import Presentation
+
+from services.docling_service import DOCLING_AVAILABLE, DoclingService
+from services.document_parse_pool import DOCUMENT_PARSE_POOL
+from services.documents_loader import DocumentsLoader
+
+N_SLIDES = 40
+
+
+def create_deck(path, index):
+    presentation = Presentation()
+    for slide_index in range(N_SLIDES):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Deck {index} slide {slide_index + 1}"
+        slide.placeholders[1].text = "\n".join(
+            f"Point {point}: photosynthesis converts light into chemical energy"
+            for point in range(8)
+        )
+    presentation.save(path)
+
+
+async def measure_loop_stall(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - started_at - 0.01)
+    return worst
+
+
+async def run_uploads(uploads, load):
+    stop = asyncio.Event()
+    stall = asyncio.create_task(measure_loop_stall(stop))
+    started_at = time.perf_counter()
+    await asyncio.gather(*(load(file_paths) for file_paths in uploads))
+    elapsed = time.perf_counter() - started_at
+    stop.set()
+    return elapsed, await stall
+
+
+async def load_sequentially_on_loop(file_paths):
+    # What load_documents did before: one DoclingService per loader, blocking
+    docling_service = DoclingService()
+    for file_path in file_paths:
+        docling_service.parse_to_markdown(file_path)
+
+
+async def load_with_pool(file_paths):
+    await DocumentsLoader(file_paths).load_documents()
+
+
+def main():
+    if not DOCLING_AVAILABLE:
+        print("docling is not installed; run this in the full image")
+        return
+    uploads_count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    files_per_upload = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        uploads = []
+        for upload in range(uploads_count):
+            file_paths = []
+            for file_index in range(files_per_upload):
+                path = os.path.join(temp_dir, f"upload{upload}_{file_index}.pptx")
+                create_deck(path, file_index)
+                file_paths.append(path)
+            uploads.append(file_paths)
+        files = uploads_count * files_per_upload
+        print(
+            f"{uploads_count} concurrent uploads x {files_per_upload} decks, "
+            f"{os.cpu_count()} CPUs, {DOCUMENT_PARSE_POOL.workers} parse workers"
+        )
+
+        for name, load in (
+            ("on the event loop", load_sequentially_on_loop),
+            ("document parse pool", load_with_pool),
+        ):
+            elapsed, stall = asyncio.run(run_uploads(uploads, load))
+            print(
+                f"{name:<22} {elapsed:7.2f} s  {files / elapsed:6.2f} files/s  "
+                f"worst loop stall {stall * 1000:8.1f} ms"
+            )
+        DOCUMENT_PARSE_POOL.shutdown()
+
+
+if __name__ == "__main__":
+    main()
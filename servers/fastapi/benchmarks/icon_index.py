@@ -0,0 +1,84 @@
+"""
+Icon search latency: memory-mapped NumPy index vs the Chroma collection.
+
+Both backends use the same ONNX MiniLM embeddings built from assets/icons.json.
+Cold numbers include embedding every query; warm numbers repeat the same
+queries, which the NumPy index answers from its query embedding cache.
+
+Run from servers/fastapi:
+    python -m benchmarks.icon_index
+"""
+import time
+
+import chromadb
+from chromadb.config import Settings
+from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+from services.icon_index import (
+    IconVectorIndex,
+    build_icon_index,
+    load_icon_definitions,
+)
+
+ICON_QUERIES = [
+    "rocket launch", "growth chart", "team collaboration", "lightbulb idea",
+    "security shield", "cloud storage", "calendar schedule", "money savings",
+    "global network", "customer support", "book reading", "science atom",
+    "heart health", "leaf nature", "trophy award", "clock time",
+]
+
+ROUNDS = 5
+
+
+def measure(name, search):
+    timings = []
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        for query in ICON_QUERIES:
+            search(query)
+        timings.append(time.perf_counter() - started_at)
+    per_query = min(timings) / len(ICON_QUERIES)
+    print(f"{name:<22} {per_query * 1000:8.3f} ms/query")
+
+
+def main():
+    embedding_function = ONNXMiniLM_L6_V2()
+    embedding_function.DOWNLOAD_PATH = "chroma/models"
+    embedding_function._download_model_if_not_exists()
+
+    index = IconVectorIndex.load(embedding_function)
+    if index is None:
+        build_icon_index(embedding_function)
+        index = IconVectorIndex.load(embedding_function)
+
+    client = chromadb.PersistentClient(
+        path="chroma", settings=Settings(anonymized_telemetry=False)
+    )
+    collection = client.get_or_create_collection(
+        "icons",
+        embedding_function=embedding_function,
+        metadata={"hnsw:space": "cosine"},
+    )
+    if collection.count() == 0:
+        definitions = load_icon_definitions()
+        collection.add(
+            documents=[each["document"] for each in definitions],
+            ids=[each["name"] for each in definitions],
+        )
+
+    measure(
+        "chroma",
+        lambda query: collection.query(query_texts=[query], n_results=1),
+    )
+
+    def numpy_cold(query):
+        index._query_embeddings.clear()
+        index.search([query], 1)
+
+    measure("numpy (cold embedding)", numpy_cold)
+    measure("numpy (cached)", lambda query: index.search([query], 1))
+    measure("numpy exact-name path", lambda query: index.find_exact("rocket"))
+
+
+if __name__ == "__main__":
+    main()
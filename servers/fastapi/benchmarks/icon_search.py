@@ -0,0 +1,84 @@
+"""
+Icon lookup throughput for a 30-slide deck with 4 icons per slide.
+
+Compares one collection query per icon (the previous behaviour) with the
+micro-batched `search_icons`, which answers all concurrent slide lookups
+with a single embedding and ANN pass.
+
+Run from servers/fastapi:
+    python -m benchmarks.icon_search
+"""
+import asyncio
+import time
+
+from services.icon_finder_service import ICON_FINDER_SERVICE
+
+N_SLIDES = 30
+ICONS_PER_SLIDE = 4
+ROUNDS = 5
+
+ICON_QUERIES = [
+    "rocket launch", "growth chart", "team collaboration", "lightbulb idea",
+    "security shield", "cloud storage", "calendar schedule", "money savings",
+    "global network", "customer support", "book reading", "science atom",
+    "heart health", "leaf nature", "trophy award", "clock time",
+    "target goal", "gear settings", "chat message", "map location",
+    "graduation cap", "microscope lab", "music note", "camera photo",
+    "shopping cart", "truck delivery", "airplane travel", "house home",
+    "lock privacy", "battery energy",
+]
+
+
+def get_deck_queries():
+    return [
+        [
+            ICON_QUERIES[(slide * ICONS_PER_SLIDE + i) % len(ICON_QUERIES)]
+            for i in range(ICONS_PER_SLIDE)
+        ]
+        for slide in range(N_SLIDES)
+    ]
+
+
+async def per_query_lookup(deck):
+    async def slide_task(queries):
+        return await asyncio.gather(
+            *[ICON_FINDER_SERVICE.search_icons_batch([query]) for query in queries]
+        )
+
+    return await asyncio.gather(*[slide_task(queries) for queries in deck])
+
+
+async def micro_batched_lookup(deck):
+    async def slide_task(queries):
+        return await asyncio.gather(
+            *[ICON_FINDER_SERVICE.search_icons(query) for query in queries]
+        )
+
+    return await asyncio.gather(*[slide_task(queries) for queries in deck])
+
+
+async def measure(name, lookup):
+    deck = get_deck_queries()
+    await lookup(deck)  # warm up the embedding model
+
+    timings = []
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        await lookup(deck)
+        timings.append(time.perf_counter() - started_at)
+
+    best = min(timings)
+    n_icons = N_SLIDES * ICONS_PER_SLIDE
+    print(
+        f"{name:<14} best {best * 1000:8.1f} ms  "
+        f"({n_icons / best:8.0f} icons/s over {n_icons} icons)"
+    )
+
+
+async def main():
+    await measure("per-query", per_query_lookup)
+    await measure("micro-batched", micro_batched_lookup)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+PPTX picture transform timings on typical stock photo sizes.
+
+Run from servers/fastapi:
+    python -m benchmarks.image_utils
+"""
+import time
+
+import numpy as np
+from PIL import Image
+
+from models.pptx_models import PptxObjectFitEnum, PptxObjectFitModel
+from utils.image_utils import (
+    clip_image,
+    create_circle_image,
+    fit_image,
+    invert_image,
+    round_image_corners,
+    set_image_opacity,
+)
+
+SIZES = {"1080p": (1920, 1080), "2K": (2560, 1440), "4K": (3840, 2160)}
+ROUNDS = 3
+
+TRANSFORMS = {
+    "round_image_corners": lambda image: round_image_corners(image, [24, 24, 24, 24]),
+    "invert_image": invert_image,
+    "create_circle_image": create_circle_image,
+    "set_image_opacity": lambda image: set_image_opacity(image, 0.6),
+    "clip_image": lambda image: clip_image(image, 640, 360),
+    "fit_image (cover)": lambda image: fit_image(
+        image, 640, 360, PptxObjectFitModel(fit=PptxObjectFitEnum.COVER)
+    ),
+}
+
+
+def get_photo(width, height):
+    pixels = np.random.default_rng(0).integers(
+        0, 256, (height, width, 4), dtype=np.uint8
+    )
+    pixels[..., 3] = 255
+    return Image.fromarray(pixels, "RGBA")
+
+
+def main():
+    print(f"{'transform':<22}" + "".join(f"{name:>12}" for name in SIZES))
+    photos = {name: get_photo(*size) for name, size in SIZES.items()}
+    for transform_name, transform in TRANSFORMS.items():
+        row = f"{transform_name:<22}"
+        for photo in photos.values():
+            timings = []
+            for _ in range(ROUNDS):
+                started_at = time.perf_counter()
+                transform(photo)
+                timings.append(time.perf_counter() - started_at)
+            row += f"{min(timings) * 1000:9.1f} ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+PPTX to PDF conversion: cold `libreoffice --headless` per file vs the pool.
+
+Builds a text-and-shapes sample deck with python-pptx, then converts it
+sequentially with a fresh LibreOffice per file, sequentially on pooled
+workers (the first job includes the worker's startup) and concurrently on
+the pool. Needs LibreOffice and python3-uno, as in the Docker image.
+
+Run from servers/fastapi:
+    python -m benchmarks.libreoffice_pool [n_conversions] [n_workers]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+from services.libreoffice_pool import LibreOfficePool, convert_pptx_to_pdf_cold_start
+
+
+def create_sample_deck(path, n_slides=20):
+    presentation = Presentation()
+    for index in range(n_slides):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Lesson part {index + 1}"
+        body = slide.placeholders[1].text_frame
+        body.text = "Oscillations of a pendulum"
+        for line in ("Period and frequency", "Energy conservation", "Damping"):
+            paragraph = body.add_paragraph()
+            paragraph.text = line
+            paragraph.font.size = Pt(20)
+        slide.shapes.add_shape(1, Inches(6), Inches(5), Inches(2), Inches(1))
+    presentation.save(path)
+
+
+def report(name, latencies, wall_seconds):
+    print(
+        f"{name:<24} median {statistics.median(latencies):6.2f} s  "
+        f"max {max(latencies):6.2f} s  "
+        f"{len(latencies) / wall_seconds:5.2f} conversions/s"
+    )
+
+
+async def timed(convert):
+    started_at = time.perf_counter()
+    await convert()
+    return time.perf_counter() - started_at
+
+
+async def main():
+    n_conversions = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    n_workers = sys.argv[2] if len(sys.argv) > 2 else "2"
+    os.environ["LIBREOFFICE_WORKERS"] = n_workers
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pptx_paths = []
+        for index in range(n_conversions):
+            pptx_path = os.path.join(temp_dir, f"deck{index}.pptx")
+            create_sample_deck(pptx_path)
+            pptx_paths.append(pptx_path)
+
+        started_at = time.perf_counter()
+        latencies = [
+            await timed(
+                lambda: convert_pptx_to_pdf_cold_start(
+                    path, temp_dir, os.environ.copy(), 300
+                )
+            )
+            for path in pptx_paths
+        ]
+        report("cold start, sequential", latencies, time.perf_counter() - started_at)
+
+        pool = LibreOfficePool()
+        started_at = time.perf_counter()
+        latencies = [
+            await timed(lambda: pool.convert(path, temp_dir, {}))
+            for path in pptx_paths
+        ]
+        report("pool, sequential", latencies, time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        latencies = await asyncio.gather(
+            *(
+                timed(lambda path=path: pool.convert(path, temp_dir, {}))
+                for path in pptx_paths
+            )
+        )
+        report(
+            f"pool x{n_workers}, concurrent",
+            latencies,
+            time.perf_counter() - started_at,
+        )
+        await pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+PDF page rasterization for /pdf-slides/process.
+
+Builds a 60-page slide deck PDF and compares the previous sequential
+pdfplumber rendering at 150 DPI with the pdfium process pool, plus the time
+until the lazy mode can answer with page URLs.
+
+Run from servers/fastapi:
+    python -m benchmarks.pdf_rasterizer [pages]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pdfplumber
+from PIL import Image, ImageDraw
+
+from services.pdf_rasterizer import PdfRasterizer
+
+ROUNDS = 3
+
+
+def create_pdf(path, page_count):
+    rng = np.random.default_rng(0)
+    pages = []
+    for index in range(page_count):
+        # Photo-like area plus text, like an exported slide
+        page = Image.new("RGB", (1280, 720), "white")
+        photo = rng.integers(0, 256, (360, 560, 3), dtype=np.uint8)
+        page.paste(Image.fromarray(photo), (660, 200))
+        draw = ImageDraw.Draw(page)
+        draw.text((80, 80), f"Slide {index + 1}", fill="black")
+        for line in range(12):
+            draw.text((80, 200 + line * 30), "Body text " * 6, fill="black")
+        pages.append(page)
+    pages[0].save(path, "PDF", save_all=True, append_images=pages[1:], resolution=96)
+
+
+def render_with_pdfplumber(pdf_path, output_dir):
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            image = page.to_image(resolution=150)
+            image.save(os.path.join(output_dir, f"page_{page.page_number}.png"))
+
+
+def measure(name, run):
+    timings = []
+    for _ in range(ROUNDS):
+        with tempfile.TemporaryDirectory() as output_dir:
+            started_at = time.perf_counter()
+            run(output_dir)
+            timings.append(time.perf_counter() - started_at)
+    print(f"{name:<32} {min(timings) * 1000:9.1f} ms")
+
+
+def main():
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = os.path.join(temp_dir, "slides.pdf")
+        create_pdf(pdf_path, page_count)
+        print(f"{page_count} pages, {os.cpu_count()} CPUs")
+
+        measure(
+            "pdfplumber sequential",
+            lambda output_dir: render_with_pdfplumber(pdf_path, output_dir),
+        )
+
+        rasterizer = PdfRasterizer()
+        # Spawn the workers before timing
+        with tempfile.TemporaryDirectory() as output_dir:
+            asyncio.run(rasterizer.render_all(pdf_path, output_dir))
+        measure(
+            f"pdfium pool ({rasterizer.workers} workers)",
+            lambda output_dir: asyncio.run(
+                rasterizer.render_all(pdf_path, output_dir)
+            ),
+        )
+
+        os.environ["APP_DATA_DIRECTORY"] = os.path.join(temp_dir, "app_data")
+        measure(
+            "lazy: response with page URLs",
+            lambda _: asyncio.run(rasterizer.register(pdf_path)),
+        )
+        rasterizer.shutdown()
+
+
+if __name__ == "__main__":
+    main()
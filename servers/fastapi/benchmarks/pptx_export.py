@@ -0,0 +1,125 @@
+"""
+PPTX export time and file size for an image-heavy sample deck.
+
+Every slide has a full-bleed background photo, a rounded thumbnail and a
+circular avatar cut from 3000x2000 stock-like JPEGs; thumbnail and avatar
+sizes vary per slide so most pictures need their own transform. Runs
+without APP_DATA_DIRECTORY so the transform cache does not hide the work.
+
+Compares embedding originals (PPTX_PICTURE_DPI=0) with the default cap,
+and sequential (PPTX_PICTURE_WORKERS=1) with concurrent picture
+preparation.
+
+Run from servers/fastapi:
+    python -m benchmarks.pptx_export [n_slides]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from models.pptx_models import (
+    PptxBoxShapeEnum,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+N_SLIDES = 40
+N_PHOTOS = 6
+PHOTO_SIZE = (3000, 2000)
+
+
+def create_photos(directory):
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0 : PHOTO_SIZE[1], 0 : PHOTO_SIZE[0]]
+    paths = []
+    for i in range(N_PHOTOS):
+        gradient = np.stack(
+            [
+                (x * (i + 1) / PHOTO_SIZE[0] * 255) % 256,
+                (y / PHOTO_SIZE[1] * 255),
+                ((x + y) / sum(PHOTO_SIZE) * 255),
+            ],
+            axis=-1,
+        )
+        noise = rng.normal(0, 12, gradient.shape)
+        pixels = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+        path = os.path.join(directory, f"photo-{i}.jpg")
+        Image.fromarray(pixels).save(path, quality=92)
+        paths.append(path)
+    return paths
+
+
+def picture(path, left, top, width, height, **kwargs):
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(left=left, top=top, width=width, height=height),
+        picture=PptxPictureModel(is_network=False, path=path),
+        **kwargs,
+    )
+
+
+def get_sample_deck(photos, n_slides):
+    return PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    picture(photos[i % N_PHOTOS], 0, 0, 1280, 720, clip=False),
+                    picture(
+                        photos[(i + 1) % N_PHOTOS],
+                        80, 360, 320 + 4 * i, 200,
+                        border_radius=[16, 16, 16, 16],
+                    ),
+                    picture(
+                        photos[(i + 2) % N_PHOTOS],
+                        1000, 80, 160 + 2 * i, 160 + 2 * i,
+                        shape=PptxBoxShapeEnum.CIRCLE,
+                    ),
+                ]
+            )
+            for i in range(n_slides)
+        ]
+    )
+
+
+def export(photos, n_slides, directory):
+    deck = get_sample_deck(photos, n_slides)
+    temp_dir = tempfile.mkdtemp(dir=directory)
+    path = os.path.join(directory, "deck.pptx")
+    started_at = time.perf_counter()
+    pptx_creator = PptxPresentationCreator(deck, temp_dir)
+    asyncio.run(pptx_creator.create_ppt())
+    pptx_creator.save(path)
+    return time.perf_counter() - started_at, os.path.getsize(path)
+
+
+def main():
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else N_SLIDES
+    os.environ.pop("APP_DATA_DIRECTORY", None)
+    with tempfile.TemporaryDirectory() as directory:
+        photos = create_photos(directory)
+        runs = (
+            ("originals", {"PPTX_PICTURE_DPI": "0", "PPTX_PICTURE_WORKERS": "1"}),
+            ("capped, 1 worker", {"PPTX_PICTURE_WORKERS": "1"}),
+            ("capped, default", {}),
+        )
+        for name, env in runs:
+            for key in ("PPTX_PICTURE_DPI", "PPTX_PICTURE_WORKERS"):
+                os.environ.pop(key, None)
+            os.environ.update(env)
+            seconds, size = export(photos, n_slides, directory)
+            print(
+                f"{name:<18} {n_slides} slides  {seconds:6.2f} s  "
+                f"{size / 1024 / 1024:7.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
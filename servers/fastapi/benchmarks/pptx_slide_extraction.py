@@ -0,0 +1,100 @@
+"""
+Slide XML extraction from a media-heavy PPTX template upload.
+
+Builds a ~100 MB template (30 slides, each with a large incompressible
+photo) and compares the previous pipeline, which wrote the upload to disk,
+ran zipfile.extractall twice and parsed every slide for fonts three times,
+with the single in-memory pass used by /pptx-slides/process now.
+
+Run from servers/fastapi:
+    python -m benchmarks.pptx_slide_extraction [target_mb]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+from api.v1.ppt.endpoints.pptx_slides import _extract_slides, extract_fonts_from_oxml
+
+N_SLIDES = 30
+ROUNDS = 3
+
+
+def create_template(target_bytes):
+    presentation = Presentation()
+    rng = np.random.default_rng(0)
+    # Noise JPEGs take ~1.2 bytes per pixel and don't compress in the zip
+    side = int((target_bytes / N_SLIDES / 1.2) ** 0.5)
+    for index in range(N_SLIDES):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Section {index + 1}"
+        slide.placeholders[1].text = "Body text in the template font"
+        pixels = rng.integers(0, 256, (side, side, 3), dtype=np.uint8)
+        image = io.BytesIO()
+        Image.fromarray(pixels).save(image, "JPEG", quality=95)
+        image.seek(0)
+        slide.shapes.add_picture(image, Inches(5), Inches(2), Inches(4), Inches(4))
+    buffer = io.BytesIO()
+    presentation.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_extract_slide_xmls(pptx_path, temp_dir):
+    extract_dir = os.path.join(temp_dir, "pptx_extract")
+    with zipfile.ZipFile(pptx_path, "r") as zip_ref:
+        zip_ref.extractall(extract_dir)
+    slides_dir = os.path.join(extract_dir, "ppt", "slides")
+    slide_files = [
+        f
+        for f in os.listdir(slides_dir)
+        if f.startswith("slide") and f.endswith(".xml")
+    ]
+    slide_files.sort(key=lambda x: int(x.replace("slide", "").replace(".xml", "")))
+    slide_xmls = []
+    for slide_file in slide_files:
+        with open(os.path.join(slides_dir, slide_file), "r", encoding="utf-8") as f:
+            slide_xmls.append(f.read())
+    return slide_xmls
+
+
+def legacy_pipeline(pptx_content):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pptx_path = os.path.join(temp_dir, "presentation.pptx")
+        with open(pptx_path, "wb") as f:
+            f.write(pptx_content)
+        # process_pptx_slides, then again inside _convert_pptx_to_pdf
+        slide_xmls = legacy_extract_slide_xmls(pptx_path, temp_dir)
+        legacy_extract_slide_xmls(pptx_path, temp_dir)
+        # Fonts for the alias config, the analysis and each slide's fonts
+        for _ in range(3):
+            for xml in slide_xmls:
+                extract_fonts_from_oxml(xml)
+
+
+def measure(name, run):
+    timings = []
+    for _ in range(ROUNDS):
+        started_at = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started_at)
+    print(f"{name:<28} {min(timings) * 1000:9.1f} ms")
+
+
+def main():
+    target_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    pptx_content = create_template(target_mb * 1024 * 1024)
+    print(f"template: {len(pptx_content) / 1024 / 1024:.1f} MB, {N_SLIDES} slides")
+
+    measure("extractall x2, parse x3", lambda: legacy_pipeline(pptx_content))
+    measure("in-memory single pass", lambda: _extract_slides(pptx_content))
+
+
+if __name__ == "__main__":
+    main()
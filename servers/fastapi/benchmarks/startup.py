@@ -0,0 +1,49 @@
+"""
+Application startup time.
+
+Measures, in fresh interpreters, how long importing the app takes (the time
+before uvicorn can accept requests) and how long the icons index warm-up
+takes. Before the lazy IconFinderService the warm-up cost was paid inside
+the import; now it runs in the background after startup.
+
+Run from servers/fastapi:
+    python -m benchmarks.startup
+"""
+import subprocess
+import sys
+
+ROUNDS = 3
+
+IMPORT_APP = """
+import time
+started_at = time.perf_counter()
+import api.main
+print(time.perf_counter() - started_at)
+"""
+
+WARM_UP_ICONS = """
+import time
+from services.icon_finder_service import ICON_FINDER_SERVICE
+started_at = time.perf_counter()
+ICON_FINDER_SERVICE.load()
+print(time.perf_counter() - started_at)
+"""
+
+
+def measure(name, code):
+    timings = []
+    for _ in range(ROUNDS):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    print(f"{name:<18} best {min(timings):7.2f} s")
+
+
+def main():
+    measure("import api.main", IMPORT_APP)
+    measure("icons warm-up", WARM_UP_ICONS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Inline HTML to text runs on realistic slide text.
+
+The sample deck mixes English, Russian and Kazakh bullets, most of them plain
+and some with bold/italic/code markup, like generated lesson slides. Compares
+the parser that rebuilt the font for every chunk with the memoized one, then
+times populate_paragraph end to end, where plain paragraphs skip the parser.
+
+Run from servers/fastapi:
+    python -m benchmarks.text_runs [n_paragraphs]
+"""
+import sys
+import time
+
+from pptx import Presentation
+
+from models.pptx_models import PptxFontModel, PptxParagraphModel
+from services.html_to_text_runs_service import InlineHTMLToRunsParser
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+PARAGRAPHS = [
+    "The period of a simple pendulum depends only on its length and gravity",
+    "Колебания маятника описываются гармоническим законом",
+    "Маятниктің тербеліс периоды жіп ұзындығына тәуелді",
+    "<b>Key idea:</b> energy moves between kinetic and potential forms",
+    "Формула периода: <code>T = 2π√(l/g)</code>, где <i>l</i> — длина нити",
+    "Photosynthesis converts light energy into chemical energy",
+    "<strong>Анықтама.</strong> Жасуша — тірі ағзаның ең кіші бірлігі",
+    "Сила трения направлена <u>против</u> движения тела",
+    "Mitochondria produce ATP through cellular respiration\nIt happens in two stages",
+    "Use <em>units</em> consistently: <b>m</b>, <b>s</b>, <b>kg</b>",
+]
+FONT = PptxFontModel(name="Inter", size=20, color="1f2937")
+ROUNDS = 5
+PARAGRAPHS_PER_TEXTBOX = 6
+
+
+class PerChunkFontParser(InlineHTMLToRunsParser):
+    """The previous implementation: a fresh model and tag scans per chunk."""
+
+    def _current_font(self) -> PptxFontModel:
+        font_json = self.base_font.model_dump()
+        if any(tag in ("strong", "b") for tag in self.tag_stack):
+            font_json["font_weight"] = 700
+        if any(tag in ("em", "i") for tag in self.tag_stack):
+            font_json["italic"] = True
+        if any(tag == "u" for tag in self.tag_stack):
+            font_json["underline"] = True
+        if any(tag in ("s", "strike", "del") for tag in self.tag_stack):
+            font_json["strike"] = True
+        if any(tag == "code" for tag in self.tag_stack):
+            font_json["name"] = "Courier New"
+        return PptxFontModel(**font_json)
+
+
+def measure(name, run, n_paragraphs, prepare=lambda: None):
+    timings = []
+    for _ in range(ROUNDS):
+        prepared = prepare()
+        started_at = time.perf_counter()
+        run(prepared)
+        timings.append(time.perf_counter() - started_at)
+    per_paragraph = min(timings) / n_paragraphs
+    print(f"{name:<32} {per_paragraph * 1_000_000:8.1f} us/paragraph")
+
+
+def parse_all(parser_class, texts):
+    for text in texts:
+        parser = parser_class(FONT)
+        parser.feed(text.replace("\n", "<br>"))
+
+
+def get_empty_paragraphs(n_paragraphs):
+    # Slide-sized textboxes of PARAGRAPHS_PER_TEXTBOX bullets each
+    presentation = Presentation()
+    paragraphs = []
+    for index in range(n_paragraphs):
+        if index % PARAGRAPHS_PER_TEXTBOX == 0:
+            slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+            text_frame = slide.shapes.add_textbox(0, 0, 100, 100).text_frame
+        paragraphs.append(text_frame.add_paragraph())
+    return paragraphs
+
+
+def populate_all(creator, paragraphs, paragraph_models, use_fast_path):
+    for paragraph, paragraph_model in zip(paragraphs, paragraph_models):
+        if use_fast_path:
+            creator.populate_paragraph(paragraph, paragraph_model)
+            continue
+        creator.apply_font_to_paragraph(paragraph, paragraph_model.font)
+        for text_run_model in creator.parse_html_text_to_text_runs(
+            paragraph_model.font, paragraph_model.text
+        ):
+            creator.populate_text_run(paragraph.add_run(), text_run_model)
+
+
+def main():
+    n_paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    texts = [PARAGRAPHS[i % len(PARAGRAPHS)] for i in range(n_paragraphs)]
+    paragraph_models = [PptxParagraphModel(text=text, font=FONT) for text in texts]
+    creator = PptxPresentationCreator.__new__(PptxPresentationCreator)
+
+    measure(
+        "parse, font per chunk",
+        lambda _: parse_all(PerChunkFontParser, texts),
+        n_paragraphs,
+    )
+    measure(
+        "parse, memoized fonts",
+        lambda _: parse_all(InlineHTMLToRunsParser, texts),
+        n_paragraphs,
+    )
+    for name, use_fast_path in (
+        ("populate, always parse", False),
+        ("populate, plain text fast path", True),
+    ):
+        measure(
+            name,
+            lambda paragraphs: populate_all(
+                creator, paragraphs, paragraph_models, use_fast_path
+            ),
+            n_paragraphs,
+            lambda: get_empty_paragraphs(n_paragraphs),
+        )
+
+
+if __name__ == "__main__":
+    main()
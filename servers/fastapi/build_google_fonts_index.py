@@ -0,0 +1,22 @@
+"""
+Refreshes the bundled Google Fonts family index (assets/google_fonts.json).
+
+Run at image build time; when fonts.google.com is unreachable the bundled
+index is kept as is:
+    python build_google_fonts_index.py
+"""
+import asyncio
+import sys
+
+from services.google_fonts_service import (
+    GOOGLE_FONTS_JSON_PATH,
+    GOOGLE_FONTS_SERVICE,
+)
+
+if __name__ == "__main__":
+    if not asyncio.run(GOOGLE_FONTS_SERVICE.refresh()):
+        print(f"Keeping bundled {GOOGLE_FONTS_JSON_PATH}")
+        sys.exit(0)
+
+    GOOGLE_FONTS_SERVICE.index.save(GOOGLE_FONTS_JSON_PATH)
+    print(f"{len(GOOGLE_FONTS_SERVICE.index)} families written to {GOOGLE_FONTS_JSON_PATH}")
@@ -0,0 +1,24 @@
+"""
+Builds the in-memory icon search index (chroma/icon_index) from assets/icons.json.
+
+Run once at image build time so the server only memory-maps the embeddings:
+    python build_icon_index.py
+"""
+import os
+import sys
+
+from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+from services.icon_index import ICON_INDEX_DIRECTORY, ICONS_JSON_PATH, build_icon_index
+
+if __name__ == "__main__":
+    if not os.path.exists(ICONS_JSON_PATH):
+        print(f"{ICONS_JSON_PATH} not found, skipping icon index build")
+        sys.exit(0)
+
+    embedding_function = ONNXMiniLM_L6_V2()
+    embedding_function.DOWNLOAD_PATH = "chroma/models"
+    embedding_function._download_model_if_not_exists()
+
+    build_icon_index(embedding_function)
+    print(f"Icon index written to {ICON_INDEX_DIRECTORY}")
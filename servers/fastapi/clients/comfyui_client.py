@@ -0,0 +1,272 @@
+"""
+ComfyUI client for running image generation workflows.
+API docs: https://docs.comfy.org/development/comfyui-server/comms_overview
+
+Completion is detected from the server's websocket progress events instead of
+polling /history, so a job is downloaded as soon as it finishes. A single
+client is shared by all concurrent generations, which lets every image of a
+deck be submitted up front while at most `max_pending` jobs sit in the
+server's queue.
+"""
+import asyncio
+from collections import OrderedDict
+import os
+from typing import Dict, Optional
+import uuid
+
+import aiohttp
+
+from utils.get_env import get_comfyui_max_pending_env
+
+DEFAULT_MAX_PENDING = 4
+# Safety net for missed websocket events, /history is checked this often
+HISTORY_CHECK_INTERVAL = 5.0
+# Polling interval used only when the websocket cannot be opened
+FALLBACK_POLL_INTERVAL = 0.5
+# Unclaimed completion events kept; those of timed-out jobs are never claimed
+MAX_UNCLAIMED_EVENTS = 64
+
+
+class ComfyUIError(Exception):
+    pass
+
+
+class ComfyUIClient:
+    def __init__(self, base_url: str, max_pending: int = DEFAULT_MAX_PENDING):
+        self.base_url = base_url.rstrip("/")
+        self.client_id = str(uuid.uuid4())
+        self._pending_slots = asyncio.Semaphore(max_pending)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._websocket: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._waiters: Dict[str, asyncio.Future] = {}
+        # Events that arrived before their job was registered, prompt_id -> error
+        self._finished: "OrderedDict[str, Optional[str]]" = OrderedDict()
+
+    @property
+    def is_listening(self) -> bool:
+        return self._listener is not None and not self._listener.done()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(trust_env=True)
+        return self._session
+
+    async def _ensure_listening(self):
+        async with self._connect_lock:
+            if self.is_listening:
+                return
+            session = await self._get_session()
+            ws_url = self.base_url.replace("http", "ws", 1)
+            try:
+                self._websocket = await session.ws_connect(
+                    f"{ws_url}/ws?clientId={self.client_id}",
+                    heartbeat=30,
+                    timeout=aiohttp.ClientWSTimeout(ws_close=10),
+                )
+            except Exception as e:
+                print(f"ComfyUI websocket unavailable, falling back to polling: {e}")
+                return
+            self._listener = asyncio.create_task(self._listen(self._websocket))
+
+    async def _listen(self, websocket: aiohttp.ClientWebSocketResponse):
+        try:
+            async for message in websocket:
+                # Binary messages carry previews, only JSON events matter here
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                self._handle_event(message.json())
+        except Exception as e:
+            print(f"ComfyUI websocket closed: {e}")
+
+    def _handle_event(self, event: dict):
+        event_type = event.get("type")
+        data = event.get("data") or {}
+        prompt_id = data.get("prompt_id")
+        if not prompt_id:
+            return
+
+        if event_type == "execution_success" or (
+            event_type == "executing" and data.get("node") is None
+        ):
+            self._resolve(prompt_id, None)
+        elif event_type in ("execution_error", "execution_interrupted"):
+            self._resolve(
+                prompt_id, data.get("exception_message") or event_type.replace("_", " ")
+            )
+
+    def _resolve(self, prompt_id: str, error: Optional[str]):
+        waiter = self._waiters.get(prompt_id)
+        if waiter is None:
+            self._finished[prompt_id] = error
+            # Early events are claimed right after submit, so the oldest
+            # unclaimed ones belong to abandoned jobs
+            while len(self._finished) > MAX_UNCLAIMED_EVENTS:
+                self._finished.popitem(last=False)
+        elif not waiter.done():
+            waiter.set_result(error)
+
+    async def submit(self, workflow: dict) -> str:
+        session = await self._get_session()
+        async with session.post(
+            f"{self.base_url}/prompt",
+            json={"prompt": workflow, "client_id": self.client_id},
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise ComfyUIError(
+                    f"Failed to submit workflow to ComfyUI: {error_text}"
+                )
+            data = await response.json()
+
+        prompt_id = data.get("prompt_id")
+        if not prompt_id:
+            raise ComfyUIError("No prompt_id returned from ComfyUI")
+
+        self._waiters[prompt_id] = asyncio.get_running_loop().create_future()
+        if prompt_id in self._finished:
+            self._resolve(prompt_id, self._finished.pop(prompt_id))
+
+        print(f"ComfyUI workflow submitted. Prompt ID: {prompt_id}")
+        return prompt_id
+
+    async def get_history(self, prompt_id: str) -> Optional[dict]:
+        session = await self._get_session()
+        async with session.get(
+            f"{self.base_url}/history/{prompt_id}",
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as response:
+            if response.status != 200:
+                return None
+            try:
+                history = await response.json()
+            except Exception:
+                return None
+
+        execution_data = history.get(prompt_id)
+        if not execution_data:
+            return None
+
+        status = execution_data.get("status") or {}
+        if status.get("status_str") == "error":
+            raise ComfyUIError(f"ComfyUI workflow error: {status.get('messages')}")
+        if status.get("completed") or execution_data.get("outputs"):
+            return execution_data
+        return None
+
+    async def wait_for_completion(self, prompt_id: str, timeout: float) -> dict:
+        waiter = self._waiters[prompt_id]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise ComfyUIError(
+                        f"ComfyUI workflow timed out after {timeout} seconds"
+                    )
+
+                interval = (
+                    HISTORY_CHECK_INTERVAL
+                    if self.is_listening
+                    else FALLBACK_POLL_INTERVAL
+                )
+                try:
+                    error = await asyncio.wait_for(
+                        asyncio.shield(waiter), min(interval, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    execution_data = await self.get_history(prompt_id)
+                    if execution_data:
+                        return execution_data
+                    continue
+
+                if error:
+                    raise ComfyUIError(f"ComfyUI workflow error: {error}")
+
+                execution_data = await self.get_history(prompt_id)
+                if execution_data:
+                    return execution_data
+                raise ComfyUIError("ComfyUI finished without recording history")
+        finally:
+            self._waiters.pop(prompt_id, None)
+
+    async def download_output(self, execution_data: dict, output_directory: str) -> str:
+        session = await self._get_session()
+        for node_output in (execution_data.get("outputs") or {}).values():
+            for image_info in node_output.get("images") or []:
+                filename = image_info["filename"]
+                params = {"filename": filename, "type": image_info.get("type", "output")}
+                if image_info.get("subfolder"):
+                    params["subfolder"] = image_info["subfolder"]
+
+                async with session.get(
+                    f"{self.base_url}/view",
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=60),
+                ) as response:
+                    if response.status != 200:
+                        raise ComfyUIError(
+                            f"Failed to download image: {response.status}"
+                        )
+                    image_data = await response.read()
+
+                ext = filename.split(".")[-1] if "." in filename else "png"
+                image_path = os.path.join(output_directory, f"{uuid.uuid4()}.{ext}")
+                with open(image_path, "wb") as f:
+                    f.write(image_data)
+
+                print(f"Downloaded image from ComfyUI: {image_path}")
+                return image_path
+
+        raise ComfyUIError("No images found in ComfyUI outputs")
+
+    async def generate(
+        self, workflow: dict, output_directory: str, timeout: float = 300
+    ) -> str:
+        """Runs the workflow and returns the path of its first output image."""
+        async with self._pending_slots:
+            await self._ensure_listening()
+            prompt_id = await self.submit(workflow)
+            execution_data = await self.wait_for_completion(prompt_id, timeout)
+        return await self.download_output(execution_data, output_directory)
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        if self._websocket and not self._websocket.closed:
+            await self._websocket.close()
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+_CLIENTS: Dict[str, ComfyUIClient] = {}
+_CLIENTS_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_comfyui_client(base_url: str) -> ComfyUIClient:
+    """Returns the shared client for the ComfyUI server at `base_url`."""
+    global _CLIENTS_LOOP
+
+    loop = asyncio.get_running_loop()
+    if _CLIENTS_LOOP is not loop:
+        # Clients hold loop-bound sessions and futures
+        _CLIENTS.clear()
+        _CLIENTS_LOOP = loop
+
+    base_url = base_url.rstrip("/")
+    if base_url not in _CLIENTS:
+        max_pending = get_comfyui_max_pending_env()
+        _CLIENTS[base_url] = ComfyUIClient(
+            base_url, int(max_pending) if max_pending else DEFAULT_MAX_PENDING
+        )
+    return _CLIENTS[base_url]
+
+
+async def close_comfyui_clients():
+    for client in list(_CLIENTS.values()):
+        await client.close()
+    _CLIENTS.clear()
@@ -0,0 +1,154 @@
+# Keywords that force a stock/reference image SEARCH instead of AI generation.
+# Entries longer than three characters also match inflected forms (any word
+# suffix), so Russian and Kazakh entries are written as stems. Words whose
+# stem starts unrelated words ("трени" in "тренировка", "gene" in "general")
+# are listed with their forms in the *_WHOLE_WORDS lists, matched exactly.
+
+PHYSICS_KEYWORDS = [
+    "pendulum", "oscillation", "wave", "frequency", "amplitude", "period",
+    "momentum", "velocity", "acceleration", "force", "gravity", "friction",
+    "energy", "kinetic", "potential", "thermodynamics", "heat", "temperature",
+    "pressure", "volume", "gas", "molecule", "atom", "particle", "electron",
+    "photon", "quantum", "relativity", "electromagnetic", "magnetic", "electric",
+    "circuit", "resistance", "voltage", "capacitor", "inductor",
+    "lens", "mirror", "optics", "refraction", "reflection", "diffraction",
+    "formula", "equation", "physics", "mechanics", "dynamics", "statics",
+    "sinusoidal", "harmonic", "spring", "weight", "newton", "joule",
+    "watt", "hertz", "wavelength", "spectrum", "radiation", "nuclear",
+]
+
+CHEMISTRY_KEYWORDS = [
+    "molecule", "atom", "chemical", "reaction", "compound", "element",
+    "periodic", "electron", "proton", "neutron", "ion", "bond", "covalent",
+    "ionic", "hydrogen", "oxygen", "carbon", "nitrogen", "sulfur",
+    "acid", "ph", "oxidation", "reduction", "catalyst",
+    "organic", "inorganic", "polymer", "protein", "enzyme", "dna", "rna",
+    "chemistry", "molecular", "crystal", "solution", "concentration",
+    "molar", "molarity", "titration", "equilibrium",
+]
+
+BIOLOGY_KEYWORDS = [
+    "dna", "rna", "chromosome", "mitosis", "meiosis",
+    "protein", "enzyme", "bacteria", "virus", "organism", "species",
+    "evolution", "natural selection", "genetics", "heredity", "mutation",
+    "photosynthesis", "respiration", "metabolism", "ecosystem", "biome",
+    "anatomy", "physiology", "tissue", "neuron", "synapse",
+    "biology", "biological", "microscope", "specimen",
+    "membrane", "nucleus", "cytoplasm", "mitochondria", "chloroplast",
+]
+
+MATH_KEYWORDS = [
+    "graph", "chart", "diagram", "formula", "equation", "statistics",
+    "percentage", "proportion", "function", "derivative", "integral",
+    "algebra", "geometry", "trigonometry", "calculus", "probability",
+    "distribution", "median", "deviation", "variance", "correlation",
+    "pie chart", "bar chart", "histogram", "scatter", "plot", "axis",
+    "coordinate", "vector", "matrix", "theorem", "proof", "calculation",
+]
+
+EDUCATIONAL_KEYWORDS = [
+    "diagram", "schematic", "illustration", "infographic", "model",
+    "educational", "classroom", "blackboard", "whiteboard", "textbook",
+    "scientific", "technical", "labeled", "annotation", "scheme",
+    "structure", "system", "process", "cycle", "mechanism",
+]
+
+RUSSIAN_KEYWORDS = [
+    # Physics
+    "маятник", "колебан", "частот", "амплитуд", "импульс", "скорост",
+    "ускорен", "гравитац", "энерги", "кинетическ", "потенциальн",
+    "термодинамик", "температур", "давлен", "молекул", "атом", "частиц",
+    "электрон", "фотон", "квант", "относительност", "электромагнит", "магнит",
+    "электр", "напряжен", "сопротивлен", "конденсатор", "линз", "оптик",
+    "преломлен", "отражен", "дифракц", "физик", "механик", "гармоническ",
+    "пружин", "ньютон", "джоул", "спектр", "излучен", "ядерн",
+    # Chemistry
+    "хими", "реакц", "соединен", "периодическ", "протон", "нейтрон", "ион",
+    "ковалентн", "водород", "кислород", "углерод", "азот", "кислот",
+    "окислен", "катализатор", "органическ", "полимер", "белок", "белк",
+    "фермент", "днк", "рнк", "кристалл", "концентрац", "молярн", "титрован",
+    "равновеси",
+    # Biology
+    "клетк", "клеточн", "ген", "хромосом", "митоз", "мейоз", "бактери",
+    "вирус", "организм", "эволюц", "естественный отбор", "генетик",
+    "наследствен", "мутац", "фотосинтез", "метаболизм", "экосистем",
+    "анатоми", "физиологи", "ткан", "нейрон", "синапс", "биологи",
+    "микроскоп", "мембран", "цитоплазм", "митохондри", "хлоропласт",
+    # Math
+    "график", "диаграмм", "формул", "уравнен", "статистик", "процент",
+    "пропорц", "функц", "производн", "интеграл", "алгебр", "геометри",
+    "тригонометри", "вероятност", "распределен", "медиан", "дисперси",
+    "корреляц", "гистограмм", "координат", "вектор", "матриц", "теорем",
+    "доказательств", "вычислен",
+    # Educational
+    "схем", "иллюстрац", "инфографик", "учебн", "научн",
+    "техническ", "структур", "процесс", "цикл", "механизм",
+]
+
+KAZAKH_KEYWORDS = [
+    # Physics
+    "маятник", "тербеліс", "толқын", "жиілік", "амплитуда", "жылдамдық",
+    "үдеу", "тартылыс", "гравитация", "үйкеліс", "энергия", "кинетикалық",
+    "потенциалдық", "термодинамика", "температура", "қысым", "молекула",
+    "атом", "бөлшек", "электрон", "фотон", "кванттық", "магнит", "электр",
+    "кернеу", "кедергі", "конденсатор", "линза", "оптика", "сыну", "шағылу",
+    "физика", "механика", "серіппе", "спектр", "сәулелену", "ядролық",
+    # Chemistry
+    "химия", "химиялық", "реакция", "қосылыс", "периодтық", "протон",
+    "нейтрон", "ион", "сутегі", "оттегі", "көміртегі", "азот", "қышқыл",
+    "тотығу", "катализатор", "органикалық", "полимер", "ақуыз", "фермент",
+    "днқ", "рнқ", "кристалл", "ерітінді", "концентрация", "тепе-теңдік",
+    # Biology
+    "жасуша", "ген", "хромосома", "митоз", "мейоз", "бактерия", "вирус",
+    "организм", "эволюция", "табиғи сұрыпталу", "генетика", "тұқым қуалау",
+    "мутация", "фотосинтез", "тыныс алу", "зат алмасу", "экожүйе",
+    "анатомия", "физиология", "ұлпа", "нейрон", "синапс", "биология",
+    "микроскоп", "мембрана", "ядро", "цитоплазма", "митохондрия",
+    "хлоропласт",
+    # Math
+    "график", "диаграмма", "формула", "теңдеу", "статистика", "пайыз",
+    "пропорция", "функция", "туынды", "интеграл", "алгебра", "геометрия",
+    "тригонометрия", "ықтималдық", "үлестірім", "медиана", "корреляция",
+    "гистограмма", "координат", "вектор", "матрица", "теорема", "дәлелдеу",
+    "есептеу",
+    # Educational
+    "сызба", "схема", "иллюстрация", "инфографика", "модель", "оқулық",
+    "сынып", "тақта", "ғылыми", "техникалық", "құрылым", "процесс", "цикл",
+    "механизм",
+]
+
+ENGLISH_WHOLE_WORDS = [
+    "gene", "genes", "cell", "cells", "organ", "organs", "mass", "masses",
+    "mean", "base", "bases", "flow", "flows", "current", "currents", "ratio",
+    "ratios",
+]
+
+RUSSIAN_WHOLE_WORDS = [
+    # Friction, not тренировка/тренер/тренинг
+    "трение", "трения", "трению", "трением", "трении", "трений",
+    # Blackboard and classroom, not "классная" (cool) or "доскональный"
+    "доска", "доски", "доске", "доску", "доской", "досок", "доскам",
+    "досками", "досках", "классная комната", "классной комнате",
+    "классной комнаты", "классную комнату",
+    # Waves, not волнение/волноваться
+    "волна", "волны", "волне", "волну", "волной", "волн", "волнам",
+    "волнами", "волнах", "волновой", "волновая", "волновое", "волновые",
+    "волнового", "волновых",
+]
+
+IMAGE_SEARCH_KEYWORDS = {
+    "en": (
+        PHYSICS_KEYWORDS
+        + CHEMISTRY_KEYWORDS
+        + BIOLOGY_KEYWORDS
+        + MATH_KEYWORDS
+        + EDUCATIONAL_KEYWORDS
+    ),
+    "ru": RUSSIAN_KEYWORDS,
+    "kk": KAZAKH_KEYWORDS,
+}
+
+IMAGE_SEARCH_WHOLE_WORDS = {
+    "en": ENGLISH_WHOLE_WORDS,
+    "ru": RUSSIAN_WHOLE_WORDS,
+}
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class SavedUploadFile(BaseModel):
+    path: str
+    size: int
+    sha256: str
@@ -3,17 +3,21 @@ Adaptive Image Service - Intelligently decides whether to generate or search for
 Uses LLM to classify prompts and aggregates results from multiple sources.
 """
 import asyncio
-from typing import List, Literal, Optional
+from typing import AsyncIterator, List, Literal, Optional, Tuple
 from pydantic import BaseModel
 import aiohttp
 
 from clients import unsplash_client, wikimedia_client
 from services.image_generation_service import ImageGenerationService
+from services.image_source_classifier import IMAGE_SOURCE_CLASSIFIER
 from utils.get_env import get_pexels_api_key_env, get_pixabay_api_key_env
 from services.llm_client import LLMClient
 from utils.llm_provider import get_model
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 
+# Slow image providers are dropped after this many seconds
+IMAGE_SEARCH_DEADLINE_SECONDS = 6.0
+
 
 class ImageAlternative(BaseModel):
     """Represents a single image alternative."""
@@ -44,81 +48,25 @@ class AdaptiveImageService:
     async def decide_image_source(self, prompt: str) -> tuple[Literal["generate", "search"], str]:
         """
         Use LLM to decide whether to generate or search for an image.
-        First checks for scientific/educational keywords to force SEARCH.
+        First checks for scientific/educational keywords to force SEARCH,
+        then reuses earlier LLM decisions for the same normalized prompt.
         
         Returns:
             Tuple of (decision, reason)
         """
-        prompt_lower = prompt.lower()
-        
         # KEYWORD-BASED PRE-CLASSIFICATION - forces SEARCH for scientific content
-        # Physics keywords
-        physics_keywords = [
-            "pendulum", "oscillation", "wave", "frequency", "amplitude", "period",
-            "momentum", "velocity", "acceleration", "force", "gravity", "friction",
-            "energy", "kinetic", "potential", "thermodynamics", "heat", "temperature",
-            "pressure", "volume", "gas", "molecule", "atom", "particle", "electron",
-            "photon", "quantum", "relativity", "electromagnetic", "magnetic", "electric",
-            "circuit", "resistance", "voltage", "current", "capacitor", "inductor",
-            "lens", "mirror", "optics", "refraction", "reflection", "diffraction",
-            "formula", "equation", "physics", "mechanics", "dynamics", "statics",
-            "sinusoidal", "harmonic", "spring", "mass", "weight", "newton", "joule",
-            "watt", "hertz", "wavelength", "spectrum", "radiation", "nuclear"
-        ]
-        
-        # Chemistry keywords
-        chemistry_keywords = [
-            "molecule", "atom", "chemical", "reaction", "compound", "element",
-            "periodic", "electron", "proton", "neutron", "ion", "bond", "covalent",
-            "ionic", "hydrogen", "oxygen", "carbon", "nitrogen", "sulfur",
-            "acid", "base", "ph", "oxidation", "reduction", "catalyst",
-            "organic", "inorganic", "polymer", "protein", "enzyme", "dna", "rna",
-            "chemistry", "molecular", "crystal", "solution", "concentration",
-            "molar", "molarity", "titration", "equilibrium"
-        ]
-        
-        # Biology keywords
-        biology_keywords = [
-            "cell", "dna", "rna", "gene", "chromosome", "mitosis", "meiosis",
-            "protein", "enzyme", "bacteria", "virus", "organism", "species",
-            "evolution", "natural selection", "genetics", "heredity", "mutation",
-            "photosynthesis", "respiration", "metabolism", "ecosystem", "biome",
-            "anatomy", "physiology", "organ", "tissue", "neuron", "synapse",
-            "biology", "biological", "microscope", "specimen", "bacteria",
-            "membrane", "nucleus", "cytoplasm", "mitochondria", "chloroplast"
-        ]
-        
-        # Math/Statistics keywords
-        math_keywords = [
-            "graph", "chart", "diagram", "formula", "equation", "statistics",
-            "percentage", "ratio", "proportion", "function", "derivative", "integral",
-            "algebra", "geometry", "trigonometry", "calculus", "probability",
-            "distribution", "mean", "median", "deviation", "variance", "correlation",
-            "pie chart", "bar chart", "histogram", "scatter", "plot", "axis",
-            "coordinate", "vector", "matrix", "theorem", "proof", "calculation"
-        ]
-        
-        # Educational/Technical keywords
-        educational_keywords = [
-            "diagram", "schematic", "illustration", "infographic", "model",
-            "educational", "classroom", "blackboard", "whiteboard", "textbook",
-            "scientific", "technical", "labeled", "annotation", "scheme",
-            "structure", "system", "process", "cycle", "flow", "mechanism"
-        ]
-        
-        # Check all keyword categories
-        all_search_keywords = (
-            physics_keywords + chemistry_keywords + biology_keywords + 
-            math_keywords + educational_keywords
-        )
-        
-        matched_keywords = [kw for kw in all_search_keywords if kw in prompt_lower]
-        
+        # (English, Russian and Kazakh keywords, compiled into a single regex)
+        matched_keywords = IMAGE_SOURCE_CLASSIFIER.match_keywords(prompt)
+
         if matched_keywords:
             reason = f"Scientific/educational content detected: {', '.join(matched_keywords[:3])}"
             print(f"Adaptive Image: Forced SEARCH due to keywords: {matched_keywords[:5]}")
             return "search", reason
-        
+
+        cached_decision = IMAGE_SOURCE_CLASSIFIER.get_cached_decision(prompt)
+        if cached_decision:
+            return cached_decision
+
         # If no keywords matched, use LLM for decision
         llm_client = LLMClient()
         model = get_model()
@@ -191,6 +139,7 @@ Your response (JSON only):"""
                 if decision not in ["generate", "search"]:
                     decision = "search"
                 
+                IMAGE_SOURCE_CLASSIFIER.cache_decision(prompt, (decision, reason))
                 return decision, reason
             
         except Exception as e:
@@ -263,59 +212,74 @@ Your response (JSON only):"""
             print(f"Pixabay search error: {e}")
             return []
     
-    async def search_multiple_sources(self, query: str, per_source: int = 2) -> List[ImageAlternative]:
+    def _get_source_searches(self, query: str, per_source: int):
+        return {
+            "unsplash": unsplash_client.search_images(query, per_source),
+            "wikimedia": wikimedia_client.search_images(query, per_source),
+            "pexels": self.search_pexels_multiple(query, per_source),
+            "pixabay": self.search_pixabay_multiple(query, per_source),
+        }
+
+    @staticmethod
+    def _to_alternatives(source: str, results) -> List[ImageAlternative]:
+        if not isinstance(results, list):
+            return []
+        if source in ("pexels", "pixabay"):
+            return results
+        # Unsplash and Wikimedia clients return their own result models
+        return [
+            ImageAlternative(
+                url=img.url,
+                thumbnail_url=img.thumbnail_url,
+                source=source,
+                attribution=img.attribution,
+                description=img.description
+            )
+            for img in results
+        ]
+
+    async def stream_multiple_sources(
+        self,
+        query: str,
+        per_source: int = 2,
+        deadline: float = IMAGE_SEARCH_DEADLINE_SECONDS,
+    ) -> AsyncIterator[Tuple[str, List[ImageAlternative]]]:
         """
-        Search multiple image sources in parallel.
-        
-        Args:
-            query: Search query
-            per_source: Number of images to fetch from each source
-        
-        Returns:
-            Combined list of images from all sources
+        Search multiple image sources in parallel and yield (source, images)
+        as each source responds. Sources still pending when the deadline
+        passes are cancelled and dropped.
         """
-        # Run all searches in parallel
-        tasks = [
-            unsplash_client.search_images(query, per_source),
-            wikimedia_client.search_images(query, per_source),
-            self.search_pexels_multiple(query, per_source),
-            self.search_pixabay_multiple(query, per_source),
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        all_images: List[ImageAlternative] = []
-        
-        # Process Unsplash results
-        if isinstance(results[0], list):
-            for img in results[0]:
-                all_images.append(ImageAlternative(
-                    url=img.url,
-                    thumbnail_url=img.thumbnail_url,
-                    source="unsplash",
-                    attribution=img.attribution,
-                    description=img.description
-                ))
-        
-        # Process Wikimedia results
-        if isinstance(results[1], list):
-            for img in results[1]:
-                all_images.append(ImageAlternative(
-                    url=img.url,
-                    thumbnail_url=img.thumbnail_url,
-                    source="wikimedia",
-                    attribution=img.attribution,
-                    description=img.description
-                ))
-        
-        # Process Pexels results
-        if isinstance(results[2], list):
-            all_images.extend(results[2])
-        
-        # Process Pixabay results
-        if isinstance(results[3], list):
-            all_images.extend(results[3])
-        
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + deadline
+        tasks = {
+            asyncio.create_task(search): source
+            for source, search in self._get_source_searches(query, per_source).items()
+        }
+        pending = set(tasks)
+
+        try:
+            while pending:
+                remaining = deadline_at - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    source = tasks[task]
+                    if task.exception():
+                        print(f"{source} search error: {task.exception()}")
+                        continue
+                    yield source, self._to_alternatives(source, task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                dropped = sorted(tasks[task] for task in pending)
+                print(f"Image search deadline passed, dropped sources: {dropped}")
+
+    @staticmethod
+    def interleave_sources(all_images: List[ImageAlternative]) -> List[ImageAlternative]:
         # Interleave results from different sources for variety
         # Group by source, then interleave
         by_source = {}
@@ -332,7 +296,29 @@ Your response (JSON only):"""
                     interleaved.append(by_source[source][i])
         
         return interleaved[:10]  # Return max 10 alternatives
-    
+
+    async def search_multiple_sources(
+        self,
+        query: str,
+        per_source: int = 2,
+        deadline: float = IMAGE_SEARCH_DEADLINE_SECONDS,
+    ) -> List[ImageAlternative]:
+        """
+        Search multiple image sources in parallel.
+        
+        Args:
+            query: Search query
+            per_source: Number of images to fetch from each source
+            deadline: Seconds to wait before dropping slow sources
+        
+        Returns:
+            Combined list of images from all sources
+        """
+        all_images: List[ImageAlternative] = []
+        async for _, images in self.stream_multiple_sources(query, per_source, deadline):
+            all_images.extend(images)
+        return self.interleave_sources(all_images)
+
     async def get_adaptive_image(
         self, prompt: str, language: str = "English"
     ) -> AdaptiveImageResponse:
@@ -364,40 +350,42 @@ Your response (JSON only):"""
         
         if decision == "generate":
             # Step 2b: Generate with AI
-            from models.image_prompt import ImagePrompt
-            image_prompt = ImagePrompt(prompt=prompt, language=language)
-            
-            try:
-                result = await self.image_gen_service.generate_image(image_prompt)
-                
-                if isinstance(result, str):
-                    # URL or path
-                    images = [ImageAlternative(
-                        url=result,
-                        source="ai",
-                        attribution="AI Generated",
-                        description=prompt
-                    )]
-                else:
-                    # ImageAsset
-                    images = [ImageAlternative(
-                        url=result.path,
-                        source="ai",
-                        attribution="AI Generated",
-                        description=prompt
-                    )]
-            except Exception as e:
-                print(f"AI generation error: {e}")
-                # Return placeholder
-                images = [ImageAlternative(
-                    url="/static/images/placeholder.jpg",
-                    source="placeholder",
-                    attribution="Placeholder",
-                    description="Image generation failed"
-                )]
+            images = await self.generate_alternatives(prompt, language)
         
         return AdaptiveImageResponse(
             decision=decision,
             reason=reason,
             images=images
         )
+
+    async def generate_alternatives(
+        self, prompt: str, language: str = "English"
+    ) -> List[ImageAlternative]:
+        """Generates one AI image, or returns the placeholder if that fails."""
+        from models.image_prompt import ImagePrompt
+        image_prompt = ImagePrompt(prompt=prompt, language=language)
+        
+        try:
+            result = await self.image_gen_service.generate_image(image_prompt)
+            
+            if isinstance(result, str):
+                # URL or path
+                url = result
+            else:
+                # ImageAsset
+                url = result.path
+            return [ImageAlternative(
+                url=url,
+                source="ai",
+                attribution="AI Generated",
+                description=prompt
+            )]
+        except Exception as e:
+            print(f"AI generation error: {e}")
+            # Return placeholder
+            return [ImageAlternative(
+                url="/static/images/placeholder.jpg",
+                source="placeholder",
+                attribution="Placeholder",
+                description="Image generation failed"
+            )]
@@ -1,3 +1,7 @@
+import threading
+import time
+from typing import Optional
+
 try:
     from docling.document_converter import (
         DocumentConverter,
@@ -15,7 +19,13 @@ except ImportError:
 
 
 class DoclingService:
+    """
+    Wraps a docling DocumentConverter. Building it and loading its pipeline
+    models is slow, so use `get_docling_service` for the process-wide one.
+    """
+
     def __init__(self):
+        self.warm_up_seconds: Optional[float] = None
         if not DOCLING_AVAILABLE:
             print("WARNING: Docling not installed. Document parsing will fail if attempted.")
             self.converter = None
@@ -39,9 +49,43 @@ class DoclingService:
             },
         )
 
+    def warm_up(self):
+        """Loads each format's pipeline, which docling otherwise does on first use."""
+        if self.converter is None or self.warm_up_seconds is not None:
+            return
+        started_at = time.perf_counter()
+        for input_format in (InputFormat.PDF, InputFormat.DOCX, InputFormat.PPTX):
+            self.converter.initialize_pipeline(input_format)
+        self.warm_up_seconds = time.perf_counter() - started_at
+        print(f"Docling converter warmed up in {self.warm_up_seconds:.2f}s.")
+
     def parse_to_markdown(self, file_path: str) -> str:
         if not DOCLING_AVAILABLE or not self.converter:
             raise ImportError("Docling is not installed. Cannot parse documents. To use this feature, run with full Docker image.")
 
         result = self.converter.convert(file_path)
         return result.document.export_to_markdown()
+
+
+_DOCLING_SERVICE: Optional[DoclingService] = None
+_DOCLING_SERVICE_LOCK = threading.Lock()
+
+
+def get_docling_service() -> DoclingService:
+    """Returns this process's DoclingService, creating it on first use."""
+    global _DOCLING_SERVICE
+    with _DOCLING_SERVICE_LOCK:
+        if _DOCLING_SERVICE is None:
+            _DOCLING_SERVICE = DoclingService()
+        return _DOCLING_SERVICE
+
+
+def warm_up_docling_service():
+    """Builds and warms this process's converter when docling is installed."""
+    if not DOCLING_AVAILABLE:
+        return
+    try:
+        get_docling_service().warm_up()
+    except Exception as e:
+        # Parsing reports the real error later; don't break the worker
+        print(f"Docling warm-up failed: {e}")
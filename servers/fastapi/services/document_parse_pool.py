@@ -0,0 +1,172 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import time
+from typing import Any, Callable, List, Optional
+
+from fastapi import HTTPException
+
+from services.docling_service import (
+    DOCLING_AVAILABLE,
+    get_docling_service,
+    warm_up_docling_service,
+)
+from utils.get_env import (
+    get_document_parse_timeout_env,
+    get_document_parse_workers_env,
+)
+
+DEFAULT_TIMEOUT = 300
+
+
+def parse_document_to_markdown(file_path: str) -> str:
+    """Converts a PDF, DOCX or PPTX to markdown. Runs inside a pool worker."""
+    return get_docling_service().parse_to_markdown(file_path)
+
+
+class DocumentParsePool:
+    """
+    Parses uploaded documents with docling in worker processes, so a large
+    PDF no longer blocks the event loop and several files parse in parallel.
+    A parse running longer than DOCUMENT_PARSE_TIMEOUT seconds has its worker
+    process terminated. DOCUMENT_PARSE_WORKERS=0 parses in a thread of this
+    process, where the timeout is reported but cannot stop the parse.
+
+    Each worker is a single-process executor taken from an idle queue, so
+    time spent waiting for a free worker doesn't count against the timeout
+    and a timed-out parse is stopped without touching the others. Workers
+    keep one docling converter and warm it when they start; `start_warm_up`
+    starts every worker from the app lifespan.
+    """
+
+    def __init__(self):
+        self._executors: List[ProcessPoolExecutor] = []
+        self._idle_executors: Optional[asyncio.Queue] = None
+        self._warm_up_task: Optional[asyncio.Future] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.total_parse_seconds = 0.0
+
+    @property
+    def workers(self) -> int:
+        workers = get_document_parse_workers_env()
+        return int(workers) if workers else min(2, os.cpu_count() or 1)
+
+    @property
+    def timeout(self) -> float:
+        value = get_document_parse_timeout_env()
+        return float(value) if value else DEFAULT_TIMEOUT
+
+    @property
+    def idle_executors(self) -> asyncio.Queue:
+        if self._idle_executors is None:
+            self._idle_executors = asyncio.Queue()
+            for _ in range(self.workers):
+                executor = self._create_executor()
+                self._executors.append(executor)
+                self._idle_executors.put_nowait(executor)
+        return self._idle_executors
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # Spawned workers don't inherit the event loop, sockets or locks
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_up_docling_service,
+        )
+
+    def _replace(self, executor: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        # A running task can't be cancelled, only its process killed
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        replacement = self._create_executor()
+        self._executors[self._executors.index(executor)] = replacement
+        return replacement
+
+    def _start_workers(self) -> asyncio.Future:
+        # A process starts with its first task, so one task per worker
+        return asyncio.gather(*(self._run(os.getpid) for _ in range(self.workers)))
+
+    def start_warm_up(self) -> Optional[asyncio.Future]:
+        """Starts every worker, which warm their converters, in the background."""
+        if not DOCLING_AVAILABLE:
+            return None
+        if self.workers <= 0:
+            warm_up = asyncio.to_thread(warm_up_docling_service)
+        else:
+            warm_up = self._start_workers()
+        self._warm_up_task = asyncio.ensure_future(warm_up)
+        self._warm_up_task.add_done_callback(self._log_warm_up_failure)
+        return self._warm_up_task
+
+    @staticmethod
+    def _log_warm_up_failure(task: asyncio.Future):
+        if not task.cancelled() and task.exception():
+            print(f"Document parse pool warm-up failed: {task.exception()}")
+
+    async def _run_in(
+        self, executor: ProcessPoolExecutor, fn: Callable[..., Any], *args
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(executor, fn, *args), self.timeout
+        )
+
+    async def _run(self, fn: Callable[..., Any], *args) -> Any:
+        if self.workers <= 0:
+            return await asyncio.wait_for(asyncio.to_thread(fn, *args), self.timeout)
+
+        idle_executors = self.idle_executors
+        # The timeout starts once a worker is free, not while queued
+        executor = await idle_executors.get()
+        try:
+            try:
+                return await self._run_in(executor, fn, *args)
+            except BrokenProcessPool:
+                # The worker died (e.g. OOM)
+                print("Document parse worker died, retrying on a new process")
+                executor = self._replace(executor)
+                return await self._run_in(executor, fn, *args)
+        except (asyncio.TimeoutError, asyncio.CancelledError, BrokenProcessPool):
+            # The worker may still be busy with this file
+            executor = self._replace(executor)
+            raise
+        finally:
+            idle_executors.put_nowait(executor)
+
+    async def parse(self, file_path: str) -> str:
+        """Returns the document's markdown."""
+        self.in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            document = await self._run(parse_document_to_markdown, file_path)
+        except asyncio.TimeoutError:
+            self.failed += 1
+            self.timed_out += 1
+            raise HTTPException(
+                status_code=504,
+                detail=f"Parsing {os.path.basename(file_path)} timed out after {self.timeout:g} seconds",
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            self.total_parse_seconds += time.perf_counter() - started_at
+        finally:
+            self.in_flight -= 1
+        return document
+
+    def shutdown(self):
+        for executor in self._executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors = []
+        self._idle_executors = None
+
+
+DOCUMENT_PARSE_POOL = DocumentParsePool()
@@ -2,7 +2,6 @@ import mimetypes
 from fastapi import HTTPException
 import os, asyncio
 from typing import List, Optional, Tuple
-import pdfplumber
 
 from constants.documents import (
     PDF_MIME_TYPES,
@@ -10,7 +9,13 @@ from constants.documents import (
     TEXT_MIME_TYPES,
     WORD_TYPES,
 )
-from services.docling_service import DoclingService
+from services.document_parse_pool import DOCUMENT_PARSE_POOL
+from services.pdf_rasterizer import (
+    PDF_RASTERIZER,
+    get_page_filename,
+    get_pdf_page_count,
+    render_pdf_pages,
+)
 
 
 class DocumentsLoader:
@@ -18,8 +23,6 @@ class DocumentsLoader:
     def __init__(self, file_paths: List[str]):
         self._file_paths = file_paths
 
-        self.docling_service = DoclingService()
-
         self._documents: List[str] = []
         self._images: List[List[str]] = []
 
@@ -37,10 +40,11 @@ class DocumentsLoader:
         load_text: bool = True,
         load_images: bool = False,
     ):
-        """If load_images is True, temp_dir must be provided"""
-
-        documents: List[str] = []
-        images: List[str] = []
+        """
+        If load_images is True, temp_dir must be provided. Files are loaded
+        concurrently, parsed on the document parse pool, and kept in the
+        order they were given.
+        """
 
         for file_path in self._file_paths:
             if not os.path.exists(file_path):
@@ -48,26 +52,39 @@ class DocumentsLoader:
                     status_code=404, detail=f"File {file_path} not found"
                 )
 
-            document = ""
-            imgs = []
-
-            mime_type = mimetypes.guess_type(file_path)[0]
-            if mime_type in PDF_MIME_TYPES:
-                document, imgs = await self.load_pdf(
-                    file_path, load_text, load_images, temp_dir
-                )
-            elif mime_type in TEXT_MIME_TYPES:
-                document = await self.load_text(file_path)
-            elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
-            elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
+        results = await asyncio.gather(
+            *(
+                self.load_document(file_path, load_text, load_images, temp_dir)
+                for file_path in self._file_paths
+            )
+        )
 
-            documents.append(document)
-            images.append(imgs)
+        self._documents = [document for document, _ in results]
+        self._images = [imgs for _, imgs in results]
 
-        self._documents = documents
-        self._images = images
+    async def load_document(
+        self,
+        file_path: str,
+        load_text: bool,
+        load_images: bool,
+        temp_dir: Optional[str] = None,
+    ) -> Tuple[str, List[str]]:
+        document = ""
+        imgs = []
+
+        mime_type = mimetypes.guess_type(file_path)[0]
+        if mime_type in PDF_MIME_TYPES:
+            document, imgs = await self.load_pdf(
+                file_path, load_text, load_images, temp_dir
+            )
+        elif mime_type in TEXT_MIME_TYPES:
+            document = await self.load_text(file_path)
+        elif mime_type in POWERPOINT_TYPES:
+            document = await self.load_powerpoint(file_path)
+        elif mime_type in WORD_TYPES:
+            document = await self.load_msword(file_path)
+
+        return document, imgs
 
     async def load_pdf(
         self,
@@ -80,7 +97,7 @@ class DocumentsLoader:
         document: str = ""
 
         if load_text:
-            document = self.docling_service.parse_to_markdown(file_path)
+            document = await DOCUMENT_PARSE_POOL.parse(file_path)
 
         if load_images:
             image_paths = await self.get_page_images_from_pdf_async(file_path, temp_dir)
@@ -91,25 +108,21 @@ class DocumentsLoader:
         with open(file_path, "r") as file:
             return await asyncio.to_thread(file.read)
 
-    def load_msword(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_msword(self, file_path: str) -> str:
+        return await DOCUMENT_PARSE_POOL.parse(file_path)
 
-    def load_powerpoint(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_powerpoint(self, file_path: str) -> str:
+        return await DOCUMENT_PARSE_POOL.parse(file_path)
 
     @classmethod
     def get_page_images_from_pdf(cls, file_path: str, temp_dir: str) -> List[str]:
-        with pdfplumber.open(file_path) as pdf:
-            images = []
-            for page in pdf.pages:
-                img = page.to_image(resolution=150)
-                image_path = os.path.join(temp_dir, f"page_{page.page_number}.png")
-                img.save(image_path)
-                images.append(image_path)
-            return images
+        page_numbers = list(range(1, get_pdf_page_count(file_path) + 1))
+        render_pdf_pages(file_path, temp_dir, page_numbers)
+        return [
+            os.path.join(temp_dir, get_page_filename(page_number))
+            for page_number in page_numbers
+        ]
 
     @classmethod
     async def get_page_images_from_pdf_async(cls, file_path: str, temp_dir: str):
-        return await asyncio.to_thread(
-            cls.get_page_images_from_pdf, file_path, temp_dir
-        )
+        return await PDF_RASTERIZER.render_all(file_path, temp_dir)
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Literal, Optional
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import func, select
+
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from utils.asset_directory_utils import get_exports_cache_directory
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_export_cache_disabled_env,
+)
+from utils.parsers import parse_bool_or_none
+
+# Bump when export rendering changes so artifacts built by older code are missed
+EXPORT_RENDERER_VERSION = 1
+
+
+class ExportCacheService:
+    """
+    Keeps a copy of the last PPTX/PDF exported for each presentation revision.
+
+    Keys combine the presentation id, a hash of its slides, the export format
+    and the template version, so repeated downloads and unchanged /edit flows
+    reuse the artifact instead of rebuilding it. Cached files are named
+    `<presentation id>-<key>.<format>`; edits drop all of a presentation's
+    entries through `invalidate`.
+    """
+
+    def is_enabled(self) -> bool:
+        return bool(get_app_data_directory_env()) and not parse_bool_or_none(
+            get_export_cache_disabled_env()
+        )
+
+    def get_slides_hash(self, slides: list[SlideModel]) -> str:
+        slides_data = [
+            [
+                slide.index,
+                slide.layout_group,
+                slide.layout,
+                slide.content,
+                slide.html_content,
+                slide.speaker_note,
+                slide.properties,
+            ]
+            for slide in sorted(slides, key=lambda slide: slide.index)
+        ]
+        return hashlib.sha256(
+            json.dumps(slides_data, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    async def get_template_version(
+        self, sql_session: AsyncSession, presentation: PresentationModel
+    ) -> str:
+        template_data = [EXPORT_RENDERER_VERSION, presentation.layout]
+        layout_name = (presentation.layout or {}).get("name") or ""
+        if layout_name.startswith("custom-"):
+            # Custom layouts are rendered from stored TSX that can be re-saved
+            try:
+                template_id = uuid.UUID(layout_name.replace("custom-", ""))
+            except ValueError:
+                template_id = None
+            if template_id:
+                template_data.append(
+                    await sql_session.scalar(
+                        select(func.max(PresentationLayoutCodeModel.updated_at)).where(
+                            PresentationLayoutCodeModel.presentation == template_id
+                        )
+                    )
+                )
+        return hashlib.sha256(
+            json.dumps(template_data, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    async def get_key(
+        self,
+        sql_session: AsyncSession,
+        presentation: PresentationModel,
+        export_as: Literal["pptx", "pdf"],
+    ) -> str:
+        slides = await sql_session.scalars(
+            select(SlideModel).where(SlideModel.presentation == presentation.id)
+        )
+        key_data = [
+            str(presentation.id),
+            self.get_slides_hash(list(slides)),
+            export_as,
+            await self.get_template_version(sql_session, presentation),
+        ]
+        return hashlib.sha256(json.dumps(key_data).encode("utf-8")).hexdigest()
+
+    def _get_path(
+        self, presentation_id: uuid.UUID, key: str, export_as: str
+    ) -> str:
+        return os.path.join(
+            get_exports_cache_directory(), f"{presentation_id}-{key}.{export_as}"
+        )
+
+    def _copy(self, source: str, destination: str):
+        # Replace rather than overwrite, a download may still be reading it
+        temp_path = f"{destination}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copy2(source, temp_path)
+        os.replace(temp_path, destination)
+
+    def get(
+        self,
+        presentation_id: uuid.UUID,
+        key: str,
+        export_as: Literal["pptx", "pdf"],
+        destination: str,
+    ) -> Optional[str]:
+        """Puts the cached artifact at `destination` and returns it, if any."""
+        cached_path = self._get_path(presentation_id, key, export_as)
+        try:
+            cached_stat = os.stat(cached_path)
+        except FileNotFoundError:
+            return None
+
+        try:
+            destination_stat = os.stat(destination)
+        except FileNotFoundError:
+            destination_stat = None
+        # Same size and mtime means the last export of this revision is still there
+        if destination_stat is None or (
+            destination_stat.st_size,
+            destination_stat.st_mtime_ns,
+        ) != (cached_stat.st_size, cached_stat.st_mtime_ns):
+            self._copy(cached_path, destination)
+        return destination
+
+    def put(
+        self,
+        presentation_id: uuid.UUID,
+        key: str,
+        export_as: Literal["pptx", "pdf"],
+        path: str,
+    ):
+        cached_path = self._get_path(presentation_id, key, export_as)
+        self._copy(path, cached_path)
+        # Older revisions of this presentation can't be requested again
+        for filename in os.listdir(get_exports_cache_directory()):
+            if (
+                filename.startswith(f"{presentation_id}-")
+                and filename.endswith(f".{export_as}")
+                and filename != os.path.basename(cached_path)
+            ):
+                self._remove(filename)
+
+    def _remove(self, filename: str):
+        try:
+            os.remove(os.path.join(get_exports_cache_directory(), filename))
+        except FileNotFoundError:
+            pass
+
+    def invalidate(self, presentation_id: uuid.UUID):
+        if not self.is_enabled():
+            return
+        for filename in os.listdir(get_exports_cache_directory()):
+            if filename.startswith(f"{presentation_id}-") and filename.endswith(
+                (".pptx", ".pdf")
+            ):
+                self._remove(filename)
+
+
+EXPORT_CACHE_SERVICE = ExportCacheService()
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+from typing import List, Optional
+import uuid
+
+from models.saved_upload_file import SavedUploadFile
+from utils.asset_directory_utils import get_font_store_directory
+
+FONT_EXTENSIONS = {".ttf", ".otf", ".ttc", ".woff", ".woff2"}
+# Sets and fonts unused this long are removed when a new set is added
+MAX_UNUSED_SECONDS = 24 * 60 * 60
+
+
+class FontStoreService:
+    """
+    Keeps uploaded font files once per content hash and groups them into
+    per-upload font directories that a generated fontconfig file can list
+    with <dir>, so no system font directory or global fc-cache is touched.
+
+    Layout under $APP_DATA_DIRECTORY/cache/font_store:
+        files/<sha256><ext>     one copy of each font
+        sets/<sha256>/          symlinks to the fonts of one upload
+        fontconfig/             fontconfig's cache for those directories
+
+    Sets unused for a day are removed, with the fonts no other set links to.
+    """
+
+    @property
+    def files_directory(self) -> str:
+        directory = os.path.join(get_font_store_directory(), "files")
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    @property
+    def sets_directory(self) -> str:
+        directory = os.path.join(get_font_store_directory(), "sets")
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    @property
+    def cache_directory(self) -> str:
+        directory = os.path.join(get_font_store_directory(), "fontconfig")
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def add_font(self, font_file: SavedUploadFile) -> Optional[str]:
+        """Stores a font unless already stored; returns its stored filename."""
+        extension = os.path.splitext(font_file.path)[1].lower()
+        if extension not in FONT_EXTENSIONS:
+            print(f"Warning: Skipping font {font_file.path} with unsupported extension")
+            return None
+        stored_filename = f"{font_file.sha256}{extension}"
+        path = os.path.join(self.files_directory, stored_filename)
+        if os.path.exists(path):
+            # Marks it used, so eviction leaves it for the set being built
+            os.utime(path)
+        else:
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(font_file.path, temp_path)
+            os.replace(temp_path, path)
+        return stored_filename
+
+    def add_fonts(self, font_files: List[SavedUploadFile]) -> Optional[str]:
+        """
+        Stores `font_files` and returns a directory holding exactly these
+        fonts, shared by every upload of the same set. None if none are usable.
+        """
+        stored_filenames = sorted(
+            {
+                stored_filename
+                for font_file in font_files
+                if (stored_filename := self.add_font(font_file))
+            }
+        )
+        if not stored_filenames:
+            return None
+
+        set_id = hashlib.sha256("\n".join(stored_filenames).encode()).hexdigest()
+        directory = os.path.join(self.sets_directory, set_id)
+        if os.path.isdir(directory):
+            os.utime(directory)
+            return directory
+
+        # Built aside and renamed in, so fontconfig never scans a partial set
+        temp_directory = f"{directory}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(temp_directory)
+        for stored_filename in stored_filenames:
+            os.symlink(
+                os.path.join(self.files_directory, stored_filename),
+                os.path.join(temp_directory, stored_filename),
+            )
+        try:
+            os.rename(temp_directory, directory)
+        except OSError:
+            # Another upload of the same set got there first
+            shutil.rmtree(temp_directory, ignore_errors=True)
+        self.evict()
+        return directory
+
+    def evict(self):
+        """Removes sets, and then fonts, unused for MAX_UNUSED_SECONDS."""
+        unused_before = time.time() - MAX_UNUSED_SECONDS
+        linked_filenames = set()
+        for entry in os.scandir(self.sets_directory):
+            try:
+                if entry.stat(follow_symlinks=False).st_mtime < unused_before:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    continue
+                linked_filenames.update(os.listdir(entry.path))
+            except FileNotFoundError:
+                continue
+        for entry in os.scandir(self.files_directory):
+            try:
+                if (
+                    entry.name not in linked_filenames
+                    and entry.stat().st_mtime < unused_before
+                ):
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+
+
+FONT_STORE_SERVICE = FontStoreService()
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from utils.asset_directory_utils import get_google_fonts_cache_path
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_google_fonts_index_refresh_disabled_env,
+    get_google_fonts_index_ttl_env,
+)
+from utils.parsers import parse_bool_or_none
+
+GOOGLE_FONTS_JSON_PATH = "assets/google_fonts.json"
+GOOGLE_FONTS_METADATA_URL = "https://fonts.google.com/metadata/fonts"
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+# Failed refreshes are retried after this long instead of on every upload
+RETRY_SECONDS = 60 * 60
+
+
+def get_family_key(name: str) -> str:
+    """"Open Sans", "OpenSans" and "open-sans" share the key "opensans"."""
+    return re.sub(r"[^0-9a-z]", "", name.lower())
+
+
+def get_google_fonts_url(family: str) -> str:
+    formatted_name = family.replace(" ", "+")
+    return f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
+
+
+def parse_google_fonts_metadata(content: str) -> List[str]:
+    # The endpoint may prefix its JSON with an anti-XSSI guard
+    content = content[content.index("{") :]
+    metadata = json.loads(content)
+    return [each["family"] for each in metadata["familyMetadataList"]]
+
+
+class GoogleFontsIndex:
+    def __init__(self, families: List[str], fetched_at: Optional[float] = None):
+        self.families = sorted(set(families), key=str.lower)
+        self.fetched_at = fetched_at
+        self._families_by_key: Dict[str, str] = {
+            get_family_key(family): family for family in self.families
+        }
+
+    def __len__(self) -> int:
+        return len(self.families)
+
+    def get_family(self, name: str) -> Optional[str]:
+        """Returns the Google Fonts family `name` refers to, if any."""
+        return self._families_by_key.get(get_family_key(name))
+
+    @classmethod
+    def load(cls, path: str) -> Optional["GoogleFontsIndex"]:
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            return cls(data["families"], data.get("fetched_at"))
+        except Exception as e:
+            print(f"Could not load Google Fonts index from {path}: {e}")
+            return None
+
+    def save(self, path: str):
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"fetched_at": self.fetched_at, "families": self.families}, f)
+        os.replace(temp_path, path)
+
+
+class GoogleFontsService:
+    """
+    Answers whether a font family is on Google Fonts from a local index.
+
+    The index ships with the image (assets/google_fonts.json). When it is
+    older than GOOGLE_FONTS_INDEX_TTL seconds, the full family list is
+    fetched again in the background and persisted under app data, so lookups
+    never wait on the network. GOOGLE_FONTS_INDEX_REFRESH_DISABLED=true keeps
+    air-gapped deployments on the bundled index.
+    """
+
+    def __init__(self):
+        self._index: Optional[GoogleFontsIndex] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._last_refresh_attempt = 0.0
+
+    @property
+    def ttl(self) -> int:
+        value = get_google_fonts_index_ttl_env()
+        return int(value) if value else DEFAULT_TTL_SECONDS
+
+    @property
+    def is_refresh_enabled(self) -> bool:
+        return not parse_bool_or_none(get_google_fonts_index_refresh_disabled_env())
+
+    @property
+    def index(self) -> GoogleFontsIndex:
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+    def _load_index(self) -> GoogleFontsIndex:
+        bundled = GoogleFontsIndex.load(GOOGLE_FONTS_JSON_PATH)
+        cached = None
+        if get_app_data_directory_env():
+            cache_path = get_google_fonts_cache_path()
+            if os.path.exists(cache_path):
+                cached = GoogleFontsIndex.load(cache_path)
+        candidates = [each for each in (cached, bundled) if each is not None]
+        if not candidates:
+            return GoogleFontsIndex([])
+        # The most recently fetched index wins; the bundled one may be newer
+        # than a cache left behind by an older image
+        return max(candidates, key=lambda each: each.fetched_at or 0)
+
+    def is_stale(self) -> bool:
+        fetched_at = self.index.fetched_at or 0
+        return time.time() - fetched_at > self.ttl
+
+    def get_family(self, name: str) -> Optional[str]:
+        self.refresh_if_stale()
+        return self.index.get_family(name)
+
+    def refresh_if_stale(self):
+        if not self.is_refresh_enabled or not self.is_stale():
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        if time.time() - self._last_refresh_attempt < RETRY_SECONDS:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._last_refresh_attempt = time.time()
+        self._refresh_task = loop.create_task(self.refresh())
+
+    async def refresh(self) -> bool:
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(
+                    GOOGLE_FONTS_METADATA_URL, timeout=aiohttp.ClientTimeout(total=30)
+                ) as response:
+                    response.raise_for_status()
+                    content = await response.text()
+            families = parse_google_fonts_metadata(content)
+        except Exception as e:
+            print(f"Could not refresh Google Fonts index: {e}")
+            return False
+
+        if not families:
+            return False
+        index = GoogleFontsIndex(families, time.time())
+        if get_app_data_directory_env():
+            await asyncio.to_thread(index.save, get_google_fonts_cache_path())
+        self._index = index
+        print(f"Google Fonts index refreshed with {len(index)} families")
+        return True
+
+
+GOOGLE_FONTS_SERVICE = GoogleFontsService()
@@ -1,36 +1,73 @@
+from functools import lru_cache
 from html.parser import HTMLParser
-from typing import List, Optional
+import re
+from typing import List, Optional, Tuple
 
 from models.pptx_models import PptxFontModel, PptxTextRunModel
 
+# Order of the flags in a style tuple
+FONT_STYLES = ("bold", "italic", "underline", "strike", "code")
+TAG_STYLES = {
+    "strong": 0,
+    "b": 0,
+    "em": 1,
+    "i": 1,
+    "u": 2,
+    "s": 3,
+    "strike": 3,
+    "del": 3,
+    "code": 4,
+}
+
+INLINE_MARKUP_PATTERN = re.compile(r"[<&]")
+
+
+def has_inline_markup(text: str) -> bool:
+    """Plain text (no tags or character references) needs no HTML parsing."""
+    return INLINE_MARKUP_PATTERN.search(text) is not None
+
+
+def get_font_key(font: PptxFontModel) -> Tuple:
+    return tuple(getattr(font, field) for field in PptxFontModel.model_fields)
+
+
+@lru_cache(maxsize=1024)
+def get_styled_font(font_key: Tuple, styles: Tuple[bool, ...]) -> PptxFontModel:
+    """
+    Derives the font for text inside the given styles. Results are shared
+    between runs, so they must not be mutated.
+    """
+    font_json = dict(zip(PptxFontModel.model_fields, font_key))
+    is_bold, is_italic, is_underline, is_strike, is_code = styles
+
+    if is_bold:
+        font_json["font_weight"] = 700
+    if is_italic:
+        font_json["italic"] = True
+    if is_underline:
+        font_json["underline"] = True
+    if is_strike:
+        font_json["strike"] = True
+    if is_code:
+        font_json["name"] = "Courier New"
+
+    return PptxFontModel(**font_json)
+
 
 class InlineHTMLToRunsParser(HTMLParser):
     def __init__(self, base_font: PptxFontModel):
         super().__init__(convert_charrefs=True)
         self.base_font = base_font
+        self.base_font_key = get_font_key(base_font)
         self.tag_stack: List[str] = []
+        # Open tags per style, so nesting and stray end tags stay balanced
+        self.style_counts = [0] * len(FONT_STYLES)
         self.text_runs: List[PptxTextRunModel] = []
 
     def _current_font(self) -> PptxFontModel:
-        font_json = self.base_font.model_dump()
-        is_bold = any(tag in ("strong", "b") for tag in self.tag_stack)
-        is_italic = any(tag in ("em", "i") for tag in self.tag_stack)
-        is_underline = any(tag == "u" for tag in self.tag_stack)
-        is_strike = any(tag in ("s", "strike", "del") for tag in self.tag_stack)
-        is_code = any(tag == "code" for tag in self.tag_stack)
-
-        if is_bold:
-            font_json["font_weight"] = 700
-        if is_italic:
-            font_json["italic"] = True
-        if is_underline:
-            font_json["underline"] = True
-        if is_strike:
-            font_json["strike"] = True
-        if is_code:
-            font_json["name"] = "Courier New"
-
-        return PptxFontModel(**font_json)
+        return get_styled_font(
+            self.base_font_key, tuple(count > 0 for count in self.style_counts)
+        )
 
     def handle_starttag(self, tag, attrs):
         tag = tag.lower()
@@ -38,12 +75,16 @@ class InlineHTMLToRunsParser(HTMLParser):
             self.text_runs.append(PptxTextRunModel(text="\n"))
             return
         self.tag_stack.append(tag)
+        if tag in TAG_STYLES:
+            self.style_counts[TAG_STYLES[tag]] += 1
 
     def handle_endtag(self, tag):
         tag = tag.lower()
         for i in range(len(self.tag_stack) - 1, -1, -1):
             if self.tag_stack[i] == tag:
                 del self.tag_stack[i]
+                if tag in TAG_STYLES:
+                    self.style_counts[TAG_STYLES[tag]] -= 1
                 break
 
     def handle_data(self, data):
@@ -52,14 +93,15 @@ class InlineHTMLToRunsParser(HTMLParser):
         self.text_runs.append(PptxTextRunModel(text=data, font=self._current_font()))
 
 
+def normalize_newlines(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
 def parse_html_text_to_text_runs(
     text: str, base_font: Optional[PptxFontModel] = None
 ) -> List[PptxTextRunModel]:
-    normalized_text = text.replace("\r\n", "\n").replace("\r", "\n")
-    normalized_text = normalized_text.replace("\n", "<br>")
+    normalized_text = normalize_newlines(text).replace("\n", "<br>")
 
     parser = InlineHTMLToRunsParser(base_font if base_font else PptxFontModel())
     parser.feed(normalized_text)
     return parser.text_runs
-
-
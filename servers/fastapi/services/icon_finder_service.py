@@ -1,30 +1,126 @@
 import asyncio
 import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
 import chromadb
 from chromadb.config import Settings
 from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
 
+from services.icon_index import ICONS_JSON_PATH, IconVectorIndex, build_icon_index
+
+# Icon queries arriving within this window are answered by one embedding pass
+ICON_BATCH_WINDOW_SECONDS = 0.005
+MAX_ICON_BATCH_SIZE = 256
+# How long an icon lookup waits for a cold index before using the placeholder
+ICON_INDEX_WAIT_SECONDS = 2.0
+PLACEHOLDER_ICON_URL = "/static/icons/placeholder.svg"
+
+
+def get_icon_url(icon_name: str) -> str:
+    return f"/static/icons/bold/{icon_name}.svg"
+
 
 class IconFinderService:
+    """
+    Semantic icon search. Construction is cheap; the embedding model and the
+    index are loaded on first use or by `start_warm_up` from the app lifespan.
+    """
+
     def __init__(self):
         self.collection_name = "icons"
-        self.client = chromadb.PersistentClient(
-            path="chroma", settings=Settings(anonymized_telemetry=False)
-        )
-        print("Initializing icons collection...")
-        self._initialize_icons_collection()
-        print("Icons collection initialized.")
+        self.client = None
+        self.collection = None
+        self.embedding_function = None
+        self.vector_index: Optional[IconVectorIndex] = None
+        self.load_seconds: Optional[float] = None
 
-    def _initialize_icons_collection(self):
+        self._ready = threading.Event()
+        self._load_lock = threading.Lock()
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self._warm_up_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._pending_queries: List[Tuple[str, int, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def load(self):
+        """Loads the embedding model and icon index. Safe to call repeatedly."""
+        with self._load_lock:
+            if self._ready.is_set():
+                return
+            started_at = time.perf_counter()
+            print("Initializing icons index...")
+            self._initialize_embedding_function()
+            self._initialize_vector_index()
+            if self.vector_index is None:
+                self._initialize_icons_collection()
+            self.load_seconds = time.perf_counter() - started_at
+            self._ready.set()
+            print(f"Icons index initialized in {self.load_seconds:.2f}s.")
+
+    def start_warm_up(self) -> asyncio.Task:
+        """Starts loading the index in a worker thread on the running loop."""
+        loop = asyncio.get_running_loop()
+        # Tasks are bound to their loop, e.g. per test or per lifespan, and a
+        # failed warm-up is retried by the next caller
+        if (
+            self._warm_up_task is None
+            or self._warm_up_loop is not loop
+            or (self._warm_up_task.done() and not self.is_ready)
+        ):
+            self._warm_up_task = loop.create_task(asyncio.to_thread(self.load))
+            self._warm_up_task.add_done_callback(self._log_warm_up_failure)
+            self._warm_up_loop = loop
+        return self._warm_up_task
+
+    @staticmethod
+    def _log_warm_up_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            print(f"Icons index warm-up failed: {task.exception()}")
+
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        if self.is_ready:
+            return True
+        task = self.start_warm_up()
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        except Exception:
+            # Timed out, or the warm-up failed and was already logged
+            return False
+        return self.is_ready
+
+    def _initialize_embedding_function(self):
         self.embedding_function = ONNXMiniLM_L6_V2()
         self.embedding_function.DOWNLOAD_PATH = "chroma/models"
         self.embedding_function._download_model_if_not_exists()
+
+    def _initialize_vector_index(self):
+        # The index is normally prebuilt by build_icon_index.py at image build time
+        try:
+            self.vector_index = IconVectorIndex.load(self.embedding_function)
+            if self.vector_index is None and os.path.exists(ICONS_JSON_PATH):
+                build_icon_index(self.embedding_function)
+                self.vector_index = IconVectorIndex.load(self.embedding_function)
+        except Exception as e:
+            print(f"Could not load icon vector index, falling back to Chroma: {e}")
+            self.vector_index = None
+
+    def _initialize_icons_collection(self):
+        self.client = chromadb.PersistentClient(
+            path="chroma", settings=Settings(anonymized_telemetry=False)
+        )
         try:
             self.collection = self.client.get_collection(
                 self.collection_name, embedding_function=self.embedding_function
             )
         except Exception:
-            with open("assets/icons.json", "r") as f:
+            with open(ICONS_JSON_PATH, "r") as f:
                 icons = json.load(f)
 
             documents = []
@@ -44,13 +140,80 @@ class IconFinderService:
                 )
                 self.collection.add(documents=documents, ids=ids)
 
-    async def search_icons(self, query: str, k: int = 1):
-        result = await asyncio.to_thread(
-            self.collection.query,
-            query_texts=[query],
-            n_results=k,
-        )
-        return [f"/static/icons/bold/{each}.svg" for each in result["ids"][0]]
+    def _query_icons(self, queries: List[str], k: int) -> List[List[str]]:
+        if self.vector_index is not None:
+            names = self.vector_index.search(queries, k)
+        else:
+            names = self.collection.query(query_texts=queries, n_results=k)["ids"]
+        return [[get_icon_url(each) for each in icon_names] for icon_names in names]
+
+    async def search_icons_batch(
+        self, queries: List[str], k: int = 1
+    ) -> List[List[str]]:
+        """Finds icons for many queries with a single embedding and search pass."""
+        if not queries:
+            return []
+        if not await self.wait_until_ready():
+            raise RuntimeError("Icons index is not available")
+        return await asyncio.to_thread(self._query_icons, queries, k)
+
+    async def search_icons(self, query: str, k: int = 1) -> List[str]:
+        """
+        Finds icons for a single query. Concurrent calls, e.g. from every slide
+        of a deck, are gathered for a few milliseconds and searched together.
+        While the index is still warming up, returns the placeholder icon if it
+        is not ready within ICON_INDEX_WAIT_SECONDS.
+        """
+        if not await self.wait_until_ready(ICON_INDEX_WAIT_SECONDS):
+            return [PLACEHOLDER_ICON_URL]
+
+        if k == 1 and self.vector_index is not None:
+            exact = self.vector_index.find_exact(query)
+            if exact:
+                return [get_icon_url(exact)]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_queries.append((query, k, future))
+
+        if len(self._pending_queries) >= MAX_ICON_BATCH_SIZE:
+            self._flush_pending_queries()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                ICON_BATCH_WINDOW_SECONDS, self._flush_pending_queries
+            )
+
+        return await future
+
+    def _flush_pending_queries(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending_by_k: Dict[int, List[Tuple[str, asyncio.Future]]] = {}
+        for query, k, future in self._pending_queries:
+            pending_by_k.setdefault(k, []).append((query, future))
+        self._pending_queries = []
+
+        for k, pending in pending_by_k.items():
+            task = asyncio.create_task(self._run_batch(pending, k))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, pending: List[Tuple[str, asyncio.Future]], k: int):
+        queries = list(dict.fromkeys(query for query, _ in pending))
+        try:
+            results = await self.search_icons_batch(queries, k)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        results_by_query = dict(zip(queries, results))
+        for query, future in pending:
+            if not future.done():
+                future.set_result(results_by_query[query])
 
 
 ICON_FINDER_SERVICE = IconFinderService()
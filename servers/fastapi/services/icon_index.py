@@ -0,0 +1,180 @@
+from collections import OrderedDict
+import json
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+ICONS_JSON_PATH = "assets/icons.json"
+ICON_INDEX_DIRECTORY = "chroma/icon_index"
+EMBEDDINGS_FILENAME = "embeddings.npy"
+METADATA_FILENAME = "metadata.json"
+QUERY_EMBEDDING_CACHE_SIZE = 2048
+
+EmbeddingFunction = Callable[[List[str]], List[np.ndarray]]
+
+
+def normalize_icon_text(text: str) -> str:
+    text = text.lower().strip()
+    text = re.sub(r"-bold$", "", text)
+    return re.sub(r"[\s_\-]+", " ", text)
+
+
+def load_icon_definitions(icons_json_path: str = ICONS_JSON_PATH) -> List[dict]:
+    """Returns the bold icons from icons.json as {"name", "tags", "document"}."""
+    with open(icons_json_path, "r") as f:
+        icons = json.load(f)
+
+    definitions = []
+    for each in icons["icons"]:
+        if each["name"].split("-")[-1] != "bold":
+            continue
+        tags = each.get("tags") or []
+        if isinstance(tags, str):
+            tags = [tag for tag in re.split(r"[,\s]+", tags) if tag]
+        definitions.append(
+            {
+                "name": each["name"],
+                "tags": tags,
+                # Same document text the Chroma collection is built from
+                "document": f"{each['name']} {each['tags']}",
+            }
+        )
+    return definitions
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def build_icon_index(
+    embedding_function: EmbeddingFunction,
+    icons_json_path: str = ICONS_JSON_PATH,
+    output_directory: str = ICON_INDEX_DIRECTORY,
+    batch_size: int = 256,
+):
+    """Embeds every bold icon once and stores an L2-normalized float32 matrix."""
+    definitions = load_icon_definitions(icons_json_path)
+    documents = [each["document"] for each in definitions]
+
+    embeddings = []
+    for start in range(0, len(documents), batch_size):
+        embeddings.extend(embedding_function(documents[start : start + batch_size]))
+    matrix = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+
+    os.makedirs(output_directory, exist_ok=True)
+    embeddings_path = os.path.join(output_directory, EMBEDDINGS_FILENAME)
+    with open(f"{embeddings_path}.tmp", "wb") as f:
+        np.save(f, matrix)
+    os.replace(f"{embeddings_path}.tmp", embeddings_path)
+
+    with open(os.path.join(output_directory, METADATA_FILENAME), "w") as f:
+        json.dump(
+            {
+                "names": [each["name"] for each in definitions],
+                "tags": [each["tags"] for each in definitions],
+            },
+            f,
+        )
+
+
+class IconVectorIndex:
+    """
+    Exact cosine search over a memory-mapped icon embedding matrix.
+
+    Queries that exactly name an icon, or match a tag unique to one icon, are
+    answered without embedding. Query embeddings are kept in an LRU cache.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        tags: List[List[str]],
+        matrix: np.ndarray,
+        embedding_function: EmbeddingFunction,
+    ):
+        self.names = names
+        self.matrix = matrix
+        self.embedding_function = embedding_function
+        self._query_embeddings: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
+
+        self._exact_matches: Dict[str, int] = {}
+        tag_owners: Dict[str, List[int]] = {}
+        for index, (name, icon_tags) in enumerate(zip(names, tags)):
+            self._exact_matches[normalize_icon_text(name)] = index
+            for tag in icon_tags:
+                tag_owners.setdefault(normalize_icon_text(tag), []).append(index)
+        for tag, owners in tag_owners.items():
+            if len(owners) == 1:
+                self._exact_matches.setdefault(tag, owners[0])
+
+    @classmethod
+    def load(
+        cls,
+        embedding_function: EmbeddingFunction,
+        directory: str = ICON_INDEX_DIRECTORY,
+    ) -> Optional["IconVectorIndex"]:
+        embeddings_path = os.path.join(directory, EMBEDDINGS_FILENAME)
+        metadata_path = os.path.join(directory, METADATA_FILENAME)
+        if not (os.path.exists(embeddings_path) and os.path.exists(metadata_path)):
+            return None
+
+        with open(metadata_path, "r") as f:
+            metadata = json.load(f)
+        matrix = np.load(embeddings_path, mmap_mode="r")
+        if matrix.shape[0] != len(metadata["names"]):
+            print("Icon index is inconsistent with its metadata, ignoring it")
+            return None
+        return cls(metadata["names"], metadata["tags"], matrix, embedding_function)
+
+    def find_exact(self, query: str) -> Optional[str]:
+        index = self._exact_matches.get(normalize_icon_text(query))
+        return None if index is None else self.names[index]
+
+    def _embed(self, queries: List[str]) -> np.ndarray:
+        with self._query_embeddings_lock:
+            return self._embed_with_cache(queries)
+
+    def _embed_with_cache(self, queries: List[str]) -> np.ndarray:
+        keys = [normalize_icon_text(query) for query in queries]
+        missing = list(
+            dict.fromkeys(key for key in keys if key not in self._query_embeddings)
+        )
+        if missing:
+            embeddings = _normalize_rows(
+                np.asarray(self.embedding_function(missing), dtype=np.float32)
+            )
+            for key, embedding in zip(missing, embeddings):
+                self._query_embeddings[key] = embedding
+
+        vectors = []
+        for key in keys:
+            self._query_embeddings.move_to_end(key)
+            vectors.append(self._query_embeddings[key])
+        while len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+            self._query_embeddings.popitem(last=False)
+        return np.stack(vectors)
+
+    def search(self, queries: List[str], k: int = 1) -> List[List[str]]:
+        k = max(1, min(k, len(self.names)))
+        scores = self._embed(queries) @ self.matrix.T
+
+        results = []
+        for query, row in zip(queries, scores):
+            if k < len(row):
+                top = np.argpartition(-row, k - 1)[:k]
+            else:
+                top = np.arange(len(row))
+            top = top[np.argsort(-row[top])]
+            names = [self.names[index] for index in top]
+
+            exact = self.find_exact(query)
+            if exact:
+                names = [exact] + [name for name in names if name != exact][: k - 1]
+            results.append(names)
+        return results
@@ -0,0 +1,333 @@
+import asyncio
+import base64
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
+import json
+import os
+from typing import List, Literal, Optional
+
+from PIL import Image, ImageFilter, ImageOps
+
+from models.sql.image_asset import ImageAsset
+from services.concurrent_service import CONCURRENT_SERVICE
+from utils.asset_directory_utils import (
+    get_image_derivatives_directory,
+    get_images_directory,
+)
+from utils.download_helpers import download_file
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_disable_image_derivatives_env,
+    get_image_derivatives_workers_env,
+)
+from utils.parsers import parse_bool_or_none
+
+DERIVATIVE_WIDTHS = (320, 640, 1024, 1600)
+PLACEHOLDER_WIDTH = 16
+MANIFEST_FILENAME = "manifest.json"
+MAX_CACHED_MANIFESTS = 1024
+
+ImageConsumer = Literal["editor", "pdf", "pptx"]
+
+# python-pptx cannot embed WebP, so PPTX export only gets JPEG/PNG variants.
+CONSUMER_FORMATS = {
+    "editor": ("webp",),
+    "pdf": ("webp",),
+    "pptx": ("jpeg", "png"),
+}
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+
+
+def _encode_placeholder(image: Image.Image) -> str:
+    placeholder = image.copy()
+    placeholder.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH), Image.BILINEAR)
+    placeholder = placeholder.filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    placeholder.save(buffer, "WEBP", quality=40)
+    return f"data:image/webp;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+def build_image_derivatives(
+    source: str,
+    image_path: str,
+    output_directory: str,
+    widths: tuple = DERIVATIVE_WIDTHS,
+) -> dict:
+    """
+    Creates WebP and JPEG (PNG for transparent images) variants of the image
+    at each width smaller than the original, plus a tiny blurred placeholder.
+    Writes a manifest describing the variants next to them and returns it.
+    """
+    os.makedirs(output_directory, exist_ok=True)
+
+    with Image.open(image_path) as opened:
+        image = ImageOps.exif_transpose(opened)
+        has_alpha = _has_alpha(image)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    original_width, original_height = image.size
+    target_widths = [width for width in sorted(widths) if width < original_width]
+    if original_width <= max(widths):
+        target_widths.append(original_width)
+
+    variants = []
+    for width in target_widths:
+        height = max(1, round(original_height * width / original_width))
+        resized = (
+            image
+            if width == original_width
+            else image.resize((width, height), Image.LANCZOS)
+        )
+
+        webp_path = os.path.join(output_directory, f"w{width}.webp")
+        resized.save(webp_path, "WEBP", quality=80, method=4)
+        variants.append(
+            {"width": width, "height": height, "format": "webp", "path": webp_path}
+        )
+
+        if has_alpha:
+            fallback_path = os.path.join(output_directory, f"w{width}.png")
+            resized.save(fallback_path, "PNG", optimize=True)
+            fallback_format = "png"
+        else:
+            fallback_path = os.path.join(output_directory, f"w{width}.jpg")
+            resized.save(fallback_path, "JPEG", quality=85, progressive=True)
+            fallback_format = "jpeg"
+        variants.append(
+            {
+                "width": width,
+                "height": height,
+                "format": fallback_format,
+                "path": fallback_path,
+            }
+        )
+
+    manifest = {
+        "source": source,
+        "original": image_path,
+        "width": original_width,
+        "height": original_height,
+        "has_alpha": has_alpha,
+        "variants": variants,
+        "placeholder": _encode_placeholder(image),
+    }
+
+    manifest_path = os.path.join(output_directory, MANIFEST_FILENAME)
+    temp_manifest_path = f"{manifest_path}.tmp"
+    with open(temp_manifest_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(temp_manifest_path, manifest_path)
+
+    return manifest
+
+
+def resolve_image_variant(
+    manifest: dict, consumer: ImageConsumer, width: Optional[int] = None
+) -> Optional[str]:
+    """
+    Picks the smallest variant suitable for the consumer that is at least
+    `width` pixels wide. Returns None if the original should be used instead.
+    """
+    formats = CONSUMER_FORMATS[consumer]
+    candidates = sorted(
+        (
+            variant
+            for variant in manifest.get("variants", [])
+            if variant["format"] in formats and os.path.exists(variant["path"])
+        ),
+        key=lambda variant: variant["width"],
+    )
+    if not candidates:
+        return None
+
+    if width is not None:
+        for variant in candidates:
+            if variant["width"] >= width:
+                return variant["path"]
+
+    largest = candidates[-1]
+    if width is None or largest["width"] >= manifest["width"]:
+        return largest["path"]
+
+    # No variant is large enough; only PPTX can use a locally downloaded original
+    if consumer == "pptx" and os.path.exists(manifest["original"]):
+        return manifest["original"]
+    return None
+
+
+def get_variant_url(path: str) -> Optional[str]:
+    """The /app_data/images URL a variant under the images directory is served at."""
+    relative_path = os.path.relpath(path, get_images_directory())
+    if relative_path.startswith(".."):
+        return None
+    return f"/app_data/images/{relative_path.replace(os.sep, '/')}"
+
+
+class ImageDerivativesService:
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._manifests: OrderedDict[str, dict] = OrderedDict()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            workers = get_image_derivatives_workers_env()
+            self._executor = ThreadPoolExecutor(
+                max_workers=int(workers) if workers else min(4, os.cpu_count() or 1),
+                thread_name_prefix="image-derivatives",
+            )
+        return self._executor
+
+    def is_enabled(self) -> bool:
+        if parse_bool_or_none(get_disable_image_derivatives_env()):
+            return False
+        return bool(get_app_data_directory_env())
+
+    def get_derivatives_directory(self, source: str) -> str:
+        key = hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(get_image_derivatives_directory(), key)
+
+    def get_manifest(self, source: str) -> Optional[dict]:
+        if source in self._manifests:
+            self._manifests.move_to_end(source)
+            return self._manifests[source]
+        if not self.is_enabled():
+            return None
+
+        manifest_path = os.path.join(
+            self.get_derivatives_directory(source), MANIFEST_FILENAME
+        )
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+        except Exception as e:
+            print(f"Could not read image derivatives manifest for {source}: {e}")
+            return None
+
+        self._remember_manifest(source, manifest)
+        return manifest
+
+    def _remember_manifest(self, source: str, manifest: dict):
+        self._manifests[source] = manifest
+        while len(self._manifests) > MAX_CACHED_MANIFESTS:
+            self._manifests.popitem(last=False)
+
+    async def create_derivatives(self, source: str) -> Optional[dict]:
+        if not self.is_enabled():
+            return None
+
+        manifest = self.get_manifest(source)
+        if manifest:
+            return manifest
+
+        output_directory = self.get_derivatives_directory(source)
+        if source.startswith("http"):
+            image_path = await download_file(source, output_directory)
+            if not image_path:
+                return None
+        elif os.path.isfile(source):
+            image_path = source
+        else:
+            return None
+
+        try:
+            manifest = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                build_image_derivatives,
+                source,
+                image_path,
+                output_directory,
+            )
+        except Exception as e:
+            print(f"Could not create image derivatives for {source}: {e}")
+            return None
+
+        self._remember_manifest(source, manifest)
+        return manifest
+
+    async def create_derivatives_for_urls(self, urls: List[str]):
+        """Fetched images are plain URLs in slide content, with no ImageAsset."""
+        if not self.is_enabled():
+            return
+        await asyncio.gather(
+            *[
+                self.create_derivatives(url)
+                for url in set(urls)
+                if url.startswith("http")
+            ]
+        )
+
+    def schedule_derivatives_for_urls(self, urls: List[str]):
+        """
+        Creates derivatives of fetched images in the background. Downloading
+        them is too slow for slide generation to wait on, and every consumer
+        uses the original until a manifest exists.
+        """
+        if not self.is_enabled():
+            return
+        missing = [
+            url
+            for url in set(urls)
+            if url.startswith("http") and not self.get_manifest(url)
+        ]
+        if missing:
+            CONCURRENT_SERVICE.run_task(None, self.create_derivatives_for_urls, missing)
+
+    async def attach_derivatives(self, image_asset: ImageAsset) -> ImageAsset:
+        manifest = await self.create_derivatives(image_asset.path)
+        if manifest:
+            image_asset.extras = {
+                **(image_asset.extras or {}),
+                "derivatives": manifest,
+            }
+        return image_asset
+
+    async def attach_derivatives_to_assets(
+        self, image_assets: List[ImageAsset]
+    ) -> List[ImageAsset]:
+        if not image_assets or not self.is_enabled():
+            return image_assets
+        return await asyncio.gather(
+            *[self.attach_derivatives(each) for each in image_assets]
+        )
+
+    def resolve(
+        self, source: str, consumer: ImageConsumer, width: Optional[int] = None
+    ) -> str:
+        manifest = self.get_manifest(source)
+        if not manifest:
+            return source
+        return resolve_image_variant(manifest, consumer, width) or source
+
+    def get_variant_urls(self, source: str, consumer: ImageConsumer) -> List[dict]:
+        """
+        URL and width of each variant for `consumer`, smallest first, for an
+        <img> srcset. The original closes the list when no variant is full
+        size, so large renders still get every pixel.
+        """
+        manifest = self.get_manifest(source)
+        if not manifest:
+            return []
+        variants = []
+        for variant in manifest.get("variants", []):
+            if variant["format"] not in CONSUMER_FORMATS[consumer]:
+                continue
+            url = get_variant_url(variant["path"])
+            if url and os.path.exists(variant["path"]):
+                variants.append({"url": url, "width": variant["width"]})
+        variants.sort(key=lambda variant: variant["width"])
+        if variants and variants[-1]["width"] < manifest["width"]:
+            variants.append({"url": source, "width": manifest["width"]})
+        return variants
+
+
+IMAGE_DERIVATIVES_SERVICE = ImageDerivativesService()
@@ -6,6 +6,7 @@ import aiohttp
 from fastapi import HTTPException
 from google import genai
 from openai import NOT_GIVEN, AsyncOpenAI
+from clients.comfyui_client import get_comfyui_client
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
 from utils.get_env import (
@@ -654,23 +655,10 @@ class ImageGenerationService:
         # Find and update the positive prompt node
         workflow = self._inject_prompt_into_workflow(workflow, prompt)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            # Step 1: Submit workflow
-            prompt_id = await self._submit_comfyui_workflow(
-                session, comfyui_url, workflow
-            )
-
-            # Step 2: Wait for completion
-            status_data = await self._wait_for_comfyui_completion(
-                session, comfyui_url, prompt_id
-            )
-
-            # Step 3: Download the generated image
-            image_path = await self._download_comfyui_image(
-                session, comfyui_url, status_data, prompt_id, output_directory
-            )
-
-            return image_path
+        # The shared client submits concurrent generations up front and detects
+        # completion from websocket events
+        client = get_comfyui_client(comfyui_url)
+        return await client.generate(workflow, output_directory)
 
     def _inject_prompt_into_workflow(self, workflow: dict, prompt: str) -> dict:
         """
@@ -694,134 +682,3 @@ class ImageGenerationService:
         raise ValueError(
             "Could not find a node with title 'Input Prompt' in the workflow. Please rename your prompt node to 'Input Prompt' in ComfyUI."
         )
-
-    async def _submit_comfyui_workflow(
-        self, session: aiohttp.ClientSession, comfyui_url: str, workflow: dict
-    ) -> str:
-        """Submit workflow to ComfyUI and return the prompt_id."""
-        client_id = str(uuid.uuid4())
-        payload = {"prompt": workflow, "client_id": client_id}
-
-        response = await session.post(
-            f"{comfyui_url}/prompt",
-            json=payload,
-            timeout=aiohttp.ClientTimeout(total=30),
-        )
-
-        if response.status != 200:
-            error_text = await response.text()
-            raise Exception(f"Failed to submit workflow to ComfyUI: {error_text}")
-
-        data = await response.json()
-        prompt_id = data.get("prompt_id")
-
-        if not prompt_id:
-            raise Exception("No prompt_id returned from ComfyUI")
-
-        print(f"ComfyUI workflow submitted. Prompt ID: {prompt_id}")
-        return prompt_id
-
-    async def _wait_for_comfyui_completion(
-        self,
-        session: aiohttp.ClientSession,
-        comfyui_url: str,
-        prompt_id: str,
-        timeout: int = 300,
-        poll_interval: int = 4,
-    ) -> dict:
-        """Poll ComfyUI history endpoint until workflow completes."""
-        start_time = asyncio.get_event_loop().time()
-
-        while True:
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed > timeout:
-                raise Exception(f"ComfyUI workflow timed out after {timeout} seconds")
-
-            await asyncio.sleep(poll_interval)
-
-            response = await session.get(
-                f"{comfyui_url}/history/{prompt_id}",
-                timeout=aiohttp.ClientTimeout(total=30),
-            )
-
-            if response.status != 200:
-                continue
-
-            try:
-                status_data = await response.json()
-            except Exception as _:
-                continue
-
-            if prompt_id in status_data:
-                execution_data = status_data[prompt_id]
-
-                # Check for completion
-                if "status" in execution_data:
-                    status = execution_data["status"]
-                    if status.get("completed", False):
-                        print("ComfyUI workflow completed successfully")
-                        return status_data
-                    if "error" in status:
-                        raise Exception(f"ComfyUI workflow error: {status['error']}")
-
-                # Also check if outputs exist (alternative completion check)
-                if "outputs" in execution_data and execution_data["outputs"]:
-                    print("ComfyUI workflow completed (outputs found)")
-                    return status_data
-
-            print(f"Waiting for ComfyUI workflow... ({int(elapsed)}s)")
-
-    async def _download_comfyui_image(
-        self,
-        session: aiohttp.ClientSession,
-        comfyui_url: str,
-        status_data: dict,
-        prompt_id: str,
-        output_directory: str,
-    ) -> str:
-        """Download the generated image from ComfyUI."""
-        if prompt_id not in status_data:
-            raise Exception("Prompt ID not found in status data")
-
-        outputs = status_data[prompt_id].get("outputs", {})
-
-        if not outputs:
-            raise Exception("No outputs found in ComfyUI response")
-
-        # Find the first image in outputs
-        for node_id, node_output in outputs.items():
-            if "images" in node_output:
-                for image_info in node_output["images"]:
-                    filename = image_info["filename"]
-                    subfolder = image_info.get("subfolder", "")
-
-                    # Build view params
-                    params = {"filename": filename, "type": "output"}
-                    if subfolder:
-                        params["subfolder"] = subfolder
-
-                    # Download the image
-                    response = await session.get(
-                        f"{comfyui_url}/view",
-                        params=params,
-                        timeout=aiohttp.ClientTimeout(total=60),
-                    )
-
-                    if response.status == 200:
-                        image_data = await response.read()
-
-                        # Determine extension
-                        ext = filename.split(".")[-1] if "." in filename else "png"
-                        image_path = os.path.join(
-                            output_directory, f"{uuid.uuid4()}.{ext}"
-                        )
-
-                        with open(image_path, "wb") as f:
-                            f.write(image_data)
-
-                        print(f"Downloaded image from ComfyUI: {image_path}")
-                        return image_path
-                    else:
-                        raise Exception(f"Failed to download image: {response.status}")
-
-        raise Exception("No images found in ComfyUI outputs")
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+import re
+from typing import Iterable, List, Literal, Optional, Tuple
+
+from constants.image_source_keywords import (
+    IMAGE_SEARCH_KEYWORDS,
+    IMAGE_SEARCH_WHOLE_WORDS,
+)
+
+ImageSourceDecision = Tuple[Literal["generate", "search"], str]
+
+# Keywords up to this length only match whole words ("ph" must not match "photo")
+EXACT_MATCH_MAX_LENGTH = 3
+DECISION_CACHE_SIZE = 4096
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(re.findall(r"\w+", prompt.lower()))
+
+
+def compile_keyword_pattern(
+    keywords: Iterable[str], whole_words: Iterable[str] = ()
+) -> re.Pattern:
+    """
+    Compiles keywords into one alternation anchored at word starts. Longer
+    keywords match any inflected form, `whole_words` only themselves; longest
+    alternatives are tried first.
+    """
+    exact, prefixes = set(), set()
+    for keyword, is_whole_word in [
+        *((keyword, False) for keyword in keywords),
+        *((word, True) for word in whole_words),
+    ]:
+        keyword = keyword.lower().strip()
+        if not keyword:
+            continue
+        escaped = r"\s+".join(re.escape(part) for part in keyword.split())
+        if is_whole_word or len(keyword) <= EXACT_MATCH_MAX_LENGTH:
+            exact.add(escaped)
+        else:
+            prefixes.add(escaped)
+
+    alternatives = []
+    if prefixes:
+        ordered = sorted(prefixes, key=len, reverse=True)
+        alternatives.append(rf"\b(?:{'|'.join(ordered)})\w*")
+    if exact:
+        ordered = sorted(exact, key=len, reverse=True)
+        alternatives.append(rf"\b(?:{'|'.join(ordered)})\b")
+    return re.compile("|".join(alternatives) or r"(?!)")
+
+
+class ImageSourceClassifier:
+    """
+    Decides between image search and generation without an LLM call where
+    possible: a compiled multilingual keyword matcher first, then an LRU of
+    earlier LLM decisions keyed by the normalized prompt.
+    """
+
+    def __init__(self):
+        self.keyword_pattern = compile_keyword_pattern(
+            (
+                keyword
+                for keywords in IMAGE_SEARCH_KEYWORDS.values()
+                for keyword in keywords
+            ),
+            (
+                word
+                for words in IMAGE_SEARCH_WHOLE_WORDS.values()
+                for word in words
+            ),
+        )
+        self._decisions: OrderedDict[str, ImageSourceDecision] = OrderedDict()
+
+    def match_keywords(self, prompt: str) -> List[str]:
+        """Returns the distinct matched words in the order they appear."""
+        matches = self.keyword_pattern.findall(prompt.lower())
+        return list(dict.fromkeys(" ".join(match.split()) for match in matches))
+
+    def get_cached_decision(self, prompt: str) -> Optional[ImageSourceDecision]:
+        key = normalize_prompt(prompt)
+        decision = self._decisions.get(key)
+        if decision is not None:
+            self._decisions.move_to_end(key)
+        return decision
+
+    def cache_decision(self, prompt: str, decision: ImageSourceDecision):
+        key = normalize_prompt(prompt)
+        self._decisions[key] = decision
+        self._decisions.move_to_end(key)
+        while len(self._decisions) > DECISION_CACHE_SIZE:
+            self._decisions.popitem(last=False)
+
+
+IMAGE_SOURCE_CLASSIFIER = ImageSourceClassifier()
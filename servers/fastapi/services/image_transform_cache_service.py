@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from utils.asset_directory_utils import get_image_transforms_cache_directory
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_image_transform_cache_max_bytes_env,
+)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_EXTENSIONS = (".png", ".jpg")
+# Entries used this recently are never evicted, an export may still be reading them
+EVICTION_GRACE_SECONDS = 300
+
+
+class ImageTransformCacheService:
+    """
+    Disk cache for pictures transformed during PPTX export.
+
+    Entries are keyed by the source file's content hash, the transform
+    parameters and the box size. File modification times record last use, so
+    the cache is shared safely by the PPTX render worker processes and evicts
+    least recently used entries once it grows past its size cap.
+    """
+
+    def __init__(self):
+        # (path, size, mtime) -> content hash, so unchanged files are hashed once
+        self._source_hashes: Dict[Tuple[str, int, int], str] = {}
+
+    def is_enabled(self) -> bool:
+        return bool(get_app_data_directory_env())
+
+    @property
+    def max_bytes(self) -> int:
+        value = get_image_transform_cache_max_bytes_env()
+        return int(value) if value else DEFAULT_MAX_BYTES
+
+    def get_source_hash(self, path: str) -> str:
+        stat = os.stat(path)
+        stat_key = (path, stat.st_size, stat.st_mtime_ns)
+        if stat_key not in self._source_hashes:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            self._source_hashes[stat_key] = digest.hexdigest()
+        return self._source_hashes[stat_key]
+
+    def get_key(self, source_path: str, parameters: dict) -> str:
+        key_data = json.dumps(
+            [self.get_source_hash(source_path), parameters], sort_keys=True
+        )
+        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+    def _get_path(self, key: str, extension: str) -> str:
+        return os.path.join(get_image_transforms_cache_directory(), f"{key}{extension}")
+
+    def get(self, key: str) -> Optional[str]:
+        for extension in CACHE_EXTENSIONS:
+            path = self._get_path(key, extension)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                continue
+            return path
+        return None
+
+    def put(self, key: str, image: Image.Image, format: str = "PNG", **params) -> str:
+        path = self._get_path(key, ".jpg" if format == "JPEG" else ".png")
+        # Unique per process and thread; render workers may write the same key
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        image.save(temp_path, format, **params)
+        os.replace(temp_path, path)
+        return path
+
+    def evict(self):
+        directory = get_image_transforms_cache_directory()
+        entries = []
+        for filename in os.listdir(directory):
+            if not filename.endswith(CACHE_EXTENSIONS):
+                continue
+            try:
+                stat = os.stat(os.path.join(directory, filename))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filename))
+
+        total_size = sum(size for _, size, _ in entries)
+        if total_size <= self.max_bytes:
+            return
+
+        evictable_before = time.time() - EVICTION_GRACE_SECONDS
+        for last_used_at, size, filename in sorted(entries):
+            if total_size <= self.max_bytes or last_used_at > evictable_before:
+                break
+            try:
+                os.remove(os.path.join(directory, filename))
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+
+IMAGE_TRANSFORM_CACHE_SERVICE = ImageTransformCacheService()
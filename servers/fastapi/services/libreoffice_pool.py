@@ -0,0 +1,424 @@
+import asyncio
+import json
+import os
+import shutil
+import signal
+import time
+from typing import Dict, List, Optional
+import uuid
+from xml.sax.saxutils import escape
+
+from services.temp_file_service import TEMP_FILE_SERVICE
+from utils.get_env import (
+    get_libreoffice_job_timeout_env,
+    get_libreoffice_max_conversions_env,
+    get_libreoffice_python_env,
+    get_libreoffice_workers_env,
+)
+
+BRIDGE_SCRIPT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "libreoffice_uno_bridge.py"
+)
+DEFAULT_JOB_TIMEOUT = 300
+DEFAULT_MAX_CONVERSIONS = 50
+STARTUP_TIMEOUT = 60
+HEALTH_CHECK_TIMEOUT = 5
+
+
+class LibreOfficeConversionError(Exception):
+    """The bridge reported a failed job; the worker itself is still usable."""
+
+
+def write_font_alias_config(
+    path: str,
+    font_aliases: Dict[str, str],
+    font_directories: Optional[List[str]] = None,
+    cache_directory: Optional[str] = None,
+):
+    """
+    Writes a fontconfig file resolving each alias to its root family. Fonts in
+    `font_directories` are added on top of the system fonts, and their cache
+    goes to `cache_directory` instead of a global fc-cache rebuild.
+    """
+    with open(path, "w", encoding="utf-8") as cfg:
+        cfg.write(
+            """<?xml version='1.0'?>
+<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">
+<fontconfig>
+"""
+        )
+        if cache_directory:
+            # The first writable cachedir is where fontconfig writes
+            cfg.write(f"  <cachedir>{escape(cache_directory)}</cachedir>\n")
+        cfg.write("  <include>/etc/fonts/fonts.conf</include>\n")
+        for directory in font_directories or []:
+            cfg.write(f"  <dir>{escape(directory)}</dir>\n")
+        for src, dst in font_aliases.items():
+            cfg.write(
+                f"""
+  <match target="pattern">
+    <test name="family" compare="eq">
+      <string>{escape(src)}</string>
+    </test>
+    <edit name="family" mode="assign" binding="strong">
+      <string>{escape(dst)}</string>
+    </edit>
+  </match>
+"""
+            )
+        cfg.write("\n</fontconfig>\n")
+
+
+async def convert_pptx_to_pdf_cold_start(
+    pptx_path: str, output_dir: str, env: Dict[str, str], timeout: float
+) -> str:
+    """Converts with a fresh `libreoffice --headless` process."""
+    process = await asyncio.create_subprocess_exec(
+        "libreoffice",
+        "--headless",
+        "--convert-to",
+        "pdf",
+        "--outdir",
+        output_dir,
+        pptx_path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise Exception(
+            f"LibreOffice PDF conversion timed out after {timeout:g} seconds"
+        )
+
+    print(f"LibreOffice PDF conversion output: {stdout.decode()}")
+    if process.returncode != 0:
+        error_msg = stderr.decode() or f"exit code {process.returncode}"
+        raise Exception(f"LibreOffice PDF conversion failed: {error_msg}")
+    if stderr:
+        print(f"LibreOffice PDF conversion warnings: {stderr.decode()}")
+
+    pdf_path = os.path.join(
+        output_dir, f"{os.path.splitext(os.path.basename(pptx_path))[0]}.pdf"
+    )
+    if not os.path.exists(pdf_path):
+        raise Exception("LibreOffice failed to generate PDF file")
+    return pdf_path
+
+
+class LibreOfficeWorker:
+    """
+    One long-lived headless soffice with its own profile directory, driven
+    over UNO by a bridge process. Fontconfig is read when soffice starts, so
+    the worker remembers the font aliases and font directories it started with.
+    """
+
+    def __init__(self, base_dir: str):
+        self.name = f"presenton_lo_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.directory = os.path.join(base_dir, self.name)
+        self.office: Optional[asyncio.subprocess.Process] = None
+        self.bridge: Optional[asyncio.subprocess.Process] = None
+        self.conversions = 0
+        self.font_aliases: Dict[str, str] = {}
+        self.font_directories: List[str] = []
+
+    def get_office_command(self) -> List[str]:
+        profile_url = f"file://{os.path.join(self.directory, 'profile')}"
+        return [
+            "soffice",
+            f"-env:UserInstallation={profile_url}",
+            "--headless",
+            "--invisible",
+            "--nodefault",
+            "--nolockcheck",
+            "--nologo",
+            "--norestore",
+            f"--accept=pipe,name={self.name};urp;StarOffice.ComponentContext",
+        ]
+
+    def get_bridge_command(self) -> List[str]:
+        python = get_libreoffice_python_env() or "/usr/bin/python3"
+        return [python, BRIDGE_SCRIPT_PATH, self.name, str(STARTUP_TIMEOUT)]
+
+    @property
+    def is_alive(self) -> bool:
+        return (
+            self.office is not None
+            and self.office.returncode is None
+            and self.bridge is not None
+            and self.bridge.returncode is None
+        )
+
+    async def start(
+        self,
+        font_aliases: Dict[str, str],
+        font_directories: List[str],
+        font_cache_directory: Optional[str] = None,
+    ):
+        os.makedirs(self.directory, exist_ok=True)
+        fonts_conf_path = os.path.join(self.directory, "fonts.conf")
+        write_font_alias_config(
+            fonts_conf_path, font_aliases, font_directories, font_cache_directory
+        )
+        env = os.environ.copy()
+        env["FONTCONFIG_FILE"] = fonts_conf_path
+
+        # Own session, so stopping it also kills soffice.bin under oosplash
+        self.office = await asyncio.create_subprocess_exec(
+            *self.get_office_command(),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+            start_new_session=True,
+        )
+        self.bridge = await asyncio.create_subprocess_exec(
+            *self.get_bridge_command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        self.conversions = 0
+        self.font_aliases = dict(font_aliases)
+        self.font_directories = list(font_directories)
+        try:
+            await self._read_response(STARTUP_TIMEOUT)
+        except Exception:
+            await self.stop()
+            raise
+
+    async def _read_response(self, timeout: float) -> dict:
+        line = await asyncio.wait_for(self.bridge.stdout.readline(), timeout)
+        if not line:
+            raise Exception("LibreOffice worker exited")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise LibreOfficeConversionError(
+                f"LibreOffice PDF conversion failed: {response['error']}"
+            )
+        return response
+
+    async def _request(self, request: dict, timeout: float) -> dict:
+        self.bridge.stdin.write(f"{json.dumps(request)}\n".encode())
+        await self.bridge.stdin.drain()
+        return await self._read_response(timeout)
+
+    async def ping(self) -> bool:
+        if not self.is_alive:
+            return False
+        try:
+            await self._request({"command": "ping"}, HEALTH_CHECK_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def convert(self, pptx_path: str, output_dir: str, timeout: float) -> str:
+        pdf_path = os.path.join(
+            output_dir, f"{os.path.splitext(os.path.basename(pptx_path))[0]}.pdf"
+        )
+        self.conversions += 1
+        await self._request(
+            {"command": "convert", "input": pptx_path, "output": pdf_path}, timeout
+        )
+        return pdf_path
+
+    async def stop(self):
+        for process in (self.bridge, self.office):
+            if process is None or process.returncode is not None:
+                continue
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await process.wait()
+        self.office = None
+        self.bridge = None
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class LibreOfficePool:
+    """
+    Converts PPTX to PDF on long-lived headless soffice workers instead of
+    cold-starting LibreOffice per upload. Idle workers wait in a FIFO queue,
+    are health-checked before each job, recycled after
+    LIBREOFFICE_MAX_CONVERSIONS jobs and restarted when a job times out,
+    needs font aliases they were not started with or needs other uploaded
+    font directories than theirs. Workers only ever see the uploaded fonts
+    of the job they run. LIBREOFFICE_WORKERS=0 disables it.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._idle_workers: Optional[asyncio.Queue] = None
+        self._workers: List[LibreOfficeWorker] = []
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarted = 0
+        self.total_conversion_seconds = 0.0
+
+    @property
+    def workers(self) -> int:
+        workers = get_libreoffice_workers_env()
+        return int(workers) if workers else 2
+
+    @property
+    def max_conversions(self) -> int:
+        value = get_libreoffice_max_conversions_env()
+        return int(value) if value else DEFAULT_MAX_CONVERSIONS
+
+    @property
+    def job_timeout(self) -> float:
+        value = get_libreoffice_job_timeout_env()
+        return float(value) if value else DEFAULT_JOB_TIMEOUT
+
+    def is_enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_idle_workers(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Subprocess pipes belong to the loop that created them
+            self._loop = loop
+            self._idle_workers = asyncio.Queue()
+            self._workers = []
+        while len(self._workers) < self.workers:
+            worker = LibreOfficeWorker(TEMP_FILE_SERVICE.base_dir)
+            self._workers.append(worker)
+            self._idle_workers.put_nowait(worker)
+        return self._idle_workers
+
+    def _needs_restart(
+        self,
+        worker: LibreOfficeWorker,
+        font_aliases: Dict[str, str],
+        font_directories: List[str],
+    ) -> bool:
+        # Aliases only map variant names to their root family, so ones left
+        # from the worker's previous job don't change this job's fonts
+        return (
+            worker.conversions >= self.max_conversions
+            or sorted(worker.font_directories) != sorted(font_directories)
+            or any(
+                worker.font_aliases.get(src) != dst
+                for src, dst in font_aliases.items()
+            )
+        )
+
+    async def _prepare(
+        self,
+        worker: LibreOfficeWorker,
+        font_aliases: Dict[str, str],
+        font_directories: List[str],
+        font_cache_directory: Optional[str],
+    ):
+        if worker.is_alive and not self._needs_restart(
+            worker, font_aliases, font_directories
+        ):
+            if await worker.ping():
+                return
+            print("LibreOffice worker failed its health check, restarting")
+        if worker.office is not None:
+            self.restarted += 1
+        await worker.stop()
+        await worker.start(font_aliases, font_directories, font_cache_directory)
+
+    def get_metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "alive": sum(1 for worker in self._workers if worker.is_alive),
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "restarted": self.restarted,
+            "average_seconds": (
+                self.total_conversion_seconds / self.completed
+                if self.completed
+                else None
+            ),
+        }
+
+    async def convert(
+        self,
+        pptx_path: str,
+        output_dir: str,
+        font_aliases: Dict[str, str],
+        font_directories: Optional[List[str]] = None,
+        font_cache_directory: Optional[str] = None,
+    ) -> str:
+        """
+        Converts `pptx_path` into `output_dir` and returns the PDF path, on a
+        worker that sees the fonts in `font_directories` and no other uploads'.
+        """
+        font_directories = font_directories or []
+        idle_workers = self._get_idle_workers()
+
+        self.waiting += 1
+        try:
+            worker: LibreOfficeWorker = await idle_workers.get()
+        finally:
+            self.waiting -= 1
+
+        started_at = time.perf_counter()
+        try:
+            try:
+                await self._prepare(
+                    worker, font_aliases, font_directories, font_cache_directory
+                )
+            except Exception as e:
+                # e.g. soffice or the uno module missing; keep uploads working
+                print(f"LibreOffice worker failed to start, cold starting: {e}")
+                fonts_conf_path = os.path.join(output_dir, "fonts.conf")
+                write_font_alias_config(
+                    fonts_conf_path,
+                    font_aliases,
+                    font_directories,
+                    font_cache_directory,
+                )
+                env = os.environ.copy()
+                env["FONTCONFIG_FILE"] = fonts_conf_path
+                return await convert_pptx_to_pdf_cold_start(
+                    pptx_path, output_dir, env, self.job_timeout
+                )
+
+            try:
+                pdf_path = await worker.convert(
+                    pptx_path, output_dir, self.job_timeout
+                )
+            except asyncio.TimeoutError:
+                self.failed += 1
+                await worker.stop()
+                raise Exception(
+                    "LibreOffice PDF conversion timed out after "
+                    f"{self.job_timeout:g} seconds"
+                )
+            except LibreOfficeConversionError:
+                # e.g. a corrupt PPTX; the bridge answered, so its pipe is in sync
+                self.failed += 1
+                raise
+            except BaseException:
+                self.failed += 1
+                # Cancelled, or the pipe closed or sent garbage; the bridge may
+                # still answer this job later, so don't reuse its pipe
+                await worker.stop()
+                raise
+        finally:
+            idle_workers.put_nowait(worker)
+
+        self.completed += 1
+        self.total_conversion_seconds += time.perf_counter() - started_at
+        if not os.path.exists(pdf_path):
+            raise Exception("LibreOffice failed to generate PDF file")
+        return pdf_path
+
+    async def shutdown(self):
+        for worker in self._workers:
+            await worker.stop()
+        self._workers = []
+        self._idle_workers = None
+        self._loop = None
+
+
+LIBREOFFICE_POOL = LibreOfficePool()
@@ -0,0 +1,88 @@
+"""
+UNO client for one LibreOffice pool worker.
+
+Runs under the Python that ships the `uno` module (Debian's python3 with
+python3-uno), not the app interpreter. Connects to a headless soffice
+listening on a named pipe, prints one JSON line once connected, then
+answers one JSON request per stdin line with one JSON line on stdout.
+
+Usage: python3 libreoffice_uno_bridge.py <pipe name> <connect timeout>
+"""
+import json
+import sys
+import time
+
+import uno
+from com.sun.star.beans import PropertyValue
+
+
+def connect(pipe_name: str, timeout: float):
+    local_context = uno.getComponentContext()
+    resolver = local_context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local_context
+    )
+    deadline = time.monotonic() + timeout
+    while True:
+        # soffice takes a few seconds to open the pipe after it starts
+        try:
+            return resolver.resolve(
+                f"uno:pipe,name={pipe_name};urp;StarOffice.ComponentContext"
+            )
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.25)
+
+
+def get_property(name, value):
+    property_value = PropertyValue()
+    property_value.Name = name
+    property_value.Value = value
+    return property_value
+
+
+def convert(desktop, input_path: str, output_path: str):
+    document = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(input_path),
+        "_blank",
+        0,
+        (get_property("Hidden", True), get_property("ReadOnly", True)),
+    )
+    if document is None:
+        raise RuntimeError(f"LibreOffice could not open {input_path}")
+    try:
+        document.storeToURL(
+            uno.systemPathToFileUrl(output_path),
+            (get_property("FilterName", "impress_pdf_Export"),),
+        )
+    finally:
+        document.close(True)
+
+
+def respond(response: dict):
+    sys.stdout.write(json.dumps(response) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    pipe_name, timeout = sys.argv[1], float(sys.argv[2])
+    context = connect(pipe_name, timeout)
+    desktop = context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", context
+    )
+    respond({"ok": True})
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        try:
+            if request["command"] == "convert":
+                convert(desktop, request["input"], request["output"])
+            elif request["command"] == "ping":
+                desktop.getComponents()
+            respond({"ok": True})
+        except Exception as e:
+            respond({"ok": False, "error": str(e)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+import pypdfium2
+
+from services.concurrent_service import CONCURRENT_SERVICE
+from utils.asset_directory_utils import get_pdf_pages_cache_directory
+from utils.get_env import (
+    get_pdf_pages_cache_max_bytes_env,
+    get_pdf_raster_workers_env,
+)
+
+RENDER_DPI = 150
+# Pages per pool task; small enough that on-demand pages don't wait long
+CHUNK_PAGES = 4
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+# Documents used this recently are never evicted, their pages may be loading
+EVICTION_GRACE_SECONDS = 300
+DOCUMENT_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+SOURCE_FILENAME = "source.pdf"
+
+# pdfium is not thread safe; serializes its use within a process
+_PDFIUM_LOCK = threading.Lock()
+
+
+def get_page_filename(page_number: int) -> str:
+    return f"page_{page_number}.png"
+
+
+def render_pdf_pages(pdf_path: str, output_dir: str, page_numbers: List[int]):
+    """
+    Renders 1-based `page_numbers` to PNGs in output_dir. Usually runs inside
+    a pool worker, which has pdfium to itself; threads of one process take
+    turns.
+    """
+    with _PDFIUM_LOCK:
+        pdf = pypdfium2.PdfDocument(pdf_path)
+        try:
+            for page_number in page_numbers:
+                page = pdf[page_number - 1]
+                try:
+                    image = page.render(scale=RENDER_DPI / 72).to_pil()
+                finally:
+                    page.close()
+                # 256 color palette like pdfplumber's output; encoding a full
+                # RGB PNG takes longer than rendering the page
+                image = image.quantize(256, method=Image.Quantize.FASTOCTREE)
+                path = os.path.join(output_dir, get_page_filename(page_number))
+                # Readers of the page cache must never see a partial file
+                temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                image.save(temp_path, "PNG", dpi=(RENDER_DPI, RENDER_DPI))
+                os.replace(temp_path, path)
+        finally:
+            pdf.close()
+
+
+def get_pdf_page_count(pdf_path: str) -> int:
+    with _PDFIUM_LOCK:
+        pdf = pypdfium2.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+class PdfRasterizer:
+    """
+    Renders PDF pages to PNGs with pdfium across worker processes.
+
+    `render_all` renders every page up front. `register` instead stores the
+    PDF in a page cache keyed by its content hash and returns at once; pages
+    are rendered in the background or when first requested through
+    `get_page`. PDF_RASTER_WORKERS=0 renders in threads of this process, one
+    chunk at a time.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # (document id, page number) -> render in flight
+        self._page_renders: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    @property
+    def workers(self) -> int:
+        workers = get_pdf_raster_workers_env()
+        return int(workers) if workers else min(4, os.cpu_count() or 1)
+
+    @property
+    def cache_max_bytes(self) -> int:
+        value = get_pdf_pages_cache_max_bytes_env()
+        return int(value) if value else DEFAULT_CACHE_MAX_BYTES
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _render(self, pdf_path: str, output_dir: str, page_numbers: List[int]):
+        if self.workers <= 0:
+            return await asyncio.to_thread(
+                render_pdf_pages, pdf_path, output_dir, page_numbers
+            )
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.executor, render_pdf_pages, pdf_path, output_dir, page_numbers
+            )
+        except BrokenProcessPool:
+            print("PDF raster pool is broken, rendering in process")
+            self._executor = None
+            return await asyncio.to_thread(
+                render_pdf_pages, pdf_path, output_dir, page_numbers
+            )
+
+    def _get_chunks(self, page_numbers: List[int]) -> List[List[int]]:
+        return [
+            page_numbers[start : start + CHUNK_PAGES]
+            for start in range(0, len(page_numbers), CHUNK_PAGES)
+        ]
+
+    async def render_all(self, pdf_path: str, output_dir: str) -> List[str]:
+        """Renders every page into output_dir and returns the paths in order."""
+        page_count = await asyncio.to_thread(get_pdf_page_count, pdf_path)
+        page_numbers = list(range(1, page_count + 1))
+        await asyncio.gather(
+            *(
+                self._render(pdf_path, output_dir, chunk)
+                for chunk in self._get_chunks(page_numbers)
+            )
+        )
+        return [
+            os.path.join(output_dir, get_page_filename(page_number))
+            for page_number in page_numbers
+        ]
+
+    # Lazy rendering through the page cache
+
+    def get_document_directory(self, document_id: str) -> Optional[str]:
+        if not DOCUMENT_ID_PATTERN.match(document_id):
+            return None
+        directory = os.path.join(get_pdf_pages_cache_directory(), document_id)
+        if not os.path.exists(os.path.join(directory, SOURCE_FILENAME)):
+            return None
+        return directory
+
+    def get_page_url(self, document_id: str, page_number: int) -> str:
+        return f"/api/v1/ppt/pdf-slides/pages/{document_id}/{page_number}"
+
+    async def register(
+        self, pdf_path: str, sha256: Optional[str] = None
+    ) -> Tuple[str, int]:
+        """
+        Copies the PDF into the page cache; returns (document id, page count).
+        Pass the file's `sha256` when it is already known to skip hashing it.
+        """
+
+        def copy_to_cache():
+            document_id = sha256
+            if document_id is None:
+                digest = hashlib.sha256()
+                with open(pdf_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+                document_id = digest.hexdigest()
+            directory = os.path.join(get_pdf_pages_cache_directory(), document_id)
+            source_path = os.path.join(directory, SOURCE_FILENAME)
+            if os.path.exists(source_path):
+                os.utime(directory)
+            else:
+                os.makedirs(directory, exist_ok=True)
+                temp_path = f"{source_path}.{os.getpid()}.tmp"
+                shutil.copyfile(pdf_path, temp_path)
+                os.replace(temp_path, source_path)
+            return document_id, get_pdf_page_count(source_path)
+
+        document_id, page_count = await asyncio.to_thread(copy_to_cache)
+        await asyncio.to_thread(self.evict)
+        return document_id, page_count
+
+    def _get_page_renders(self) -> Dict[Tuple[str, int], asyncio.Future]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures belong to the loop that created them
+            self._loop = loop
+            self._page_renders = {}
+        return self._page_renders
+
+    async def _render_cached_pages(self, document_id: str, page_numbers: List[int]):
+        directory = os.path.join(get_pdf_pages_cache_directory(), document_id)
+        page_renders = self._get_page_renders()
+        missing = [
+            page_number
+            for page_number in page_numbers
+            if (document_id, page_number) not in page_renders
+            and not os.path.exists(
+                os.path.join(directory, get_page_filename(page_number))
+            )
+        ]
+        if missing:
+            render = asyncio.ensure_future(
+                self._render(
+                    os.path.join(directory, SOURCE_FILENAME), directory, missing
+                )
+            )
+            for page_number in missing:
+                page_renders[(document_id, page_number)] = render
+
+            def forget(_):
+                for page_number in missing:
+                    page_renders.pop((document_id, page_number), None)
+
+            render.add_done_callback(forget)
+
+        in_flight = {
+            page_renders[(document_id, page_number)]
+            for page_number in page_numbers
+            if (document_id, page_number) in page_renders
+        }
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def get_page(self, document_id: str, page_number: int) -> Optional[str]:
+        """Returns the page's PNG path, rendering it now if needed."""
+        directory = self.get_document_directory(document_id)
+        if directory is None:
+            return None
+        path = os.path.join(directory, get_page_filename(page_number))
+        if not os.path.exists(path):
+            page_count = await asyncio.to_thread(
+                get_pdf_page_count, os.path.join(directory, SOURCE_FILENAME)
+            )
+            if not 1 <= page_number <= page_count:
+                return None
+            await self._render_cached_pages(document_id, [page_number])
+        os.utime(directory)
+        return path
+
+    async def _render_in_background(self, document_id: str, page_count: int):
+        page_numbers = list(range(1, page_count + 1))
+        chunks = self._get_chunks(page_numbers)
+        # A window of chunks at a time, so requested pages can get in between
+        for start in range(0, len(chunks), max(self.workers, 1)):
+            window = chunks[start : start + max(self.workers, 1)]
+            await asyncio.gather(
+                *(self._render_cached_pages(document_id, chunk) for chunk in window)
+            )
+
+    def start_background_render(self, document_id: str, page_count: int):
+        CONCURRENT_SERVICE.run_task(
+            None, self._render_in_background, document_id, page_count
+        )
+
+    def evict(self):
+        cache_directory = get_pdf_pages_cache_directory()
+        documents = []
+        for document_id in os.listdir(cache_directory):
+            directory = os.path.join(cache_directory, document_id)
+            try:
+                size = sum(
+                    entry.stat().st_size for entry in os.scandir(directory)
+                )
+                last_used_at = os.stat(directory).st_mtime
+            except FileNotFoundError:
+                continue
+            documents.append((last_used_at, size, directory))
+
+        total_size = sum(size for _, size, _ in documents)
+        evictable_before = time.time() - EVICTION_GRACE_SECONDS
+        for last_used_at, size, directory in sorted(documents):
+            if total_size <= self.cache_max_bytes or last_used_at > evictable_before:
+                break
+            shutil.rmtree(directory, ignore_errors=True)
+            total_size -= size
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+PDF_RASTERIZER = PdfRasterizer()
@@ -1,7 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import math
 import os
-from typing import List, Optional
+from typing import IO, Dict, List, Optional, Union
+import uuid
 from lxml import etree
 from services.html_to_text_runs_service import (
+    has_inline_markup,
+    normalize_newlines,
     parse_html_text_to_text_runs as parse_inline_html_to_runs,
 )
 
@@ -11,7 +17,7 @@ from pptx.slide import Slide
 from pptx.text.text import _Paragraph, TextFrame, Font, _Run
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 from lxml.etree import fromstring, tostring
-from PIL import Image
+from PIL import ExifTags, Image, ImageOps
 from pptx.oxml.xmlchemy import OxmlElement
 
 from pptx.util import Pt
@@ -36,19 +42,37 @@ from models.pptx_models import (
     PptxTextBoxModel,
     PptxTextRunModel,
 )
-from utils.download_helpers import download_files
+from services.image_derivatives_service import IMAGE_DERIVATIVES_SERVICE
+from services.image_transform_cache_service import IMAGE_TRANSFORM_CACHE_SERVICE
+from services.remote_image_cache_service import REMOTE_IMAGE_CACHE_SERVICE
+from utils.get_env import get_pptx_picture_dpi_env, get_pptx_picture_workers_env
 from utils.image_utils import (
     clip_image,
+    convert_to_srgb,
     create_circle_image,
     fit_image,
     invert_image,
     round_image_corners,
     set_image_opacity,
 )
-import uuid
 
 BLANK_SLIDE_LAYOUT = 6
 PX_PER_INCH = 96
+# Embedded pictures keep 2x the on-slide pixel size so they stay sharp when zoomed
+PICTURE_PIXEL_DENSITY = 2
+DEFAULT_PICTURE_DPI = PX_PER_INCH * PICTURE_PIXEL_DENSITY
+EMBEDDED_JPEG_QUALITY = 85
+
+
+def get_picture_workers() -> int:
+    workers = get_pptx_picture_workers_env()
+    return int(workers) if workers else min(4, os.cpu_count() or 1)
+
+
+def get_picture_dpi() -> int:
+    """Resolution cap for embedded pictures; 0 embeds originals untouched."""
+    dpi = get_pptx_picture_dpi_env()
+    return int(dpi) if dpi else DEFAULT_PICTURE_DPI
 
 
 def pt_from_px(px: float) -> Pt:
@@ -93,6 +117,7 @@ class PptxPresentationCreator:
 
         self._ppt_model = ppt_model
         self._slide_models = ppt_model.slides
+        self._embedded_pictures: Dict[tuple, Optional[str]] = {}
 
         self._ppt = Presentation()
         # Match the 1280x720 CSS viewport at 96dpi => 13.333" x 7.5" (widescreen).
@@ -106,6 +131,23 @@ class PptxPresentationCreator:
         parent.append(element)
         return element
 
+    def use_image_derivative(self, picture_model: PptxPictureBoxModel):
+        """Swaps the picture for the smallest pre-built variant that covers its box."""
+        image_path = picture_model.picture.path
+        if image_path.startswith("http") and "app_data/" in image_path:
+            image_path = os.path.join("/app_data", image_path.split("app_data/")[1])
+
+        resolved_path = IMAGE_DERIVATIVES_SERVICE.resolve(
+            image_path,
+            "pptx",
+            picture_model.position.width
+            * (get_picture_dpi() or DEFAULT_PICTURE_DPI)
+            / PX_PER_INCH,
+        )
+        if resolved_path != image_path:
+            picture_model.picture.path = resolved_path
+            picture_model.picture.is_network = False
+
     async def fetch_network_assets(self):
         image_urls = []
         models_with_network_asset: List[PptxPictureBoxModel] = []
@@ -113,6 +155,7 @@ class PptxPresentationCreator:
         if self._ppt_model.shapes:
             for each_shape in self._ppt_model.shapes:
                 if isinstance(each_shape, PptxPictureBoxModel):
+                    self.use_image_derivative(each_shape)
                     image_path = each_shape.picture.path
                     if image_path.startswith("http"):
                         if "app_data/" in image_path:
@@ -128,6 +171,7 @@ class PptxPresentationCreator:
         for each_slide in self._slide_models:
             for each_shape in each_slide.shapes:
                 if isinstance(each_shape, PptxPictureBoxModel):
+                    self.use_image_derivative(each_shape)
                     image_path = each_shape.picture.path
                     if image_path.startswith("http"):
                         if "app_data" in image_path:
@@ -141,7 +185,9 @@ class PptxPresentationCreator:
                         models_with_network_asset.append(each_shape)
 
         if image_urls:
-            image_paths = await download_files(image_urls, self._temp_dir)
+            image_paths = await REMOTE_IMAGE_CACHE_SERVICE.get_files(
+                image_urls, self._temp_dir
+            )
 
             for each_shape, each_image_path in zip(
                 models_with_network_asset, image_paths
@@ -152,7 +198,13 @@ class PptxPresentationCreator:
 
     async def create_ppt(self):
         await self.fetch_network_assets()
+        self.populate_slides()
+
+    def populate_slides(self):
+        """CPU-bound part of create_ppt; expects all pictures to be local files."""
+        self.prepare_pictures()
 
+        # Second phase: assemble slides from the prepared picture files
         for slide_model in self._slide_models:
             # Adding global shapes to slide
             if self._ppt_model.shapes:
@@ -214,9 +266,11 @@ class PptxPresentationCreator:
         connector_shape.line.color.rgb = RGBColor.from_string(connector_model.color)
         self.set_fill_opacity(connector_shape, connector_model.opacity)
 
-    def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
-        image_path = picture_model.picture.path
-        if (
+    def get_picture_transform_parameters(
+        self, picture_model: PptxPictureBoxModel
+    ) -> Optional[dict]:
+        """Returns everything that affects the transformed picture, or None."""
+        if not (
             picture_model.clip
             or picture_model.border_radius
             or picture_model.invert
@@ -224,39 +278,256 @@ class PptxPresentationCreator:
             or picture_model.object_fit
             or picture_model.shape
         ):
-            try:
-                image = Image.open(image_path)
-            except Exception:
-                print(f"Could not open image: {image_path}")
-                return
+            return None
+        return {
+            "clip": picture_model.clip,
+            "border_radius": picture_model.border_radius,
+            "invert": picture_model.invert,
+            "opacity": picture_model.opacity,
+            "object_fit": (
+                picture_model.object_fit.model_dump(mode="json")
+                if picture_model.object_fit
+                else None
+            ),
+            "shape": picture_model.shape.value if picture_model.shape else None,
+            "width": picture_model.position.width,
+            "height": picture_model.position.height,
+        }
+
+    def transform_picture(
+        self, image: Image.Image, picture_model: PptxPictureBoxModel
+    ) -> Image.Image:
+        image = image.convert("RGBA")
+        # ? Applying border radius twice to support both clip and object fit
+        if picture_model.border_radius:
+            image = round_image_corners(image, picture_model.border_radius)
+        if picture_model.object_fit:
+            image = fit_image(
+                image,
+                picture_model.position.width,
+                picture_model.position.height,
+                picture_model.object_fit,
+            )
+        elif picture_model.clip:
+            image = clip_image(
+                image,
+                picture_model.position.width,
+                picture_model.position.height,
+            )
+        if picture_model.border_radius:
+            image = round_image_corners(image, picture_model.border_radius)
+        if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
+            image = create_circle_image(image)
+        if picture_model.invert:
+            image = invert_image(image)
+        if picture_model.opacity:
+            image = set_image_opacity(image, picture_model.opacity)
+        return image
+
+    def get_embedded_size(
+        self, image: Image.Image, picture_model: PptxPictureBoxModel, dpi: int
+    ) -> tuple:
+        """Smallest size, keeping aspect ratio, that covers the box at `dpi`."""
+        width, height = image.size
+        scale = max(
+            picture_model.position.width * dpi / PX_PER_INCH / width,
+            picture_model.position.height * dpi / PX_PER_INCH / height,
+        )
+        if scale >= 1:
+            return width, height
+        return max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale))
+
+    def needs_reencoding(
+        self, image: Image.Image, picture_model: PptxPictureBoxModel, dpi: int
+    ) -> bool:
+        return (
+            image.format not in ("JPEG", "PNG")
+            # Office applications render CMYK JPEGs with wrong colours
+            or image.mode == "CMYK"
+            or "exif" in image.info
+            or self.get_embedded_size(image, picture_model, dpi) != image.size
+        )
 
+    def prepare_for_embedding(
+        self, image: Image.Image, picture_model: PptxPictureBoxModel, dpi: int
+    ) -> tuple:
+        """
+        Downscales to the box size at `dpi` and picks the encoding: JPEG when
+        the picture is opaque, PNG otherwise. Metadata other than an RGB
+        colour profile is dropped. Returns (image, format, save params).
+        """
+        embedded_size = image.size
+        if dpi:
+            embedded_size = self.get_embedded_size(image, picture_model, dpi)
+            if embedded_size != image.size and image.format == "JPEG":
+                # Decode at the smallest DCT scale that still covers the size
+                image.draft("RGB", embedded_size)
+        image = convert_to_srgb(image)
+        icc_profile = image.info.get("icc_profile")
+        if embedded_size != image.size:
+            image = image.resize(embedded_size, Image.LANCZOS)
+
+        if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
             image = image.convert("RGBA")
-            # ? Applying border radius twice to support both clip and object fit
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.object_fit:
-                image = fit_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                    picture_model.object_fit,
+            if image.getchannel("A").getextrema()[0] < 255:
+                params = {"icc_profile": icc_profile} if icc_profile else {}
+                return image, "PNG", params
+
+        params = {"quality": EMBEDDED_JPEG_QUALITY}
+        if icc_profile:
+            params["icc_profile"] = icc_profile
+        return image.convert("RGB"), "JPEG", params
+
+    def get_embedded_picture_path(
+        self, picture_model: PptxPictureBoxModel
+    ) -> Optional[str]:
+        """
+        Returns the file to embed: the original when it needs no work,
+        otherwise the transformed and downscaled picture, cached on disk.
+        """
+        image_path = picture_model.picture.path
+        transform_parameters = self.get_picture_transform_parameters(picture_model)
+        dpi = get_picture_dpi()
+        if not transform_parameters and not dpi:
+            return image_path
+
+        memo_key = self.get_picture_memo_key(picture_model, transform_parameters)
+        if memo_key not in self._embedded_pictures:
+            self._embedded_pictures[memo_key] = self._prepare_embedded_picture(
+                picture_model, transform_parameters, dpi
+            )
+        return self._embedded_pictures[memo_key]
+
+    def get_picture_memo_key(
+        self, picture_model: PptxPictureBoxModel, transform_parameters: Optional[dict]
+    ) -> tuple:
+        # The same picture often repeats across slides (logos, backgrounds)
+        return (
+            picture_model.picture.path,
+            json.dumps(transform_parameters, sort_keys=True),
+            picture_model.position.width,
+            picture_model.position.height,
+        )
+
+    def get_picture_models(self) -> List[PptxPictureBoxModel]:
+        picture_models = [
+            shape
+            for slide_model in self._slide_models
+            for shape in slide_model.shapes
+            if isinstance(shape, PptxPictureBoxModel)
+        ]
+        for shape in self._ppt_model.shapes or []:
+            if isinstance(shape, PptxPictureBoxModel):
+                picture_models.append(shape)
+        return picture_models
+
+    def prepare_pictures(self):
+        """
+        First export phase: transforms and downscales every distinct picture
+        of the deck concurrently. PIL releases the GIL while resampling and
+        encoding, so threads scale within a render worker process.
+        """
+        dpi = get_picture_dpi()
+        jobs = {}
+        for picture_model in self.get_picture_models():
+            transform_parameters = self.get_picture_transform_parameters(picture_model)
+            if not transform_parameters and not dpi:
+                continue
+            memo_key = self.get_picture_memo_key(picture_model, transform_parameters)
+            if memo_key not in self._embedded_pictures and memo_key not in jobs:
+                jobs[memo_key] = (picture_model, transform_parameters)
+
+        if not jobs:
+            return
+
+        workers = min(get_picture_workers(), len(jobs))
+        if workers <= 1:
+            for memo_key, (picture_model, transform_parameters) in jobs.items():
+                self._embedded_pictures[memo_key] = self._prepare_embedded_picture(
+                    picture_model, transform_parameters, dpi
+                )
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                memo_key: executor.submit(
+                    self._prepare_embedded_picture,
+                    picture_model,
+                    transform_parameters,
+                    dpi,
                 )
-            elif picture_model.clip:
-                image = clip_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
+                for memo_key, (picture_model, transform_parameters) in jobs.items()
+            }
+            for memo_key, future in futures.items():
+                try:
+                    self._embedded_pictures[memo_key] = future.result()
+                except Exception as e:
+                    # Retried, and reported, when the slide is assembled
+                    print(f"Could not prepare picture {memo_key[0]}: {e}")
+
+    def _prepare_embedded_picture(
+        self,
+        picture_model: PptxPictureBoxModel,
+        transform_parameters: Optional[dict],
+        dpi: int,
+    ) -> Optional[str]:
+        image_path = picture_model.picture.path
+        cache_key = None
+        if IMAGE_TRANSFORM_CACHE_SERVICE.is_enabled():
+            try:
+                cache_key = IMAGE_TRANSFORM_CACHE_SERVICE.get_key(
+                    image_path,
+                    {
+                        **(transform_parameters or {}),
+                        "width": picture_model.position.width,
+                        "height": picture_model.position.height,
+                        "dpi": dpi,
+                        # Entries from before EXIF orientation and colour
+                        # profiles were applied
+                        "orientation": "exif",
+                        "colour": "srgb",
+                    },
                 )
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                image = create_circle_image(image)
-            if picture_model.invert:
-                image = invert_image(image)
-            if picture_model.opacity:
-                image = set_image_opacity(image, picture_model.opacity)
-            image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
-            image.save(image_path)
+                cached_path = IMAGE_TRANSFORM_CACHE_SERVICE.get(cache_key)
+                if cached_path:
+                    return cached_path
+            except OSError:
+                cache_key = None
+
+        try:
+            image = Image.open(image_path)
+        except Exception:
+            print(f"Could not open image: {image_path}")
+            # python-pptx may still read formats PIL cannot
+            return None if transform_parameters else image_path
+
+        # Phone photos store pixels sideways with an Orientation tag, which
+        # re-encoding drops; apply it first so sizes and crops are upright
+        if image.getexif().get(ExifTags.Base.Orientation, 1) != 1:
+            image = ImageOps.exif_transpose(image)
+
+        if not transform_parameters and not self.needs_reencoding(
+            image, picture_model, dpi
+        ):
+            return image_path
+
+        if transform_parameters:
+            # Transforms work on RGB(A) pixels
+            image = self.transform_picture(convert_to_srgb(image), picture_model)
+        image, format, params = self.prepare_for_embedding(image, picture_model, dpi)
+
+        if cache_key:
+            return IMAGE_TRANSFORM_CACHE_SERVICE.put(cache_key, image, format, **params)
+
+        extension = "jpg" if format == "JPEG" else "png"
+        image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.{extension}")
+        image.save(image_path, format, **params)
+        return image_path
+
+    def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
+        image_path = self.get_embedded_picture_path(picture_model)
+        if not image_path:
+            return
 
         margined_position = self.get_margined_position(
             picture_model.position, picture_model.margin
@@ -327,6 +598,12 @@ class PptxPresentationCreator:
         if paragraph_model.font:
             self.apply_font_to_paragraph(paragraph, paragraph_model.font)
 
+        if paragraph_model.text and not has_inline_markup(paragraph_model.text):
+            self.add_plain_text_runs(
+                paragraph, paragraph_model.font, paragraph_model.text
+            )
+            return
+
         text_runs = []
         if paragraph_model.text:
             text_runs = self.parse_html_text_to_text_runs(
@@ -342,6 +619,19 @@ class PptxPresentationCreator:
     def parse_html_text_to_text_runs(self, font: Optional[PptxFontModel], text: str):
         return parse_inline_html_to_runs(text, font)
 
+    def add_plain_text_runs(
+        self, paragraph: _Paragraph, font: Optional[PptxFontModel], text: str
+    ):
+        # Same runs the HTML parser would produce: one per line, breaks unstyled
+        font = font or PptxFontModel()
+        for index, line in enumerate(normalize_newlines(text).split("\n")):
+            if index > 0:
+                paragraph.add_run().text = "\n"
+            if line:
+                text_run = paragraph.add_run()
+                text_run.text = line
+                self.apply_font(text_run.font, font)
+
     def populate_text_run(self, text_run: _Run, text_run_model: PptxTextRunModel):
         text_run.text = text_run_model.text
         if text_run_model.font:
@@ -530,5 +820,7 @@ class PptxPresentationCreator:
         except Exception as e:
             print(f"Could not apply strikethrough: {e}")
 
-    def save(self, path: str):
+    def save(self, path: Union[str, IO[bytes]]):
         self._ppt.save(path)
+        if IMAGE_TRANSFORM_CACHE_SERVICE.is_enabled():
+            IMAGE_TRANSFORM_CACHE_SERVICE.evict()
@@ -0,0 +1,132 @@
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import time
+from typing import Optional, Union
+
+from fastapi import HTTPException
+
+from models.pptx_models import PptxPresentationModel
+from services.pptx_presentation_creator import PptxPresentationCreator
+from utils.get_env import get_pptx_render_workers_env
+
+
+def render_pptx(
+    ppt_model: PptxPresentationModel, temp_dir: str, path: Optional[str]
+) -> Union[str, bytes]:
+    """
+    Builds and saves a presentation whose pictures are already local files.
+    Runs inside a pool worker, so it only receives picklable arguments.
+    Without a path the file is built in memory and its bytes are returned.
+    """
+    pptx_creator = PptxPresentationCreator(ppt_model, temp_dir)
+    pptx_creator.populate_slides()
+    if path is None:
+        buffer = io.BytesIO()
+        pptx_creator.save(buffer)
+        return buffer.getvalue()
+    pptx_creator.save(path)
+    return path
+
+
+class PptxRenderPool:
+    """
+    Renders PPTX files off the event loop. Network assets are fetched on the
+    loop; XML building, PIL transforms and zip writing run in worker
+    processes. PPTX_RENDER_WORKERS=0 renders in a thread of this process.
+
+    A render whose worker dies (usually out of memory) is retried once on a
+    fresh pool and never in this process, which serves every other request.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_render_seconds = 0.0
+
+    @property
+    def workers(self) -> int:
+        workers = get_pptx_render_workers_env()
+        return int(workers) if workers else min(2, os.cpu_count() or 1)
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers don't inherit the event loop, sockets or locks
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def get_metrics(self) -> dict:
+        # Jobs are picked up FIFO, so anything beyond the worker count waits
+        workers = max(self.workers, 1)
+        return {
+            "workers": self.workers,
+            "queued": max(self.in_flight - workers, 0),
+            "running": min(self.in_flight, workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "average_seconds": (
+                self.total_render_seconds / self.completed if self.completed else None
+            ),
+        }
+
+    async def _run(
+        self, ppt_model: PptxPresentationModel, temp_dir: str, path: Optional[str]
+    ):
+        if self.workers <= 0:
+            return await asyncio.to_thread(render_pptx, ppt_model, temp_dir, path)
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self.executor
+            try:
+                return await loop.run_in_executor(
+                    executor, render_pptx, ppt_model, temp_dir, path
+                )
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM); later exports get a fresh pool
+                if self._executor is executor:
+                    self._executor = None
+                print(f"PPTX render pool is broken (attempt {attempt + 1})")
+        raise HTTPException(
+            status_code=500,
+            detail="PPTX export failed: its render worker stopped, "
+            "possibly out of memory",
+        )
+
+    async def render(
+        self, ppt_model: PptxPresentationModel, temp_dir: str, path: Optional[str]
+    ) -> Union[str, bytes]:
+        """Saves the deck to `path`, or returns its bytes when path is None."""
+        pptx_creator = PptxPresentationCreator(ppt_model, temp_dir)
+        await pptx_creator.fetch_network_assets()
+
+        self.in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            result = await self._run(ppt_model, temp_dir, path)
+        except Exception:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            self.total_render_seconds += time.perf_counter() - started_at
+        finally:
+            self.in_flight -= 1
+        return result
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+PPTX_RENDER_POOL = PptxRenderPool()
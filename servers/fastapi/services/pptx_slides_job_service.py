@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, List, Literal, Optional
+import uuid
+
+from services.concurrent_service import CONCURRENT_SERVICE
+from utils.get_env import get_pptx_process_max_concurrent_env
+
+DEFAULT_MAX_CONCURRENT = 2
+# Finished jobs stay readable this long so clients can fetch the result
+JOB_RETENTION_SECONDS = 15 * 60
+
+
+class PptxSlidesJob:
+    def __init__(self):
+        self.id = str(uuid.uuid4())
+        self.status: Literal["queued", "running", "completed", "failed"] = "queued"
+        self.stages: List[str] = []
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def set_stage(self, stage: str):
+        self.status = "running"
+        self.stages.append(stage)
+        self._notify()
+
+    def complete(self, result: dict):
+        self.status = "completed"
+        self.result = result
+        self.finished_at = time.monotonic()
+        self._notify()
+
+    def fail(self, error: str):
+        self.status = "failed"
+        self.error = error
+        self.finished_at = time.monotonic()
+        self._notify()
+
+    async def iterate_stages(self) -> AsyncIterator[str]:
+        """Yields every stage, past ones first, until the job finishes."""
+        sent = 0
+        while True:
+            changed = self._changed
+            while sent < len(self.stages):
+                yield self.stages[sent]
+                sent += 1
+            if self.is_finished:
+                return
+            await changed.wait()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "stage": self.stages[-1] if self.stages else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class PptxSlidesJobService:
+    """
+    Runs PPTX template processing in the background and keeps its progress
+    in memory for polling and SSE. Also caps how many conversions run at
+    once (PPTX_PROCESS_MAX_CONCURRENT) for both the job and the direct mode.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, PptxSlidesJob] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def max_concurrent(self) -> int:
+        value = get_pptx_process_max_concurrent_env()
+        return max(int(value), 1) if value else DEFAULT_MAX_CONCURRENT
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    def get(self, job_id: str) -> Optional[PptxSlidesJob]:
+        return self._jobs.get(job_id)
+
+    def _prune(self):
+        expired_before = time.monotonic() - JOB_RETENTION_SECONDS
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at < expired_before:
+                del self._jobs[job_id]
+
+    def start(
+        self, run: Callable[[PptxSlidesJob], Coroutine[Any, Any, dict]]
+    ) -> PptxSlidesJob:
+        """Starts `run(job)` in the background; its return value is the result."""
+        self._prune()
+        job = PptxSlidesJob()
+        self._jobs[job.id] = job
+        CONCURRENT_SERVICE.run_task(None, self._run, job, run)
+        return job
+
+    async def _run(
+        self,
+        job: PptxSlidesJob,
+        run: Callable[[PptxSlidesJob], Coroutine[Any, Any, dict]],
+    ):
+        try:
+            job.complete(await run(job))
+        except Exception as e:
+            print(f"PPTX processing job {job.id} failed: {e}")
+            job.fail(getattr(e, "detail", None) or str(e))
+
+
+PPTX_SLIDES_JOB_SERVICE = PptxSlidesJobService()
@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from utils.asset_directory_utils import get_remote_images_cache_directory
+from utils.download_helpers import download_files
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_remote_image_cache_max_bytes_env,
+    get_remote_image_cache_per_host_env,
+    get_remote_image_cache_ttl_env,
+)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_PER_HOST_LIMIT = 4
+# Entries used this recently are never evicted, an export may still be reading them
+EVICTION_GRACE_SECONDS = 300
+
+
+class RemoteImageCacheService:
+    """
+    Disk cache for remote images used by PPTX export.
+
+    Entries are keyed by URL and revalidated with ETag/Last-Modified once their
+    freshness lifetime ends. The cache is capped in size and evicts least
+    recently used entries. Downloads are limited per host.
+    """
+
+    def __init__(self):
+        self._index: Optional[Dict[str, dict]] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def is_enabled(self) -> bool:
+        return bool(get_app_data_directory_env())
+
+    @property
+    def max_bytes(self) -> int:
+        value = get_remote_image_cache_max_bytes_env()
+        return int(value) if value else DEFAULT_MAX_BYTES
+
+    @property
+    def ttl_seconds(self) -> int:
+        value = get_remote_image_cache_ttl_env()
+        return int(value) if value else DEFAULT_TTL_SECONDS
+
+    @property
+    def per_host_limit(self) -> int:
+        value = get_remote_image_cache_per_host_env()
+        return int(value) if value else DEFAULT_PER_HOST_LIMIT
+
+    def get_key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _get_metadata_path(self, key: str) -> str:
+        return os.path.join(get_remote_images_cache_directory(), f"{key}.json")
+
+    def _get_index(self) -> Dict[str, dict]:
+        if self._index is None:
+            self._index = {}
+            directory = get_remote_images_cache_directory()
+            for filename in os.listdir(directory):
+                if not filename.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(directory, filename), "r") as f:
+                        metadata = json.load(f)
+                except Exception:
+                    continue
+                if os.path.exists(metadata.get("path", "")):
+                    self._index[filename[: -len(".json")]] = metadata
+        return self._index
+
+    def _reset_if_loop_changed(self):
+        # Semaphores and tasks are bound to the loop they were created on
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._host_semaphores = {}
+            self._in_flight = {}
+
+    def _get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    def _get_extension(self, url: str, content_type: Optional[str]) -> str:
+        extension = os.path.splitext(urlparse(url).path)[1]
+        if re.fullmatch(r"\.[A-Za-z0-9]{1,5}", extension or ""):
+            return extension.lower()
+        if content_type:
+            return mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
+        return ""
+
+    def _get_expires_at(self, headers) -> float:
+        ttl = self.ttl_seconds
+        cache_control = headers.get("Cache-Control", "")
+        if "no-cache" in cache_control or "no-store" in cache_control:
+            ttl = 0
+        else:
+            match = re.search(r"max-age=(\d+)", cache_control)
+            if match:
+                ttl = min(int(match.group(1)), ttl)
+        return time.time() + ttl
+
+    def _save_metadata(self, key: str, metadata: dict):
+        metadata_path = self._get_metadata_path(key)
+        with open(f"{metadata_path}.tmp", "w") as f:
+            json.dump(metadata, f)
+        os.replace(f"{metadata_path}.tmp", metadata_path)
+        self._get_index()[key] = metadata
+
+    def _touch(self, metadata: dict):
+        metadata["last_used_at"] = time.time()
+
+    def _remove_entry(self, key: str):
+        metadata = self._get_index().pop(key, None)
+        for path in (metadata or {}).get("path"), self._get_metadata_path(key):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    def evict(self):
+        index = self._get_index()
+        total_size = sum(each.get("size", 0) for each in index.values())
+        if total_size <= self.max_bytes:
+            return
+
+        evictable_before = time.time() - EVICTION_GRACE_SECONDS
+        for key, metadata in sorted(
+            index.items(), key=lambda item: item[1].get("last_used_at", 0)
+        ):
+            if total_size <= self.max_bytes:
+                break
+            if metadata.get("last_used_at", 0) > evictable_before:
+                continue
+            total_size -= metadata.get("size", 0)
+            self._remove_entry(key)
+
+    async def _fetch(
+        self, session: aiohttp.ClientSession, url: str, key: str
+    ) -> Optional[str]:
+        index = self._get_index()
+        cached = index.get(key)
+        if cached and not os.path.exists(cached["path"]):
+            self._remove_entry(key)
+            cached = None
+
+        if cached and cached.get("expires_at", 0) > time.time():
+            self._touch(cached)
+            return cached["path"]
+
+        request_headers = {}
+        if cached:
+            if cached.get("etag"):
+                request_headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                request_headers["If-Modified-Since"] = cached["last_modified"]
+
+        async with self._get_host_semaphore(url):
+            try:
+                async with session.get(url, headers=request_headers) as response:
+                    if response.status == 304 and cached:
+                        cached["expires_at"] = self._get_expires_at(response.headers)
+                        self._touch(cached)
+                        self._save_metadata(key, cached)
+                        return cached["path"]
+
+                    if response.status != 200:
+                        print(
+                            f"Failed to download {url}. HTTP status: {response.status}"
+                        )
+                        # A stale copy is better than a missing picture
+                        return cached["path"] if cached else None
+
+                    content_type = response.headers.get("Content-Type")
+                    path = os.path.join(
+                        get_remote_images_cache_directory(),
+                        f"{key}{self._get_extension(url, content_type)}",
+                    )
+                    size = 0
+                    with open(f"{path}.part", "wb") as file:
+                        async for chunk in response.content.iter_chunked(65536):
+                            file.write(chunk)
+                            size += len(chunk)
+                    os.replace(f"{path}.part", path)
+                    if cached and cached["path"] != path and os.path.exists(
+                        cached["path"]
+                    ):
+                        os.remove(cached["path"])
+
+                    metadata = {
+                        "url": url,
+                        "path": path,
+                        "size": size,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "content_type": content_type,
+                        "expires_at": self._get_expires_at(response.headers),
+                    }
+                    self._touch(metadata)
+                    self._save_metadata(key, metadata)
+                    return path
+            except Exception as e:
+                print(f"Error downloading file from {url}: {e}")
+                return cached["path"] if cached else None
+
+    async def get_file(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[str]:
+        key = self.get_key(url)
+        # Concurrent requests for the same URL share one download
+        if key not in self._in_flight:
+            task = asyncio.create_task(self._fetch(session, url, key))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(self._in_flight[key])
+
+    async def get_files(
+        self, urls: List[str], fallback_directory: str
+    ) -> List[Optional[str]]:
+        """
+        Returns local paths for the given URLs, in order. Falls back to plain
+        downloads into `fallback_directory` when the cache is unavailable.
+        """
+        if not self.is_enabled():
+            return await download_files(urls, fallback_directory)
+
+        self._reset_if_loop_changed()
+        async with aiohttp.ClientSession(trust_env=True) as session:
+            results = await asyncio.gather(
+                *[self.get_file(session, url) for url in urls],
+                return_exceptions=True,
+            )
+
+        paths = [None if isinstance(each, Exception) else each for each in results]
+        print(
+            f"Remote image cache: {sum(1 for each in paths if each)}/{len(urls)} images available"
+        )
+        self.evict()
+        return paths
+
+
+REMOTE_IMAGE_CACHE_SERVICE = RemoteImageCacheService()
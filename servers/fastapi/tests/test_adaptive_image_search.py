@@ -0,0 +1,48 @@
+import asyncio
+
+from services.adaptive_image_service import AdaptiveImageService, ImageAlternative
+
+
+def make_service(tmp_path, delays):
+    service = AdaptiveImageService(str(tmp_path))
+
+    async def search(source, delay):
+        await asyncio.sleep(delay)
+        if delay < 0:
+            raise RuntimeError("provider down")
+        return [ImageAlternative(url=f"https://{source}/1.jpg", source=source)]
+
+    service._get_source_searches = lambda query, per_source: {
+        source: search(source, delay) for source, delay in delays.items()
+    }
+    return service
+
+
+def test_sources_are_streamed_in_completion_order(tmp_path):
+    service = make_service(
+        tmp_path, {"unsplash": 0.05, "pexels": 0.0, "wikimedia": 0.02}
+    )
+
+    async def run():
+        return [
+            source
+            async for source, _ in service.stream_multiple_sources("cat", deadline=1)
+        ]
+
+    assert asyncio.run(run()) == ["pexels", "wikimedia", "unsplash"]
+
+
+def test_sources_missing_the_deadline_are_dropped(tmp_path):
+    service = make_service(
+        tmp_path, {"unsplash": 0.0, "pexels": 5.0, "pixabay": -1}
+    )
+
+    async def run():
+        started_at = asyncio.get_running_loop().time()
+        images = await service.search_multiple_sources("cat", deadline=0.1)
+        return images, asyncio.get_running_loop().time() - started_at
+
+    images, elapsed = asyncio.run(run())
+
+    assert [each.source for each in images] == ["unsplash"]
+    assert elapsed < 1
@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from clients.comfyui_client import (
+    MAX_UNCLAIMED_EVENTS,
+    ComfyUIClient,
+    ComfyUIError,
+)
+
+RENDER_SECONDS = 0.2
+
+
+class MockComfyUIServer:
+    """Minimal ComfyUI server: /prompt, /ws, /history and /view."""
+
+    def __init__(self, with_websocket: bool = True, fail: bool = False):
+        self.with_websocket = with_websocket
+        self.fail = fail
+        self.sockets = {}
+        self.history = {}
+        self.queued = 0
+        self.max_queued = 0
+        self.app = web.Application()
+        self.app.router.add_post("/prompt", self.submit)
+        self.app.router.add_get("/ws", self.websocket)
+        self.app.router.add_get("/history/{prompt_id}", self.get_history)
+        self.app.router.add_get("/view", self.view)
+
+    async def submit(self, request: web.Request):
+        body = await request.json()
+        prompt_id = f"prompt-{len(self.history) + self.queued}"
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        asyncio.create_task(self.render(prompt_id, body["client_id"]))
+        return web.json_response({"prompt_id": prompt_id})
+
+    async def render(self, prompt_id: str, client_id: str):
+        await asyncio.sleep(RENDER_SECONDS)
+        self.queued -= 1
+        socket = self.sockets.get(client_id)
+        if self.fail:
+            self.history[prompt_id] = {"status": {"status_str": "error"}}
+            if socket is not None:
+                await socket.send_json(
+                    {
+                        "type": "execution_error",
+                        "data": {"prompt_id": prompt_id, "exception_message": "boom"},
+                    }
+                )
+            return
+
+        self.history[prompt_id] = {
+            "status": {"completed": True, "status_str": "success"},
+            "outputs": {"9": {"images": [{"filename": f"{prompt_id}.png"}]}},
+        }
+        if socket is not None:
+            await socket.send_bytes(b"preview")
+            await socket.send_json(
+                {"type": "executing", "data": {"node": None, "prompt_id": prompt_id}}
+            )
+
+    async def websocket(self, request: web.Request):
+        if not self.with_websocket:
+            raise web.HTTPNotFound()
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        self.sockets[request.query["clientId"]] = socket
+        async for _ in socket:
+            pass
+        return socket
+
+    async def get_history(self, request: web.Request):
+        prompt_id = request.match_info["prompt_id"]
+        if prompt_id not in self.history:
+            return web.json_response({})
+        return web.json_response({prompt_id: self.history[prompt_id]})
+
+    async def view(self, request: web.Request):
+        return web.Response(body=request.query["filename"].encode())
+
+
+async def _generate(mock: MockComfyUIServer, n_images: int, output_directory: str):
+    server = TestServer(mock.app)
+    await server.start_server()
+    client = ComfyUIClient(str(server.make_url("")), max_pending=3)
+    try:
+        started_at = time.perf_counter()
+        paths = await asyncio.gather(
+            *[client.generate({}, output_directory, timeout=10) for _ in range(n_images)]
+        )
+        return paths, time.perf_counter() - started_at
+    finally:
+        await client.close()
+        await server.close()
+
+
+def test_completion_is_detected_from_websocket_events(tmp_path):
+    mock = MockComfyUIServer()
+    paths, elapsed = asyncio.run(_generate(mock, 6, str(tmp_path)))
+
+    assert len(set(paths)) == 6
+    assert {open(path, "rb").read() for path in paths} == {
+        f"prompt-{i}.png".encode() for i in range(6)
+    }
+    # Two waves of three jobs, far below a single 4 second poll interval
+    assert elapsed < 6 * RENDER_SECONDS
+    assert mock.max_queued == 3
+
+
+def test_falls_back_to_polling_without_websocket(tmp_path):
+    mock = MockComfyUIServer(with_websocket=False)
+    paths, elapsed = asyncio.run(_generate(mock, 2, str(tmp_path)))
+
+    assert len(paths) == 2
+    assert elapsed < 2
+
+
+def test_execution_errors_are_raised(tmp_path):
+    mock = MockComfyUIServer(fail=True)
+    with pytest.raises(ComfyUIError, match="boom"):
+        asyncio.run(_generate(mock, 1, str(tmp_path)))
+
+
+def test_late_events_of_timed_out_jobs_are_bounded():
+    async def run():
+        client = ComfyUIClient("http://comfyui")
+        # Completion events arriving after their jobs timed out
+        for i in range(MAX_UNCLAIMED_EVENTS + 10):
+            client._handle_event(
+                {"type": "execution_success", "data": {"prompt_id": f"late-{i}"}}
+            )
+        return client._finished
+
+    finished = asyncio.run(run())
+
+    assert len(finished) == MAX_UNCLAIMED_EVENTS
+    assert "late-0" not in finished
+    assert f"late-{MAX_UNCLAIMED_EVENTS + 9}" in finished
@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+import pytest
+
+from services import documents_loader
+from services.document_parse_pool import DocumentParsePool
+from services.documents_loader import DocumentsLoader
+
+
+def test_timed_out_parse_kills_its_worker(monkeypatch):
+    monkeypatch.setenv("DOCUMENT_PARSE_WORKERS", "1")
+    monkeypatch.setenv("DOCUMENT_PARSE_TIMEOUT", "2")
+    pool = DocumentParsePool()
+
+    async def run():
+        # Warm the worker so the timeout covers only the parse
+        assert await pool._run(abs, -1) == 1
+        started_at = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            await pool._run(time.sleep, 30)
+        elapsed = time.perf_counter() - started_at
+        # A fresh pool takes the next file
+        result = await pool._run(abs, -3)
+        pool.shutdown()
+        return elapsed, result
+
+    elapsed, result = asyncio.run(run())
+    assert elapsed < 10
+    assert result == 3
+
+
+def test_time_queued_for_a_worker_does_not_count_against_the_timeout(monkeypatch):
+    monkeypatch.setenv("DOCUMENT_PARSE_WORKERS", "1")
+    monkeypatch.setenv("DOCUMENT_PARSE_TIMEOUT", "3")
+    pool = DocumentParsePool()
+
+    async def run():
+        await pool._start_workers()
+        # Three files on one worker take 6 seconds, each parse only 2
+        results = await asyncio.gather(
+            *(pool._run(time.sleep, 2) for _ in range(3))
+        )
+        pool.shutdown()
+        return results
+
+    assert asyncio.run(run()) == [None, None, None]
+
+
+def test_timed_out_parse_leaves_other_workers_running(monkeypatch):
+    monkeypatch.setenv("DOCUMENT_PARSE_WORKERS", "2")
+    monkeypatch.setenv("DOCUMENT_PARSE_TIMEOUT", "4")
+    pool = DocumentParsePool()
+
+    async def parse_later(delay, seconds):
+        await asyncio.sleep(delay)
+        await pool._run(time.sleep, seconds)
+        return "parsed"
+
+    async def run():
+        pids = await pool._start_workers()
+        # The second parse is still running when the first one times out
+        results = await asyncio.gather(
+            pool._run(time.sleep, 30),
+            parse_later(2, 3),
+            return_exceptions=True,
+        )
+        survivors = await pool._start_workers()
+        pool.shutdown()
+        return pids, results, survivors
+
+    pids, results, survivors = asyncio.run(run())
+    assert isinstance(results[0], asyncio.TimeoutError)
+    assert results[1] == "parsed"
+    # Only the timed-out worker was replaced
+    assert len(set(pids) & set(survivors)) == 1
+
+
+def test_documents_parse_concurrently_in_input_order(tmp_path, monkeypatch):
+    delays = {"slow.pdf": 0.2, "medium.docx": 0.1, "fast.pptx": 0.0}
+    running = []
+    peak = []
+
+    async def parse(file_path):
+        name = file_path.rsplit("/", 1)[-1]
+        running.append(name)
+        peak.append(len(running))
+        await asyncio.sleep(delays[name])
+        running.remove(name)
+        return f"# {name}"
+
+    monkeypatch.setattr(documents_loader.DOCUMENT_PARSE_POOL, "parse", parse)
+    file_paths = []
+    for name in ["slow.pdf", "notes.txt", "medium.docx", "fast.pptx"]:
+        path = tmp_path / name
+        path.write_text("notes" if name.endswith(".txt") else "")
+        file_paths.append(str(path))
+
+    loader = DocumentsLoader(file_paths)
+    asyncio.run(loader.load_documents())
+
+    assert loader.documents == ["# slow.pdf", "notes", "# medium.docx", "# fast.pptx"]
+    assert max(peak) == 3
+
+
+def test_docling_converter_is_built_and_warmed_once_per_process(monkeypatch):
+    from services import docling_service
+
+    created = []
+
+    class FakeDoclingService:
+        def __init__(self):
+            created.append(self)
+            self.warm_ups = 0
+
+        def warm_up(self):
+            self.warm_ups += 1
+
+    monkeypatch.setattr(docling_service, "DOCLING_AVAILABLE", True)
+    monkeypatch.setattr(docling_service, "DoclingService", FakeDoclingService)
+    monkeypatch.setattr(docling_service, "_DOCLING_SERVICE", None)
+
+    docling_service.warm_up_docling_service()
+    assert docling_service.get_docling_service() is created[0]
+    assert docling_service.get_docling_service() is created[0]
+    assert len(created) == 1
+    assert created[0].warm_ups == 1
+
+
+def test_warm_up_is_skipped_without_docling(monkeypatch):
+    from services import document_parse_pool
+
+    monkeypatch.setattr(document_parse_pool, "DOCLING_AVAILABLE", False)
+    pool = DocumentParsePool()
+    assert pool.start_warm_up() is None
+    assert pool._executors == []
+
+
+def test_warm_up_starts_every_worker(monkeypatch):
+    monkeypatch.setenv("DOCUMENT_PARSE_WORKERS", "3")
+    pool = DocumentParsePool()
+
+    async def run():
+        pids = await pool._start_workers()
+        processes = sum(len(executor._processes) for executor in pool._executors)
+        pool.shutdown()
+        return pids, processes
+
+    pids, processes = asyncio.run(run())
+    assert len(set(pids)) == 3
+    assert processes == 3
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.presentation_and_path import PresentationAndPath
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from services.export_cache_service import EXPORT_CACHE_SERVICE
+import utils.export_utils as export_utils
+
+
+def run_with_session(monkeypatch, tmp_path, test):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    renders = []
+
+    async def render_presentation(presentation_id, title, export_as):
+        renders.append(export_as)
+        path = os.path.join(tmp_path, "exports", f"{title}.{export_as}")
+        with open(path, "w") as f:
+            f.write(f"render {len(renders)}")
+        return PresentationAndPath(presentation_id=presentation_id, path=path)
+
+    monkeypatch.setattr(export_utils, "render_presentation", render_presentation)
+
+    async def inner():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn,
+                    tables=[
+                        PresentationModel.__table__,
+                        SlideModel.__table__,
+                        PresentationLayoutCodeModel.__table__,
+                    ],
+                )
+            )
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            presentation = PresentationModel(
+                content="", n_slides=1, language="English", layout={"name": "general"}
+            )
+            slide = SlideModel(
+                presentation=presentation.id,
+                layout_group="general",
+                layout="general:title",
+                index=0,
+                content={"title": "Waves"},
+                html_content=None,
+                properties=None,
+            )
+            session.add_all([presentation, slide])
+            await session.commit()
+            await test(session, presentation, slide)
+        await engine.dispose()
+
+    asyncio.run(inner())
+    return renders
+
+
+def test_repeated_export_is_served_from_cache(monkeypatch, tmp_path):
+    async def test(session, presentation, slide):
+        first = await export_utils.export_presentation(
+            presentation.id, "deck", "pptx", session
+        )
+        # Another export with the same title overwrote the file meanwhile
+        with open(first.path, "w") as f:
+            f.write("another deck")
+        second = await export_utils.export_presentation(
+            presentation.id, "deck", "pptx", session
+        )
+        assert second.path == first.path
+        with open(second.path) as f:
+            assert f.read() == "render 1"
+
+    assert run_with_session(monkeypatch, tmp_path, test) == ["pptx"]
+
+
+def test_changed_slides_and_format_miss_the_cache(monkeypatch, tmp_path):
+    async def test(session, presentation, slide):
+        await export_utils.export_presentation(presentation.id, "deck", "pptx", session)
+        await export_utils.export_presentation(presentation.id, "deck", "pdf", session)
+
+        slide.content = {"title": "Particles"}
+        session.add(slide)
+        await session.commit()
+        await export_utils.export_presentation(presentation.id, "deck", "pptx", session)
+
+        cached = os.listdir(os.path.join(tmp_path, "cache", "exports"))
+        # The older PPTX revision is dropped when the new one is stored
+        assert sorted(name.rsplit(".", 1)[1] for name in cached) == ["pdf", "pptx"]
+
+    assert run_with_session(monkeypatch, tmp_path, test) == ["pptx", "pdf", "pptx"]
+
+
+def test_invalidate_drops_presentation_entries(monkeypatch, tmp_path):
+    async def test(session, presentation, slide):
+        await export_utils.export_presentation(presentation.id, "deck", "pptx", session)
+        EXPORT_CACHE_SERVICE.invalidate(presentation.id)
+        await export_utils.export_presentation(presentation.id, "deck", "pptx", session)
+
+    assert run_with_session(monkeypatch, tmp_path, test) == ["pptx", "pptx"]
+
+
+def test_slides_hash_ignores_row_order():
+    presentation_id = uuid.uuid4()
+    slides = [
+        SlideModel(
+            presentation=presentation_id,
+            layout_group="general",
+            layout="general:title",
+            index=index,
+            content={"title": f"Slide {index}"},
+            html_content=None,
+            properties=None,
+        )
+        for index in range(3)
+    ]
+    assert EXPORT_CACHE_SERVICE.get_slides_hash(
+        slides
+    ) == EXPORT_CACHE_SERVICE.get_slides_hash(list(reversed(slides)))
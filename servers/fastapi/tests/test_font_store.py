@@ -0,0 +1,73 @@
+import hashlib
+import os
+
+from models.saved_upload_file import SavedUploadFile
+from services.font_store_service import FontStoreService
+from services.libreoffice_pool import write_font_alias_config
+
+
+def save_font(tmp_path, filename, content):
+    path = tmp_path / filename
+    path.write_bytes(content)
+    return SavedUploadFile(
+        path=str(path), size=len(content), sha256=hashlib.sha256(content).hexdigest()
+    )
+
+
+def test_fonts_are_stored_once_and_grouped_per_upload(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    store = FontStoreService()
+    regular = save_font(tmp_path, "Brand-Regular.ttf", b"regular font bytes")
+    bold = save_font(tmp_path, "Brand-Bold.TTF", b"bold font bytes")
+    notes = save_font(tmp_path, "notes.txt", b"not a font")
+
+    first = store.add_fonts([regular, bold])
+    # Same fonts under other names share the directory and the files
+    second = store.add_fonts(
+        [
+            save_font(tmp_path, "copy.ttf", b"bold font bytes"),
+            save_font(tmp_path, "other.ttf", b"regular font bytes"),
+        ]
+    )
+    regular_only = store.add_fonts([regular, notes])
+
+    assert first == second != regular_only
+    assert len(os.listdir(store.files_directory)) == 2
+    assert sorted(os.listdir(first)) == sorted(os.listdir(store.files_directory))
+    assert len(os.listdir(regular_only)) == 1
+    assert store.add_fonts([notes]) is None
+
+
+def test_font_config_lists_upload_directories(tmp_path):
+    path = str(tmp_path / "fonts.conf")
+
+    write_font_alias_config(
+        path, {"Brand & Co Bold": "Brand & Co"}, ["/fonts/a"], "/fonts/cache"
+    )
+
+    with open(path) as f:
+        fonts_conf = f.read()
+    assert "<dir>/fonts/a</dir>" in fonts_conf
+    assert fonts_conf.index("<cachedir>/fonts/cache</cachedir>") < fonts_conf.index(
+        "<include>"
+    )
+    assert "<string>Brand &amp; Co Bold</string>" in fonts_conf
+
+
+def test_unused_sets_and_their_fonts_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    store = FontStoreService()
+    regular = save_font(tmp_path, "Brand-Regular.ttf", b"regular font bytes")
+    bold = save_font(tmp_path, "Brand-Bold.ttf", b"bold font bytes")
+    old_set = store.add_fonts([regular, bold])
+    # Two days old, like the fonts it links to
+    old = os.path.getmtime(old_set) - 2 * 24 * 60 * 60
+    os.utime(old_set, (old, old))
+    for filename in os.listdir(store.files_directory):
+        os.utime(os.path.join(store.files_directory, filename), (old, old))
+
+    new_set = store.add_fonts([regular])
+
+    assert not os.path.exists(old_set)
+    assert os.listdir(store.files_directory) == os.listdir(new_set)
+    assert os.path.exists(os.path.join(new_set, os.listdir(new_set)[0]))
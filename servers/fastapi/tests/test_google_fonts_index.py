@@ -0,0 +1,63 @@
+import asyncio
+import json
+import time
+
+from api.v1.ppt.endpoints.pptx_slides import ExtractedSlides, analyze_fonts_in_all_slides
+from services.google_fonts_service import (
+    GoogleFontsIndex,
+    GoogleFontsService,
+    parse_google_fonts_metadata,
+)
+from utils.asset_directory_utils import get_google_fonts_cache_path
+
+
+def test_lookup_ignores_case_spacing_and_separators():
+    index = GoogleFontsIndex(["Open Sans", "Black Ops One", "Roboto"])
+
+    assert index.families == ["Black Ops One", "Open Sans", "Roboto"]
+    assert index.get_family("OpenSans") == "Open Sans"
+    assert index.get_family("black-ops-one") == "Black Ops One"
+    assert index.get_family("Calibri") is None
+
+
+def test_metadata_with_xssi_prefix_is_parsed():
+    content = ")]}'\n" + json.dumps(
+        {"familyMetadataList": [{"family": "Inter"}, {"family": "Lato"}]}
+    )
+    assert parse_google_fonts_metadata(content) == ["Inter", "Lato"]
+
+
+def test_fresh_persisted_index_wins_over_bundled(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    GoogleFontsIndex(["Brand New Sans"], time.time()).save(
+        get_google_fonts_cache_path()
+    )
+    service = GoogleFontsService()
+
+    assert service.get_family("Brand New Sans") == "Brand New Sans"
+    assert not service.is_stale()
+
+
+def test_fonts_are_analyzed_offline(monkeypatch):
+    monkeypatch.setenv("GOOGLE_FONTS_INDEX_REFRESH_DISABLED", "true")
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    service = GoogleFontsService()
+    monkeypatch.setattr(
+        "api.v1.ppt.endpoints.pptx_slides.GOOGLE_FONTS_SERVICE", service
+    )
+
+    async def refresh():
+        raise AssertionError("no network access expected")
+
+    monkeypatch.setattr(service, "refresh", refresh)
+    slides = ExtractedSlides(
+        slide_xmls=["", ""],
+        slide_fonts=[["MontserratBold", "Calibri"], ["Open Sans Italic"]],
+    )
+
+    result = asyncio.run(analyze_fonts_in_all_slides(slides))
+
+    assert sorted(font["name"] for font in result.internally_supported_fonts) == [
+        "Montserrat",
+        "Open Sans",
+    ]
@@ -0,0 +1,59 @@
+from lxml.etree import tostring
+from pptx import Presentation
+
+from models.pptx_models import PptxFontModel, PptxParagraphModel
+from services.html_to_text_runs_service import (
+    has_inline_markup,
+    parse_html_text_to_text_runs,
+)
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+
+def test_nested_and_unbalanced_tags():
+    runs = parse_html_text_to_text_runs(
+        "<b>bold <i>both</i></b><i>italic</i></b>plain<code>x()</code>"
+    )
+    assert [(run.text, run.font.font_weight, run.font.italic) for run in runs] == [
+        ("bold ", 700, False),
+        ("both", 700, True),
+        ("italic", 400, True),
+        ("plain", 400, False),
+        ("x()", 400, False),
+    ]
+    assert runs[-1].font.name == "Courier New"
+
+
+def test_styled_fonts_are_shared_and_keep_base_font():
+    base_font = PptxFontModel(name="Roboto", size=24, color="ff0000")
+    runs = parse_html_text_to_text_runs("<b>a</b> <b>b</b>", base_font)
+    assert runs[0].font is runs[2].font
+    assert runs[0].font.model_dump() == {
+        **base_font.model_dump(),
+        "font_weight": 700,
+    }
+
+
+def get_paragraph_xml(text, use_fast_path):
+    creator = PptxPresentationCreator.__new__(PptxPresentationCreator)
+    slide = Presentation().slides.add_slide(Presentation().slide_layouts[6])
+    paragraph = slide.shapes.add_textbox(0, 0, 100, 100).text_frame.paragraphs[0]
+    paragraph_model = PptxParagraphModel(
+        text=text, font=PptxFontModel(name="Roboto", size=20, strike=False)
+    )
+    if use_fast_path:
+        creator.populate_paragraph(paragraph, paragraph_model)
+    else:
+        for text_run_model in creator.parse_html_text_to_text_runs(
+            paragraph_model.font, text
+        ):
+            creator.populate_text_run(paragraph.add_run(), text_run_model)
+        creator.apply_font_to_paragraph(paragraph, paragraph_model.font)
+    return tostring(paragraph._p)
+
+
+def test_plain_text_fast_path_matches_parser():
+    text = "Колебания маятника\r\nPeriod depends on length\n\nend"
+    assert not has_inline_markup(text)
+    assert get_paragraph_xml(text, True) == get_paragraph_xml(text, False)
+    assert has_inline_markup("a &amp; b")
+    assert has_inline_markup("<b>a</b>")
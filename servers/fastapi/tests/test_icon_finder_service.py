@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+from services.icon_finder_service import (
+    PLACEHOLDER_ICON_URL,
+    IconFinderService,
+)
+
+
+class FakeIndex:
+    def find_exact(self, query):
+        return None
+
+    def search(self, queries, k=1):
+        return [[f"{query}-bold"] for query in queries]
+
+
+class SlowLoadingIconFinderService(IconFinderService):
+    def __init__(self):
+        super().__init__()
+        self.release_load = threading.Event()
+        self.load_calls = 0
+
+    def _initialize_embedding_function(self):
+        self.load_calls += 1
+        self.release_load.wait(5)
+
+    def _initialize_vector_index(self):
+        self.vector_index = FakeIndex()
+
+
+def test_construction_does_not_load_the_index():
+    service = SlowLoadingIconFinderService()
+
+    assert not service.is_ready
+    assert service.load_calls == 0
+
+
+def test_search_returns_placeholder_until_index_is_warm(monkeypatch):
+    monkeypatch.setattr(
+        "services.icon_finder_service.ICON_INDEX_WAIT_SECONDS", 0.01
+    )
+    service = SlowLoadingIconFinderService()
+
+    async def run():
+        assert await service.search_icons("rocket") == [PLACEHOLDER_ICON_URL]
+        service.release_load.set()
+        await service.start_warm_up()
+        return await service.search_icons("rocket")
+
+    assert asyncio.run(run()) == ["/static/icons/bold/rocket-bold.svg"]
+    assert service.is_ready
+    assert service.load_calls == 1
+
+
+def test_warm_up_is_shared_by_concurrent_callers():
+    service = SlowLoadingIconFinderService()
+    service.release_load.set()
+
+    async def run():
+        return await asyncio.gather(
+            service.wait_until_ready(), service.wait_until_ready()
+        )
+
+    assert asyncio.run(run()) == [True, True]
+    assert service.load_calls == 1
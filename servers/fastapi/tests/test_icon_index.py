@@ -0,0 +1,85 @@
+import json
+import re
+
+import numpy as np
+
+from services.icon_index import IconVectorIndex, build_icon_index
+
+VOCABULARY = ["rocket", "space", "heart", "love", "house", "home", "chart", "growth"]
+
+
+def fake_embedding_function(texts):
+    # Bag-of-words vectors over a tiny vocabulary, enough for cosine ranking
+    vectors = []
+    for text in texts:
+        words = re.findall(r"[a-z]+", text.lower())
+        vectors.append(
+            np.array([float(words.count(word)) for word in VOCABULARY] + [0.01])
+        )
+    return vectors
+
+
+def build_index(tmp_path):
+    icons_json_path = tmp_path / "icons.json"
+    icons_json_path.write_text(
+        json.dumps(
+            {
+                "icons": [
+                    {"name": "rocket-bold", "tags": ["space", "launch"]},
+                    {"name": "rocket-light", "tags": ["space"]},
+                    {"name": "heart-bold", "tags": ["love", "health"]},
+                    {"name": "house-bold", "tags": ["home", "building"]},
+                    {"name": "chart-line-bold", "tags": ["growth", "building"]},
+                ]
+            }
+        )
+    )
+    calls = []
+
+    def embedding_function(texts):
+        calls.append(list(texts))
+        return fake_embedding_function(texts)
+
+    build_icon_index(
+        fake_embedding_function, str(icons_json_path), str(tmp_path / "index")
+    )
+    return IconVectorIndex.load(embedding_function, str(tmp_path / "index")), calls
+
+
+def test_index_contains_normalized_bold_icons_only(tmp_path):
+    index, _ = build_index(tmp_path)
+
+    assert index.names == ["rocket-bold", "heart-bold", "house-bold", "chart-line-bold"]
+    assert isinstance(index.matrix, np.memmap)
+    assert np.allclose(np.linalg.norm(index.matrix, axis=1), 1.0)
+
+
+def test_search_ranks_by_cosine_similarity(tmp_path):
+    index, _ = build_index(tmp_path)
+
+    results = index.search(["love story", "growth of sales", "space travel"], k=2)
+
+    assert results[0][0] == "heart-bold"
+    assert results[1][0] == "chart-line-bold"
+    assert results[2][0] == "rocket-bold"
+    assert all(len(each) == 2 for each in results)
+
+
+def test_exact_names_and_unique_tags_skip_embedding(tmp_path):
+    index, calls = build_index(tmp_path)
+
+    assert index.find_exact("Rocket") == "rocket-bold"
+    assert index.find_exact("chart line") == "chart-line-bold"
+    assert index.find_exact("home") == "house-bold"
+    # Shared tags are ambiguous and go through vector search
+    assert index.find_exact("building") is None
+    assert calls == []
+
+
+def test_query_embeddings_are_cached(tmp_path):
+    index, calls = build_index(tmp_path)
+
+    index.search(["love story"])
+    index.search(["Love Story", "space travel"])
+
+    assert calls == [["love story"], ["space travel"]]
@@ -0,0 +1,112 @@
+import asyncio
+import os
+
+from PIL import Image
+
+from models.sql.image_asset import ImageAsset
+from services.concurrent_service import CONCURRENT_SERVICE
+from services.image_derivatives_service import (
+    ImageDerivativesService,
+    build_image_derivatives,
+    resolve_image_variant,
+)
+
+
+def _save_image(path, size, mode="RGB"):
+    color = (200, 40, 40, 128) if mode == "RGBA" else (200, 40, 40)
+    Image.new(mode, size, color).save(path)
+    return str(path)
+
+
+def test_build_image_derivatives_creates_variants_and_placeholder(tmp_path):
+    image_path = _save_image(tmp_path / "photo.png", (2000, 1000))
+    manifest = build_image_derivatives(
+        image_path, image_path, str(tmp_path / "derivatives")
+    )
+
+    assert manifest["width"] == 2000 and manifest["height"] == 1000
+    assert {v["width"] for v in manifest["variants"]} == {320, 640, 1024, 1600}
+    assert {v["format"] for v in manifest["variants"]} == {"webp", "jpeg"}
+    assert manifest["placeholder"].startswith("data:image/webp;base64,")
+    for variant in manifest["variants"]:
+        with Image.open(variant["path"]) as image:
+            assert image.size == (variant["width"], variant["height"])
+    assert os.path.exists(tmp_path / "derivatives" / "manifest.json")
+
+
+def test_transparent_images_fall_back_to_png(tmp_path):
+    image_path = _save_image(tmp_path / "logo.png", (500, 500), mode="RGBA")
+    manifest = build_image_derivatives(
+        image_path, image_path, str(tmp_path / "derivatives")
+    )
+
+    assert {v["width"] for v in manifest["variants"]} == {320, 500}
+    assert {v["format"] for v in manifest["variants"]} == {"webp", "png"}
+
+
+def test_resolve_image_variant_picks_smallest_covering_variant(tmp_path):
+    image_path = _save_image(tmp_path / "photo.jpg", (2000, 1000))
+    manifest = build_image_derivatives(
+        image_path, image_path, str(tmp_path / "derivatives")
+    )
+
+    assert resolve_image_variant(manifest, "editor", 500).endswith("w640.webp")
+    assert resolve_image_variant(manifest, "pptx", 1000).endswith("w1024.jpg")
+    assert resolve_image_variant(manifest, "pptx", 1800) == image_path
+    assert resolve_image_variant(manifest, "editor", 1800) is None
+
+
+def test_attach_derivatives_records_manifest_in_extras(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    image_path = _save_image(tmp_path / "generated.png", (1024, 1024))
+    asset = ImageAsset(path=image_path, extras={"prompt": "sunset"})
+
+    service = ImageDerivativesService()
+    asyncio.run(service.attach_derivatives(asset))
+
+    assert asset.extras["prompt"] == "sunset"
+    assert asset.extras["derivatives"]["original"] == image_path
+    assert service.resolve(image_path, "pptx", 600).endswith("w640.jpg")
+    assert service.resolve("/missing.png", "pptx", 600) == "/missing.png"
+
+
+def test_variant_urls_list_served_variants_then_the_original(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    image_path = _save_image(tmp_path / "generated.jpg", (2000, 1000))
+    service = ImageDerivativesService()
+    asyncio.run(service.create_derivatives(image_path))
+
+    variants = service.get_variant_urls(image_path, "editor")
+
+    assert [variant["width"] for variant in variants] == [320, 640, 1024, 1600, 2000]
+    assert variants[0]["url"].startswith("/app_data/images/derivatives/")
+    assert variants[0]["url"].endswith("/w320.webp")
+    assert variants[-1]["url"] == image_path
+    assert service.get_variant_urls("/missing.png", "editor") == []
+
+
+def test_fetched_image_urls_get_derivatives_in_the_background(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    url = "https://images.example.com/photo.jpg"
+    known_url = "https://images.example.com/known.jpg"
+    service = ImageDerivativesService()
+    service._remember_manifest(known_url, {"original": known_url})
+    created = []
+
+    async def create_derivatives(source):
+        await asyncio.sleep(0.05)
+        created.append(source)
+
+    monkeypatch.setattr(service, "create_derivatives", create_derivatives)
+
+    async def run():
+        service.schedule_derivatives_for_urls(
+            [url, "/static/images/placeholder.jpg", url, known_url]
+        )
+        # Scheduling returns before anything is downloaded
+        scheduled = list(created)
+        await asyncio.gather(*CONCURRENT_SERVICE._background_tasks)
+        return scheduled
+
+    assert asyncio.run(run()) == []
+    assert created == [url]
@@ -0,0 +1,90 @@
+import asyncio
+
+from services.adaptive_image_service import AdaptiveImageService
+from services.image_source_classifier import (
+    ImageSourceClassifier,
+    compile_keyword_pattern,
+)
+
+
+def test_keywords_match_whole_words_and_inflections():
+    classifier = ImageSourceClassifier()
+
+    assert classifier.match_keywords("Sound waves in a pendulum clock") == [
+        "waves",
+        "pendulum",
+    ]
+    assert classifier.match_keywords("Measuring the pH of a solution") == [
+        "ph",
+        "solution",
+    ]
+    # Short keywords no longer match inside unrelated words
+    assert classifier.match_keywords("A photo of a nation at sunset") == []
+
+
+def test_russian_and_kazakh_prompts_match():
+    classifier = ImageSourceClassifier()
+
+    assert classifier.match_keywords("Строение клетки под микроскопом") == [
+        "клетки",
+        "микроскопом",
+    ]
+    assert classifier.match_keywords("Өсімдік жасушасының құрылымы") == [
+        "жасушасының",
+        "құрылымы",
+    ]
+
+
+def test_ambiguous_stems_match_only_their_word_forms():
+    classifier = ImageSourceClassifier()
+
+    assert classifier.match_keywords("сила трения и волны") == ["трения", "волны"]
+    assert classifier.match_keywords("у классной доски") == ["доски"]
+    assert classifier.match_keywords("тренировка по футболу") == []
+    assert classifier.match_keywords("классная вечеринка и тренер") == []
+    assert classifier.match_keywords("тренинг для команды, волнение") == []
+    assert classifier.match_keywords("a general flower in the basement") == []
+    assert classifier.match_keywords("gene flow between cells") == [
+        "gene",
+        "flow",
+        "cells",
+    ]
+
+
+def test_whole_words_do_not_match_longer_words():
+    pattern = compile_keyword_pattern(["pendulum"], ["flow"])
+
+    assert pattern.findall("flower pendulums flow") == ["pendulums", "flow"]
+
+
+def test_multi_word_keywords_allow_any_whitespace():
+    pattern = compile_keyword_pattern(["pie chart", "ion"])
+
+    assert pattern.findall("a pie\n chart and an ion") == ["pie\n chart", "ion"]
+
+
+def test_llm_decisions_are_cached_per_normalized_prompt(monkeypatch, tmp_path):
+    calls = []
+
+    class FakeLLMClient:
+        async def generate(self, model, messages, max_tokens):
+            calls.append(messages)
+            return '{"decision": "generate", "reason": "Fantasy scene"}'
+
+    monkeypatch.setattr("services.adaptive_image_service.LLMClient", FakeLLMClient)
+    monkeypatch.setattr("services.adaptive_image_service.get_model", lambda: "model")
+    monkeypatch.setattr(
+        "services.adaptive_image_service.IMAGE_SOURCE_CLASSIFIER",
+        ImageSourceClassifier(),
+    )
+    service = AdaptiveImageService(str(tmp_path))
+
+    async def run():
+        first = await service.decide_image_source("A dragon over a castle")
+        second = await service.decide_image_source("a dragon over a castle!")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second == ("generate", "Fantasy scene")
+    assert len(calls) == 1
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import time
+
+from PIL import Image
+
+from models.pptx_models import (
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services.image_transform_cache_service import IMAGE_TRANSFORM_CACHE_SERVICE
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+
+def get_pptx_model(image_path, n_slides=2, width=200):
+    return PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    PptxPictureBoxModel(
+                        position=PptxPositionModel(
+                            left=0, top=0, width=width, height=100
+                        ),
+                        border_radius=[8, 8, 8, 8],
+                        picture=PptxPictureModel(is_network=False, path=image_path),
+                    )
+                ]
+            )
+            for _ in range(n_slides)
+        ]
+    )
+
+
+def export(tmp_path, pptx_model):
+    pptx_creator = PptxPresentationCreator(pptx_model, str(tmp_path))
+    asyncio.run(pptx_creator.create_ppt())
+    pptx_creator.save(str(tmp_path / "out.pptx"))
+
+
+def count_transforms(monkeypatch):
+    calls = []
+    transform_picture = PptxPresentationCreator.transform_picture
+
+    def counting_transform_picture(self, image, picture_model):
+        calls.append(picture_model.position.width)
+        return transform_picture(self, image, picture_model)
+
+    monkeypatch.setattr(
+        PptxPresentationCreator, "transform_picture", counting_transform_picture
+    )
+    return calls
+
+
+def test_repeated_pictures_and_exports_are_transformed_once(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    image_path = str(tmp_path / "logo.png")
+    Image.new("RGB", (400, 300), "red").save(image_path)
+    calls = count_transforms(monkeypatch)
+
+    export(tmp_path, get_pptx_model(image_path))
+    export(tmp_path, get_pptx_model(image_path))
+    assert calls == [200]
+
+    # A different box size is a different transform
+    export(tmp_path, get_pptx_model(image_path, width=300))
+    assert calls == [200, 300]
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(
+        "services.image_transform_cache_service.EVICTION_GRACE_SECONDS", 0
+    )
+    image = Image.new("RGBA", (64, 64), "blue")
+    old_path = IMAGE_TRANSFORM_CACHE_SERVICE.put("old", image)
+    new_path = IMAGE_TRANSFORM_CACHE_SERVICE.put("new", image)
+    os.utime(old_path, (time.time() - 60, time.time() - 60))
+    monkeypatch.setenv(
+        "IMAGE_TRANSFORM_CACHE_MAX_BYTES", str(os.path.getsize(new_path))
+    )
+
+    IMAGE_TRANSFORM_CACHE_SERVICE.evict()
+
+    assert not os.path.exists(old_path)
+    assert IMAGE_TRANSFORM_CACHE_SERVICE.get("new") == new_path
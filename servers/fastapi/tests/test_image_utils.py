@@ -0,0 +1,55 @@
+import numpy as np
+from PIL import Image
+
+from utils.image_utils import (
+    create_circle_image,
+    invert_image,
+    round_image_corners,
+    set_image_opacity,
+)
+
+
+def get_image():
+    pixels = np.zeros((40, 60, 4), dtype=np.uint8)
+    pixels[..., 0] = 200
+    pixels[..., 1] = 100
+    pixels[..., 2] = 50
+    pixels[..., 3] = 255
+    pixels[0, 30, 3] = 0
+    return Image.fromarray(pixels, "RGBA")
+
+
+def test_round_image_corners_only_clears_alpha_outside_the_arcs():
+    image = get_image()
+
+    pixels = np.asarray(round_image_corners(image, [10, 0, 10, 5]))
+
+    assert pixels[0, 0, 3] == 0
+    assert pixels[0, 59, 3] == 255
+    assert pixels[39, 59, 3] == 0
+    assert pixels[39, 0, 3] == 0
+    assert pixels[20, 30, 3] == 255
+    assert (pixels[..., :3] == np.asarray(image)[..., :3]).all()
+
+
+def test_invert_image_zeroes_fully_transparent_pixels():
+    pixels = np.asarray(invert_image(get_image()))
+
+    assert tuple(pixels[5, 5]) == (55, 155, 205, 255)
+    assert tuple(pixels[0, 30]) == (0, 0, 0, 0)
+
+
+def test_create_circle_image_keeps_only_the_inscribed_circle():
+    pixels = np.asarray(create_circle_image(get_image()))
+
+    assert tuple(pixels[20, 30]) == (200, 100, 50, 255)
+    assert tuple(pixels[20, 2]) == (0, 0, 0, 0)
+
+
+def test_set_image_opacity_scales_alpha_and_accepts_rgb():
+    image = get_image().convert("RGB")
+
+    pixels = np.asarray(set_image_opacity(image, 0.5))
+
+    assert (pixels[..., 3] == 127).all()
+    assert (pixels[..., :3] == np.asarray(image)).all()
@@ -0,0 +1,175 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+from services.libreoffice_pool import (
+    LibreOfficeConversionError,
+    LibreOfficePool,
+    LibreOfficeWorker,
+)
+
+# Speaks the bridge protocol; "converting" copies the input, "slow" inputs
+# hang and "corrupt" ones fail
+FAKE_BRIDGE = """
+import json, shutil, sys, time
+print(json.dumps({"ok": True}), flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    if request["command"] == "convert":
+        if "slow" in request["input"]:
+            time.sleep(30)
+        if "corrupt" in request["input"]:
+            print(json.dumps({"ok": False, "error": "corrupt"}), flush=True)
+            continue
+        shutil.copy(request["input"], request["output"])
+    print(json.dumps({"ok": True}), flush=True)
+"""
+
+
+@pytest.fixture
+def pool(monkeypatch, tmp_path):
+    bridge_path = tmp_path / "bridge.py"
+    bridge_path.write_text(FAKE_BRIDGE)
+    monkeypatch.setattr(
+        LibreOfficeWorker,
+        "get_office_command",
+        lambda self: [sys.executable, "-c", "import time; time.sleep(60)"],
+    )
+    monkeypatch.setattr(
+        LibreOfficeWorker,
+        "get_bridge_command",
+        lambda self: [sys.executable, str(bridge_path)],
+    )
+    monkeypatch.setenv("LIBREOFFICE_WORKERS", "1")
+    monkeypatch.setenv("LIBREOFFICE_MAX_CONVERSIONS", "2")
+    monkeypatch.setenv("LIBREOFFICE_JOB_TIMEOUT", "1")
+    return LibreOfficePool()
+
+
+def get_pptx(tmp_path, name):
+    path = tmp_path / f"{name}.pptx"
+    path.write_text(name)
+    return str(path)
+
+
+def test_workers_are_reused_then_recycled(pool, tmp_path):
+    async def run():
+        bridge_pids = []
+        for _ in range(3):
+            pdf_path = await pool.convert(get_pptx(tmp_path, "deck"), str(tmp_path), {})
+            assert pdf_path == str(tmp_path / "deck.pdf")
+            bridge_pids.append(pool._workers[0].bridge.pid)
+        await pool.shutdown()
+        return bridge_pids
+
+    bridge_pids = asyncio.run(run())
+    assert bridge_pids[0] == bridge_pids[1] != bridge_pids[2]
+    assert pool.get_metrics()["completed"] == 3
+
+
+def test_queued_jobs_share_one_worker(pool, tmp_path):
+    async def run():
+        pdf_paths = await asyncio.gather(
+            *(
+                pool.convert(get_pptx(tmp_path, f"deck{i}"), str(tmp_path), {})
+                for i in range(2)
+            )
+        )
+        await pool.shutdown()
+        return pdf_paths
+
+    assert sorted(asyncio.run(run())) == [
+        str(tmp_path / "deck0.pdf"),
+        str(tmp_path / "deck1.pdf"),
+    ]
+
+
+def test_timed_out_worker_is_replaced(pool, tmp_path):
+    async def run():
+        with pytest.raises(Exception, match="timed out"):
+            await pool.convert(get_pptx(tmp_path, "slow"), str(tmp_path), {})
+        assert not pool._workers[0].is_alive
+        pdf_path = await pool.convert(get_pptx(tmp_path, "deck"), str(tmp_path), {})
+        await pool.shutdown()
+        return pdf_path
+
+    assert asyncio.run(run()) == str(tmp_path / "deck.pdf")
+    assert pool.get_metrics()["failed"] == 1
+
+
+def test_failed_conversion_keeps_its_worker(pool, tmp_path):
+    async def run():
+        with pytest.raises(LibreOfficeConversionError, match="corrupt"):
+            await pool.convert(get_pptx(tmp_path, "corrupt"), str(tmp_path), {})
+        bridge_pid = pool._workers[0].bridge.pid
+        pdf_path = await pool.convert(get_pptx(tmp_path, "deck"), str(tmp_path), {})
+        same_bridge = pool._workers[0].bridge.pid == bridge_pid
+        await pool.shutdown()
+        return pdf_path, same_bridge
+
+    pdf_path, same_bridge = asyncio.run(run())
+    assert pdf_path == str(tmp_path / "deck.pdf")
+    assert same_bridge
+    assert pool.get_metrics()["failed"] == 1
+
+
+def test_new_fonts_restart_workers(pool, tmp_path):
+    fonts_dir = str(tmp_path / "fonts")
+
+    async def run():
+        await pool.convert(get_pptx(tmp_path, "deck"), str(tmp_path), {})
+        first_pid = pool._workers[0].office.pid
+        await pool.convert(
+            get_pptx(tmp_path, "deck"), str(tmp_path), {"Inter Bold": "Inter"}
+        )
+        second_pid = pool._workers[0].office.pid
+        await pool.convert(get_pptx(tmp_path, "deck"), str(tmp_path), {}, [fonts_dir])
+        third_pid = pool._workers[0].office.pid
+        # Started with that font directory, so it isn't restarted for it again
+        await pool.convert(get_pptx(tmp_path, "deck"), str(tmp_path), {}, [fonts_dir])
+        fourth_pid = pool._workers[0].office.pid
+        with open(os.path.join(pool._workers[0].directory, "fonts.conf")) as f:
+            fonts_conf = f.read()
+        # The next job without uploaded fonts must not see that directory
+        await pool.convert(get_pptx(tmp_path, "deck"), str(tmp_path), {})
+        fifth_pid = pool._workers[0].office.pid
+        with open(os.path.join(pool._workers[0].directory, "fonts.conf")) as f:
+            next_fonts_conf = f.read()
+        await pool.shutdown()
+        return (
+            [first_pid, second_pid, third_pid, fourth_pid, fifth_pid],
+            fonts_conf,
+            next_fonts_conf,
+        )
+
+    pids, fonts_conf, next_fonts_conf = asyncio.run(run())
+    assert len(set(pids[:3])) == 3
+    assert pids[2] == pids[3] != pids[4]
+    assert f"<dir>{fonts_dir}</dir>" in fonts_conf
+    assert "<dir>" not in next_fonts_conf
+
+
+def test_workers_start_with_only_their_jobs_aliases(pool, tmp_path):
+    async def run():
+        await pool.convert(
+            get_pptx(tmp_path, "deck"), str(tmp_path), {"Inter Bold": "Inter"}
+        )
+        first_pid = pool._workers[0].office.pid
+        await pool.convert(
+            get_pptx(tmp_path, "deck"), str(tmp_path), {"Lato Light": "Lato"}
+        )
+        second_pid = pool._workers[0].office.pid
+        with open(os.path.join(pool._workers[0].directory, "fonts.conf")) as f:
+            fonts_conf = f.read()
+        # A job without aliases runs on the worker as it is
+        await pool.convert(get_pptx(tmp_path, "deck"), str(tmp_path), {})
+        third_pid = pool._workers[0].office.pid
+        await pool.shutdown()
+        return first_pid, second_pid, third_pid, fonts_conf
+
+    first_pid, second_pid, third_pid, fonts_conf = asyncio.run(run())
+    assert first_pid != second_pid == third_pid
+    assert "Lato Light" in fonts_conf
+    assert "Inter Bold" not in fonts_conf
@@ -0,0 +1,95 @@
+import asyncio
+import os
+
+from PIL import Image
+
+from services import pdf_rasterizer
+from services.pdf_rasterizer import PdfRasterizer
+
+
+def create_pdf(path, page_count):
+    pages = [
+        Image.new("RGB", (320, 180), (40 * index % 256, 80, 160))
+        for index in range(page_count)
+    ]
+    pages[0].save(path, "PDF", save_all=True, append_images=pages[1:])
+
+
+def test_render_all_returns_pages_in_order(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF_RASTER_WORKERS", "0")
+    pdf_path = str(tmp_path / "slides.pdf")
+    create_pdf(pdf_path, 6)
+
+    paths = asyncio.run(PdfRasterizer().render_all(pdf_path, str(tmp_path)))
+
+    assert [os.path.basename(path) for path in paths] == [
+        f"page_{page_number}.png" for page_number in range(1, 7)
+    ]
+    with Image.open(paths[0]) as image:
+        # 320x180 pt at 150 DPI
+        assert image.size == (667, 375)
+
+
+def test_in_process_renders_never_use_pdfium_concurrently(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF_RASTER_WORKERS", "0")
+    pdf_path = str(tmp_path / "slides.pdf")
+    create_pdf(pdf_path, 12)
+    open_documents = []
+    peak = []
+    PdfDocument = pdf_rasterizer.pypdfium2.PdfDocument
+
+    class TrackedPdfDocument(PdfDocument):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            open_documents.append(self)
+            peak.append(len(open_documents))
+
+        def close(self):
+            if self in open_documents:
+                open_documents.remove(self)
+            super().close()
+
+    monkeypatch.setattr(pdf_rasterizer.pypdfium2, "PdfDocument", TrackedPdfDocument)
+    rasterizer = PdfRasterizer()
+
+    async def run():
+        # Three chunks of pages plus page counts from concurrent requests
+        return await asyncio.gather(
+            rasterizer.render_all(pdf_path, str(tmp_path)),
+            *(
+                asyncio.to_thread(pdf_rasterizer.get_pdf_page_count, pdf_path)
+                for _ in range(4)
+            ),
+        )
+
+    paths, *page_counts = asyncio.run(run())
+
+    assert len(paths) == 12 and all(os.path.exists(path) for path in paths)
+    assert page_counts == [12] * 4
+    assert max(peak) == 1
+
+
+def test_lazy_pages_render_on_first_request(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF_RASTER_WORKERS", "0")
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    pdf_path = str(tmp_path / "slides.pdf")
+    create_pdf(pdf_path, 3)
+    rasterizer = PdfRasterizer()
+
+    async def inner():
+        document_id, page_count = await rasterizer.register(pdf_path)
+        directory = rasterizer.get_document_directory(document_id)
+        assert not os.path.exists(os.path.join(directory, "page_2.png"))
+        # Concurrent requests for one page share a single render
+        first, second = await asyncio.gather(
+            rasterizer.get_page(document_id, 2), rasterizer.get_page(document_id, 2)
+        )
+        missing = await rasterizer.get_page(document_id, page_count + 1)
+        unknown = await rasterizer.get_page("../etc", 1)
+        return document_id, page_count, first, second, missing, unknown
+
+    document_id, page_count, first, second, missing, unknown = asyncio.run(inner())
+    assert page_count == 3
+    assert first == second and os.path.getsize(first) > 0
+    assert missing is None and unknown is None
+    assert rasterizer.get_page_url(document_id, 2).endswith(f"/{document_id}/2")
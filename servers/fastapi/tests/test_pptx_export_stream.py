@@ -0,0 +1,32 @@
+import io
+
+from fastapi.testclient import TestClient
+from pptx import Presentation
+
+from api.main import app
+from utils.export_utils import get_content_disposition
+
+
+def test_export_pptx_streams_the_file(monkeypatch, tmp_path):
+    monkeypatch.setenv("PPTX_RENDER_WORKERS", "0")
+    monkeypatch.setattr(
+        "api.v1.ppt.endpoints.presentation.TEMP_FILE_SERVICE.create_temp_dir",
+        lambda: str(tmp_path),
+    )
+
+    response = TestClient(app).post(
+        "/api/v1/ppt/presentation/export/pptx?stream=true",
+        json={"name": "Physics 101", "slides": [{"shapes": []}, {"shapes": []}]},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(response.content))
+    assert 'filename="Physics 101.pptx"' in response.headers["content-disposition"]
+    assert len(Presentation(io.BytesIO(response.content)).slides) == 2
+
+
+def test_content_disposition_keeps_non_ascii_titles():
+    header = get_content_disposition("Физика.pptx")
+
+    assert 'filename="presentation.pptx"' in header
+    assert "filename*=UTF-8''%D0%A4%D0%B8%D0%B7%D0%B8%D0%BA%D0%B0.pptx" in header
@@ -0,0 +1,137 @@
+import asyncio
+import io
+
+import numpy as np
+from PIL import Image, ImageCms
+from pptx import Presentation
+
+from models.pptx_models import (
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+
+def get_picture(path, width=300, height=200):
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(left=0, top=0, width=width, height=height),
+        clip=False,
+        picture=PptxPictureModel(is_network=False, path=path),
+    )
+
+
+def export_pictures(tmp_path, pictures):
+    pptx_creator = PptxPresentationCreator(
+        PptxPresentationModel(slides=[PptxSlideModel(shapes=pictures)]),
+        str(tmp_path),
+    )
+    asyncio.run(pptx_creator.create_ppt())
+    pptx_creator.save(str(tmp_path / "out.pptx"))
+    slide = Presentation(str(tmp_path / "out.pptx")).slides[0]
+    return [shape.image for shape in slide.shapes]
+
+
+def test_large_opaque_pictures_are_downscaled_to_jpeg(monkeypatch, tmp_path):
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    monkeypatch.delenv("PPTX_PICTURE_DPI", raising=False)
+    pixels = np.random.default_rng(0).integers(0, 256, (1500, 2000, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(tmp_path / "photo.png")
+
+    (image,) = export_pictures(tmp_path, [get_picture(str(tmp_path / "photo.png"))])
+
+    assert image.content_type == "image/jpeg"
+    # 300x200 box at 192 dpi, aspect ratio kept
+    assert image.size == (600, 450)
+
+
+def test_transparent_pictures_stay_png(monkeypatch, tmp_path):
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    Image.new("RGBA", (1200, 800), (255, 0, 0, 128)).save(tmp_path / "logo.png")
+
+    (image,) = export_pictures(tmp_path, [get_picture(str(tmp_path / "logo.png"))])
+
+    assert image.content_type == "image/png"
+    assert image.size == (600, 400)
+
+
+def test_small_pictures_and_disabled_dpi_embed_originals(monkeypatch, tmp_path):
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    Image.new("RGB", (200, 100), "blue").save(tmp_path / "small.jpg")
+    Image.new("RGB", (2000, 1000), "blue").save(tmp_path / "large.jpg")
+    original = (tmp_path / "small.jpg").read_bytes()
+
+    (image,) = export_pictures(tmp_path, [get_picture(str(tmp_path / "small.jpg"))])
+    assert image.blob == original
+
+    monkeypatch.setenv("PPTX_PICTURE_DPI", "0")
+    (image,) = export_pictures(tmp_path, [get_picture(str(tmp_path / "large.jpg"))])
+    assert image.size == (2000, 1000)
+
+
+def test_pictures_are_prepared_once_in_parallel_before_assembly(monkeypatch, tmp_path):
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    monkeypatch.setenv("PPTX_PICTURE_WORKERS", "4")
+    Image.new("RGB", (1200, 800), "green").save(tmp_path / "photo.jpg")
+    prepared = []
+    prepare = PptxPresentationCreator._prepare_embedded_picture
+
+    def recording_prepare(self, picture_model, *args):
+        prepared.append(picture_model.position.width)
+        return prepare(self, picture_model, *args)
+
+    monkeypatch.setattr(
+        PptxPresentationCreator, "_prepare_embedded_picture", recording_prepare
+    )
+    path = str(tmp_path / "photo.jpg")
+    images = export_pictures(
+        tmp_path,
+        [
+            get_picture(path, 100, 50),
+            get_picture(path, 150, 50),
+            get_picture(path, 100, 50),
+        ],
+    )
+
+    assert sorted(prepared) == [100, 150]
+    assert [image.size for image in images] == [(200, 134), (300, 200), (200, 134)]
+
+
+def test_exif_orientation_is_applied_before_downscaling(monkeypatch, tmp_path):
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    monkeypatch.delenv("PPTX_PICTURE_DPI", raising=False)
+    # Stored landscape, red on top; Orientation=6 shows it rotated 90° clockwise
+    pixels = Image.new("RGB", (800, 400), "blue")
+    pixels.paste("red", (0, 0, 800, 200))
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    pixels.save(tmp_path / "phone.jpg", exif=exif)
+
+    (image,) = export_pictures(
+        tmp_path, [get_picture(str(tmp_path / "phone.jpg"), 100, 200)]
+    )
+
+    embedded = Image.open(io.BytesIO(image.blob))
+    assert embedded.size == (200, 400)
+    red, green, blue = embedded.getpixel((180, 200))
+    assert red > 200 and blue < 50
+
+
+def test_non_rgb_pictures_are_converted_to_srgb(monkeypatch, tmp_path):
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    monkeypatch.delenv("PPTX_PICTURE_DPI", raising=False)
+    lab_profile = ImageCms.ImageCmsProfile(ImageCms.createProfile("LAB"))
+    # sRGB red as L* 53, a* 80, b* 67, stored as L * 2.55 and a, b + 128
+    Image.new("LAB", (800, 400), (135, 208, 195)).save(
+        tmp_path / "print.tif", icc_profile=lab_profile.tobytes()
+    )
+
+    (image,) = export_pictures(tmp_path, [get_picture(str(tmp_path / "print.tif"))])
+
+    embedded = Image.open(io.BytesIO(image.blob))
+    assert embedded.format == "JPEG"
+    assert "icc_profile" not in embedded.info
+    red, green, blue = embedded.getpixel((100, 100))
+    assert red > 200 and green < 80 and blue < 80
@@ -0,0 +1,93 @@
+import asyncio
+import os
+
+from fastapi import HTTPException
+from pptx import Presentation
+import pytest
+
+from models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxFillModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services import pptx_render_pool
+from services.pptx_render_pool import PptxRenderPool, render_pptx
+
+
+def get_pptx_model():
+    return PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    PptxAutoShapeBoxModel(
+                        position=PptxPositionModel(
+                            left=20, top=20, width=200, height=100
+                        ),
+                        fill=PptxFillModel(color="336699", opacity=1.0),
+                    )
+                ]
+            )
+            for _ in range(2)
+        ]
+    )
+
+
+def render(monkeypatch, tmp_path, workers):
+    monkeypatch.setenv("PPTX_RENDER_WORKERS", str(workers))
+    pool = PptxRenderPool()
+    pptx_path = str(tmp_path / "out.pptx")
+    try:
+        path = asyncio.run(pool.render(get_pptx_model(), str(tmp_path), pptx_path))
+    finally:
+        pool.shutdown()
+    return pool, path
+
+
+def test_renders_in_process_when_pool_is_disabled(monkeypatch, tmp_path):
+    pool, path = render(monkeypatch, tmp_path, 0)
+
+    assert len(Presentation(path).slides) == 2
+    assert pool.get_metrics()["completed"] == 1
+    assert pool._executor is None
+
+
+def test_renders_in_worker_process(monkeypatch, tmp_path):
+    pool, path = render(monkeypatch, tmp_path, 1)
+
+    assert len(Presentation(path).slides) == 2
+    metrics = pool.get_metrics()
+    assert metrics["completed"] == 1
+    assert metrics["queued"] == 0 and metrics["running"] == 0
+
+
+def crash_first_render(ppt_model, temp_dir, path):
+    # Runs in a worker; the marker outlives the killed process
+    marker = os.path.join(temp_dir, "crashed")
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return render_pptx(ppt_model, temp_dir, path)
+
+
+def crash_every_render(ppt_model, temp_dir, path):
+    os._exit(1)
+
+
+def test_render_is_retried_once_on_a_fresh_pool(monkeypatch, tmp_path):
+    monkeypatch.setattr(pptx_render_pool, "render_pptx", crash_first_render)
+    pool, path = render(monkeypatch, tmp_path, 1)
+
+    assert len(Presentation(path).slides) == 2
+    assert pool.get_metrics()["completed"] == 1
+
+
+def test_export_fails_when_the_retry_breaks_too(monkeypatch, tmp_path):
+    # Rendering in this process would end the test run
+    monkeypatch.setattr(pptx_render_pool, "render_pptx", crash_every_render)
+
+    with pytest.raises(HTTPException) as error:
+        render(monkeypatch, tmp_path, 1)
+
+    assert error.value.status_code == 500
@@ -0,0 +1,47 @@
+import io
+import zipfile
+
+import pytest
+
+from api.v1.ppt.endpoints.pptx_slides import _extract_slides
+
+
+def get_slide_xml(typeface):
+    return (
+        '<p:sld xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+        'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+        f'<a:rPr><a:latin typeface="{typeface}"/></a:rPr></p:sld>'
+    )
+
+
+def get_pptx_content(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        for name, content in members.items():
+            zip_file.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_slides_are_read_in_numeric_order_with_their_fonts():
+    pptx_content = get_pptx_content(
+        {
+            "ppt/slides/slide10.xml": get_slide_xml("Montserrat Bold"),
+            "ppt/slides/slide2.xml": get_slide_xml("+mn-lt"),
+            "ppt/slides/slide1.xml": get_slide_xml("Open Sans"),
+            "ppt/slides/_rels/slide1.xml.rels": "<Relationships/>",
+            "ppt/media/image1.png": b"\x89PNG" + bytes(1024),
+        }
+    )
+
+    slides = _extract_slides(pptx_content)
+
+    assert slides.slide_count == 3
+    assert "Open Sans" in slides.slide_xmls[0]
+    assert "Montserrat Bold" in slides.slide_xmls[2]
+    assert slides.slide_fonts == [["Open Sans"], [], ["Montserrat Bold"]]
+    assert slides.get_raw_fonts() == ["Montserrat Bold", "Open Sans"]
+
+
+def test_package_without_slides_is_rejected():
+    with pytest.raises(Exception, match="No slides directory"):
+        _extract_slides(get_pptx_content({"ppt/presentation.xml": "<p/>"}))
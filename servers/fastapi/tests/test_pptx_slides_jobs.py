@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+from api.v1.ppt.endpoints.pptx_slides import stream_pptx_slides_job
+from services.pptx_slides_job_service import PptxSlidesJobService
+
+
+async def read_events(job_id):
+    response = await stream_pptx_slides_job(job_id)
+    events = []
+    async for chunk in response.body_iterator:
+        data = chunk.split("data: ", 1)[1]
+        events.append(json.loads(data))
+    return events
+
+
+def test_stream_replays_stages_then_result(monkeypatch):
+    service = PptxSlidesJobService()
+    monkeypatch.setattr(
+        "api.v1.ppt.endpoints.pptx_slides.PPTX_SLIDES_JOB_SERVICE", service
+    )
+
+    async def run(job):
+        for stage in ("extract", "convert", "rasterize", "font_analysis"):
+            job.set_stage(stage)
+            await asyncio.sleep(0.01)
+        return {"total_slides": 3}
+
+    async def inner():
+        job = service.start(run)
+        assert job.status == "queued"
+        # Subscribe late: stages already reported are replayed first
+        await asyncio.sleep(0.015)
+        return job, await read_events(job.id)
+
+    job, events = asyncio.run(inner())
+    assert [event.get("status") for event in events[:-1]] == [
+        "extract",
+        "convert",
+        "rasterize",
+        "font_analysis",
+    ]
+    assert events[-1] == {"type": "complete", "result": {"total_slides": 3}}
+    assert job.to_dict()["status"] == "completed"
+
+
+def test_failed_job_streams_error(monkeypatch):
+    service = PptxSlidesJobService()
+    monkeypatch.setattr(
+        "api.v1.ppt.endpoints.pptx_slides.PPTX_SLIDES_JOB_SERVICE", service
+    )
+
+    async def run(job):
+        job.set_stage("convert")
+        raise Exception("LibreOffice PDF conversion failed: boom")
+
+    async def inner():
+        job = service.start(run)
+        return await read_events(job.id)
+
+    events = asyncio.run(inner())
+    assert events[-1] == {
+        "type": "error",
+        "detail": "LibreOffice PDF conversion failed: boom",
+    }
+
+
+def test_semaphore_caps_concurrent_jobs(monkeypatch):
+    monkeypatch.setenv("PPTX_PROCESS_MAX_CONCURRENT", "2")
+    service = PptxSlidesJobService()
+    running = []
+    peak = []
+
+    async def run(job):
+        async with service.get_semaphore():
+            running.append(job.id)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(job.id)
+        return {}
+
+    async def inner():
+        jobs = [service.start(run) for _ in range(5)]
+        while not all(job.is_finished for job in jobs):
+            await asyncio.sleep(0.01)
+
+    asyncio.run(inner())
+    assert max(peak) == 2
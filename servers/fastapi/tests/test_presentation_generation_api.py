@@ -98,7 +98,7 @@ def patch_presentation_api(monkeypatch, mock_get_layout):
         patch('api.v1.ppt.endpoints.presentation.get_slide_content_from_type_and_outline', new_callable=AsyncMock, return_value={"mock": "slide_content"}),
         patch('api.v1.ppt.endpoints.presentation.process_slide_and_fetch_assets', new_callable=AsyncMock),
         patch('api.v1.ppt.endpoints.presentation.get_exports_directory', return_value='/tmp/exports'),
-        patch('api.v1.ppt.endpoints.presentation.PptxPresentationCreator'),
+        patch('api.v1.ppt.endpoints.presentation.PPTX_RENDER_POOL.render', new_callable=AsyncMock, return_value='/tmp/exports/mock.pptx'),
         patch('api.v1.ppt.endpoints.presentation.aiohttp.ClientSession', return_value=MockAiohttpSession()),
     ]
     mocks = [p.start() for p in patches]
@@ -108,11 +108,6 @@ def patch_presentation_api(monkeypatch, mock_get_layout):
     docs_loader.return_value.load_documents = AsyncMock()
     docs_loader.return_value.documents = []
 
-    # Setup PptxPresentationCreator mock for pptx test
-    pptx_creator = mocks[9]
-    pptx_creator.return_value.create_ppt = AsyncMock()
-    pptx_creator.return_value.save = MagicMock()
-
     yield
 
     for p in patches:
@@ -0,0 +1,89 @@
+import asyncio
+import os
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.remote_image_cache_service import RemoteImageCacheService
+
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + b"0" * 2048
+
+
+async def _run_with_server(callback):
+    requests = []
+
+    async def handle_image(request: web.Request):
+        requests.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(
+            body=IMAGE_BYTES, content_type="image/png", headers={"ETag": '"v1"'}
+        )
+
+    app = web.Application()
+    app.router.add_get("/image.png", handle_image)
+    app.router.add_get("/other.png", handle_image)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        return await callback(server, requests)
+    finally:
+        await server.close()
+
+
+def test_cached_image_is_revalidated_with_etag(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.setenv("REMOTE_IMAGE_CACHE_TTL", "0")
+
+    async def scenario(server, requests):
+        url = str(server.make_url("/image.png"))
+        service = RemoteImageCacheService()
+        [first] = await service.get_files([url], str(tmp_path / "fallback"))
+        [second] = await service.get_files([url], str(tmp_path / "fallback"))
+        return first, second, requests
+
+    first, second, requests = asyncio.run(_run_with_server(scenario))
+
+    assert first == second
+    with open(first, "rb") as f:
+        assert f.read() == IMAGE_BYTES
+    assert len(requests) == 2
+    assert "If-None-Match" not in requests[0]
+    assert requests[1]["If-None-Match"] == '"v1"'
+
+
+def test_fresh_entries_skip_network_and_survive_restart(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+
+    async def scenario(server, requests):
+        url = str(server.make_url("/image.png"))
+        await RemoteImageCacheService().get_files([url, url], str(tmp_path))
+        # A new instance reloads the index from disk
+        [path] = await RemoteImageCacheService().get_files([url], str(tmp_path))
+        return path, requests
+
+    path, requests = asyncio.run(_run_with_server(scenario))
+
+    assert os.path.exists(path)
+    assert len(requests) == 1
+
+
+def test_eviction_keeps_cache_under_size_cap(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    monkeypatch.setenv("REMOTE_IMAGE_CACHE_MAX_BYTES", str(len(IMAGE_BYTES)))
+
+    async def scenario(server, _):
+        service = RemoteImageCacheService()
+        urls = [str(server.make_url("/image.png")), str(server.make_url("/other.png"))]
+        paths = await service.get_files(urls, str(tmp_path))
+        # Pretend both entries were last used long ago
+        for metadata in service._get_index().values():
+            metadata["last_used_at"] = 0
+        service._get_index()[service.get_key(urls[1])]["last_used_at"] = 1
+        service.evict()
+        return paths
+
+    first, second = asyncio.run(_run_with_server(scenario))
+
+    assert not os.path.exists(first)
+    assert os.path.exists(second)
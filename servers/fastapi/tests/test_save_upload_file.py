@@ -0,0 +1,39 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from utils import file_utils
+from utils.file_utils import save_upload_file
+
+
+def test_upload_is_copied_in_chunks_and_hashed(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_utils, "UPLOAD_CHUNK_SIZE", 1024)
+    content = os.urandom(10 * 1024 + 17)
+    path = str(tmp_path / "deck.pptx")
+
+    saved = asyncio.run(
+        save_upload_file(UploadFile(io.BytesIO(content), filename="deck.pptx"), path)
+    )
+
+    assert saved.size == len(content)
+    assert saved.sha256 == hashlib.sha256(content).hexdigest()
+    with open(path, "rb") as f:
+        assert f.read() == content
+
+
+def test_oversized_upload_is_rejected_while_streaming(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_utils, "UPLOAD_CHUNK_SIZE", 1024)
+    upload = UploadFile(io.BytesIO(bytes(4 * 1024)), filename="big.pdf")
+    path = str(tmp_path / "big.pdf")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(save_upload_file(upload, path, max_size=2 * 1024))
+
+    assert error.value.status_code == 400
+    assert not os.path.exists(path)
+    # Stopped at the first chunk over the limit
+    assert upload.file.tell() == 3 * 1024
@@ -17,3 +17,49 @@ def get_uploads_directory():
     uploads_directory = os.path.join(get_app_data_directory_env(), "uploads")
     os.makedirs(uploads_directory, exist_ok=True)
     return uploads_directory
+
+
+def get_image_derivatives_directory():
+    derivatives_directory = os.path.join(get_images_directory(), "derivatives")
+    os.makedirs(derivatives_directory, exist_ok=True)
+    return derivatives_directory
+
+
+def get_remote_images_cache_directory():
+    cache_directory = os.path.join(
+        get_app_data_directory_env(), "cache", "remote_images"
+    )
+    os.makedirs(cache_directory, exist_ok=True)
+    return cache_directory
+
+
+def get_image_transforms_cache_directory():
+    cache_directory = os.path.join(
+        get_app_data_directory_env(), "cache", "image_transforms"
+    )
+    os.makedirs(cache_directory, exist_ok=True)
+    return cache_directory
+
+
+def get_exports_cache_directory():
+    cache_directory = os.path.join(get_app_data_directory_env(), "cache", "exports")
+    os.makedirs(cache_directory, exist_ok=True)
+    return cache_directory
+
+
+def get_pdf_pages_cache_directory():
+    cache_directory = os.path.join(get_app_data_directory_env(), "cache", "pdf_pages")
+    os.makedirs(cache_directory, exist_ok=True)
+    return cache_directory
+
+
+def get_google_fonts_cache_path():
+    cache_directory = os.path.join(get_app_data_directory_env(), "cache")
+    os.makedirs(cache_directory, exist_ok=True)
+    return os.path.join(cache_directory, "google_fonts.json")
+
+
+def get_font_store_directory():
+    store_directory = os.path.join(get_app_data_directory_env(), "cache", "font_store")
+    os.makedirs(store_directory, exist_ok=True)
+    return store_directory
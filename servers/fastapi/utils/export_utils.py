@@ -1,20 +1,46 @@
 import json
 import os
 import aiohttp
-from typing import Literal
+from typing import Iterator, Literal, Optional
+from urllib.parse import quote
 import uuid
 from fastapi import HTTPException
 from pathvalidate import sanitize_filename
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.pptx_models import PptxPresentationModel
 from models.presentation_and_path import PresentationAndPath
-from services.pptx_presentation_creator import PptxPresentationCreator
+from models.sql.presentation import PresentationModel
+from services.export_cache_service import EXPORT_CACHE_SERVICE
+from services.pptx_render_pool import PPTX_RENDER_POOL
 from services.temp_file_service import TEMP_FILE_SERVICE
 from utils.asset_directory_utils import get_exports_directory
 import uuid
 
+PPTX_MEDIA_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+STREAM_CHUNK_SIZE = 256 * 1024
 
-async def export_presentation(
+
+def get_content_disposition(filename: str) -> str:
+    # Plain ASCII fallback plus the RFC 5987 form for non-Latin titles
+    stem, extension = os.path.splitext(filename)
+    ascii_stem = stem.encode("ascii", "ignore").decode().replace('"', "").strip()
+    ascii_filename = f"{ascii_stem or 'presentation'}{extension}"
+    return (
+        f'attachment; filename="{ascii_filename}"; '
+        f"filename*=UTF-8''{quote(filename)}"
+    )
+
+
+def iterate_in_chunks(content: bytes) -> Iterator[bytes]:
+    view = memoryview(content)
+    for start in range(0, len(view), STREAM_CHUNK_SIZE):
+        yield view[start : start + STREAM_CHUNK_SIZE]
+
+
+async def render_presentation(
     presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
 ) -> PresentationAndPath:
     if export_as == "pptx":
@@ -36,15 +62,13 @@ async def export_presentation(
         # Create PPTX file using the converted model
         pptx_model = PptxPresentationModel(**pptx_model_data)
         temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-        await pptx_creator.create_ppt()
 
         export_directory = get_exports_directory()
         pptx_path = os.path.join(
             export_directory,
             f"{sanitize_filename(title or str(uuid.uuid4()))}.pptx",
         )
-        pptx_creator.save(pptx_path)
+        await PPTX_RENDER_POOL.render(pptx_model, temp_dir, pptx_path)
 
         return PresentationAndPath(
             presentation_id=presentation_id,
@@ -65,3 +89,44 @@ async def export_presentation(
             presentation_id=presentation_id,
             path=response_json["path"],
         )
+
+
+async def export_presentation(
+    presentation_id: uuid.UUID,
+    title: str,
+    export_as: Literal["pptx", "pdf"],
+    sql_session: Optional[AsyncSession] = None,
+) -> PresentationAndPath:
+    """
+    Exports the presentation, reusing the last artifact of the same revision.
+    Without a session the revision can't be read, so it always renders.
+    """
+    presentation = (
+        await sql_session.get(PresentationModel, presentation_id)
+        if sql_session and EXPORT_CACHE_SERVICE.is_enabled()
+        else None
+    )
+    if not presentation:
+        return await render_presentation(presentation_id, title, export_as)
+
+    key = await EXPORT_CACHE_SERVICE.get_key(sql_session, presentation, export_as)
+    destination = os.path.join(
+        get_exports_directory(),
+        f"{sanitize_filename(title or str(uuid.uuid4()))}.{export_as}",
+    )
+    cached_path = EXPORT_CACHE_SERVICE.get(
+        presentation_id, key, export_as, destination
+    )
+    if cached_path:
+        return PresentationAndPath(presentation_id=presentation_id, path=cached_path)
+
+    presentation_and_path = await render_presentation(
+        presentation_id, title, export_as
+    )
+    try:
+        EXPORT_CACHE_SERVICE.put(
+            presentation_id, key, export_as, presentation_and_path.path
+        )
+    except OSError as e:
+        print(f"Failed to cache export of presentation {presentation_id}: {e}")
+    return presentation_and_path
@@ -1,8 +1,14 @@
+import asyncio
+import hashlib
 import os
-from typing import BinaryIO
+from typing import BinaryIO, Optional
 import uuid
 
-from fastapi import UploadFile
+from fastapi import HTTPException, UploadFile
+
+from models.saved_upload_file import SavedUploadFile
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 def replace_file_name(filename: str, new_stem: str) -> str:
@@ -42,3 +48,32 @@ def set_file_ext(file_path: str, ext: str) -> str:
     if get_file_ext_or_none(file_path):
         return f"{os.path.splitext(file_path)[0]}{ext}"
     return f"{file_path}{ext}"
+
+
+async def save_upload_file(
+    file: UploadFile, path: str, max_size: Optional[int] = None
+) -> SavedUploadFile:
+    """
+    Copies an upload to `path` one chunk at a time, hashing it on the way.
+    Disk writes run in a thread; `max_size` is in bytes and enforced while
+    copying, so an oversized upload is never held in memory or left on disk.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    f = await asyncio.to_thread(open, path, "wb")
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if max_size is not None and size > max_size:
+                raise HTTPException(
+                    400,
+                    detail=f"File '{file.filename}' exceeded max upload size of {max_size // (1024 * 1024)} MB",
+                )
+            digest.update(chunk)
+            await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        os.remove(path)
+        raise
+    await asyncio.to_thread(f.close)
+    return SavedUploadFile(path=path, size=size, sha256=digest.hexdigest())
@@ -109,6 +109,10 @@ def get_comfyui_workflow_env():
     return os.getenv("COMFYUI_WORKFLOW")
 
 
+def get_comfyui_max_pending_env():
+    return os.getenv("COMFYUI_MAX_PENDING")
+
+
 # Dalle 3 Quality
 def get_dall_e_3_quality_env():
     return os.getenv("DALL_E_3_QUALITY")
@@ -123,3 +127,87 @@ def get_gpt_image_1_5_quality_env():
 def get_unsplash_api_key_env():
     # Support both naming conventions used in different setups/docs.
     return os.getenv("UNSPLASH_API_KEY") or os.getenv("UNSPLASH_ACCESS_KEY")
+
+
+def get_disable_image_derivatives_env():
+    return os.getenv("DISABLE_IMAGE_DERIVATIVES")
+
+
+def get_image_derivatives_workers_env():
+    return os.getenv("IMAGE_DERIVATIVES_WORKERS")
+
+
+def get_remote_image_cache_max_bytes_env():
+    return os.getenv("REMOTE_IMAGE_CACHE_MAX_BYTES")
+
+
+def get_remote_image_cache_ttl_env():
+    return os.getenv("REMOTE_IMAGE_CACHE_TTL")
+
+
+def get_remote_image_cache_per_host_env():
+    return os.getenv("REMOTE_IMAGE_CACHE_PER_HOST")
+
+
+def get_pptx_render_workers_env():
+    return os.getenv("PPTX_RENDER_WORKERS")
+
+
+def get_image_transform_cache_max_bytes_env():
+    return os.getenv("IMAGE_TRANSFORM_CACHE_MAX_BYTES")
+
+
+def get_pptx_picture_dpi_env():
+    return os.getenv("PPTX_PICTURE_DPI")
+
+
+def get_pptx_picture_workers_env():
+    return os.getenv("PPTX_PICTURE_WORKERS")
+
+
+def get_export_cache_disabled_env():
+    return os.getenv("EXPORT_CACHE_DISABLED")
+
+
+def get_libreoffice_workers_env():
+    return os.getenv("LIBREOFFICE_WORKERS")
+
+
+def get_libreoffice_max_conversions_env():
+    return os.getenv("LIBREOFFICE_MAX_CONVERSIONS")
+
+
+def get_libreoffice_job_timeout_env():
+    return os.getenv("LIBREOFFICE_JOB_TIMEOUT")
+
+
+def get_libreoffice_python_env():
+    return os.getenv("LIBREOFFICE_PYTHON")
+
+
+def get_pptx_process_max_concurrent_env():
+    return os.getenv("PPTX_PROCESS_MAX_CONCURRENT")
+
+
+def get_pdf_raster_workers_env():
+    return os.getenv("PDF_RASTER_WORKERS")
+
+
+def get_pdf_pages_cache_max_bytes_env():
+    return os.getenv("PDF_PAGES_CACHE_MAX_BYTES")
+
+
+def get_google_fonts_index_ttl_env():
+    return os.getenv("GOOGLE_FONTS_INDEX_TTL")
+
+
+def get_google_fonts_index_refresh_disabled_env():
+    return os.getenv("GOOGLE_FONTS_INDEX_REFRESH_DISABLED")
+
+
+def get_document_parse_workers_env():
+    return os.getenv("DOCUMENT_PARSE_WORKERS")
+
+
+def get_document_parse_timeout_env():
+    return os.getenv("DOCUMENT_PARSE_TIMEOUT")
@@ -1,6 +1,9 @@
-from typing import List
+from functools import lru_cache
+import io
+from typing import List, Tuple
 
-from PIL import Image, ImageDraw
+import numpy as np
+from PIL import Image, ImageChops, ImageCms, ImageDraw
 
 from models.pptx_models import PptxObjectFitEnum, PptxObjectFitModel
 
@@ -46,6 +49,20 @@ def clip_image(
     return clipped_image
 
 
+@lru_cache(maxsize=64)
+def _get_corner_masks(radius: int) -> Tuple[Image.Image, ...]:
+    """Quarter-circle masks (top-left, top-right, bottom-right, bottom-left)."""
+    circle = Image.new("L", (radius * 2, radius * 2), 0)
+    draw = ImageDraw.Draw(circle)
+    draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
+    return (
+        circle.crop((0, 0, radius, radius)),
+        circle.crop((radius, 0, radius * 2, radius)),
+        circle.crop((radius, radius, radius * 2, radius * 2)),
+        circle.crop((0, radius, radius, radius * 2)),
+    )
+
+
 def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
     if len(radii) != 4:
         raise ValueError(
@@ -62,80 +79,60 @@ def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
     if image.mode != "RGBA":
         image = image.convert("RGBA")
 
-    # Create a mask for the rounded corners (start with fully transparent)
-    rounded_mask = Image.new("L", image.size, 0)
-
-    # Create a rectangular mask (fully opaque)
-    rectangular_mask = Image.new("L", image.size, 255)
-
-    # Process each corner
+    # Only the corner squares change; the binary quarter-circle masks are
+    # applied to the alpha channel there and everything else is copied as is
+    alpha = image.getchannel("A")
     for i, radius in enumerate(clamped_radii):
-        if radius > 0:  # Only process if radius is positive
-            # Create a circle for this radius
-            circle = Image.new("L", (radius * 2, radius * 2), 0)
-            draw = ImageDraw.Draw(circle)
-            draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
-
-            # Calculate position based on corner index
-            if i == 0:  # top-left
-                rounded_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
-                rectangular_mask.paste(0, (0, 0, radius, radius))
-            elif i == 1:  # top-right
-                rounded_mask.paste(
-                    circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
-                )
-                rectangular_mask.paste(0, (w - radius, 0, w, radius))
-            elif i == 2:  # bottom-right
-                rounded_mask.paste(
-                    circle.crop((radius, radius, radius * 2, radius * 2)),
-                    (w - radius, h - radius),
-                )
-                rectangular_mask.paste(0, (w - radius, h - radius, w, h))
-            else:  # bottom-left
-                rounded_mask.paste(
-                    circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
-                )
-                rectangular_mask.paste(0, (0, h - radius, radius, h))
-
-    # Get the original alpha channel
-    original_alpha = image.getchannel("A")
-
-    # Combine the rectangular mask with the rounded corners
-    corner_mask = Image.composite(rounded_mask, rectangular_mask, rounded_mask)
-
-    # Combine the corner mask with the original alpha channel
-    final_alpha = Image.composite(
-        original_alpha, Image.new("L", image.size, 0), corner_mask
-    )
-
-    # Create a new image with the modified alpha channel
-    result = Image.new("RGBA", image.size)
-    result.paste(image.convert("RGB"), (0, 0))
-    result.putalpha(final_alpha)
+        if radius <= 0:
+            continue
+        left = 0 if i in (0, 3) else w - radius
+        top = 0 if i in (0, 1) else h - radius
+        box = (left, top, left + radius, top + radius)
+        alpha.paste(
+            ImageChops.darker(alpha.crop(box), _get_corner_masks(radius)[i]), box
+        )
 
+    result = image.copy()
+    result.putalpha(alpha)
     return result
 
 
+def convert_to_srgb(image: Image.Image) -> Image.Image:
+    """
+    Converts CMYK, LAB or grayscale pixels to sRGB through their ICC profile,
+    which is dropped; it would be misread on RGB output. RGB images keep theirs.
+    """
+    icc_profile = image.info.get("icc_profile")
+    if not icc_profile or image.mode in ("RGB", "RGBA"):
+        return image
+    if image.mode == "P":
+        # Palette entries are already RGB
+        return image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    output_mode = "RGBA" if "A" in image.getbands() else "RGB"
+    try:
+        converted = ImageCms.profileToProfile(
+            image,
+            ImageCms.ImageCmsProfile(io.BytesIO(icc_profile)),
+            ImageCms.createProfile("sRGB"),
+            outputMode=output_mode,
+        )
+    except (ImageCms.PyCMSError, OSError) as e:
+        print(f"Could not apply the ICC profile of an {image.mode} image: {e}")
+        converted = image.convert(output_mode)
+    converted.info.pop("icc_profile", None)
+    return converted
+
+
 def invert_image(img: Image.Image) -> Image.Image:
-    # Get image data
-    data = img.getdata()
-
-    # Process each pixel
-    new_data = []
-    for item in data:
-        # Get current pixel values
-        r, g, b, a = item
-
-        # Invert RGB values while preserving transparency
-        if a != 0:  # Skip fully transparent pixels
-            new_data.append((255 - r, 255 - g, 255 - b, a))
-        else:
-            new_data.append((0, 0, 0, 0))
+    pixels = np.array(img.convert("RGBA"))
+
+    # Invert RGB values while preserving transparency
+    pixels[..., :3] = 255 - pixels[..., :3]
+    # Fully transparent pixels become (0, 0, 0, 0)
+    pixels[pixels[..., 3] == 0] = 0
 
-    # Create new image with modified data
-    new_img = Image.new("RGBA", img.size)
-    new_img.putdata(new_data)
-    return new_img
+    return Image.fromarray(pixels, "RGBA")
 
 
 def create_circle_image(
@@ -147,8 +144,7 @@ def create_circle_image(
     size = img.size
     # Use the smaller dimension for the circle
     circle_size = min(size)
-    # Create a transparent image of the same size as original
-    mask = Image.new("RGBA", size, color=(0, 0, 0, 0))
+    mask = Image.new("L", size, 0)
     draw = ImageDraw.Draw(mask)
 
     # Calculate center position
@@ -164,11 +160,12 @@ def create_circle_image(
             center_x + radius,
             center_y + radius,
         ),
-        fill=(255, 255, 255, 255),
+        fill=255,
     )
 
-    # Apply the circular mask
-    result = Image.composite(img, mask, mask)
+    # Copy the circle onto a transparent image; the mask is binary
+    result = Image.new("RGBA", size, (0, 0, 0, 0))
+    result.paste(img, (0, 0), mask)
     return result
 
 
@@ -180,15 +177,12 @@ def set_image_opacity(image: Image.Image, opacity: float) -> Image.Image:
     if image.mode != "RGBA":
         image = image.convert("RGBA")
 
-    # Get the original alpha channel
-    original_alpha = image.getchannel("A")
-
-    # Create new alpha channel with adjusted opacity
-    new_alpha = original_alpha.point(lambda x: int(x * opacity))
+    # Scale the alpha channel through a lookup table
+    new_alpha = image.getchannel("A").point(
+        [int(x * opacity) for x in range(256)]
+    )
 
-    # Create new image with modified alpha channel
-    result = Image.new("RGBA", image.size)
-    result.paste(image.convert("RGB"), (0, 0))
+    result = image.copy()
     result.putalpha(new_alpha)
 
     return result
@@ -5,6 +5,7 @@ from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
 from models.sql.slide import SlideModel
 from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.image_derivatives_service import IMAGE_DERIVATIVES_SERVICE
 from services.image_generation_service import ImageGenerationService
 from utils.asset_directory_utils import get_images_directory
 from utils.dict_utils import get_dict_at_path, get_dict_paths_with_key, set_dict_at_path
@@ -43,6 +44,7 @@ async def process_slide_and_fetch_assets(
     results.reverse()
 
     return_assets = []
+    fetched_image_urls = []
     for image_path in image_paths:
         image_dict = get_dict_at_path(slide.content, image_path)
         result = results.pop()
@@ -53,6 +55,7 @@ async def process_slide_and_fetch_assets(
             image_dict["__image_url__"] = result.path
         else:
             image_dict["__image_url__"] = result
+            fetched_image_urls.append(result)
         set_dict_at_path(slide.content, image_path, image_dict)
 
     for icon_path in icon_paths:
@@ -65,6 +68,11 @@ async def process_slide_and_fetch_assets(
             icon_dict["__icon_url__"] = "/static/icons/placeholder.svg"
         set_dict_at_path(slide.content, icon_path, icon_dict)
 
+    # Resized variants and blur placeholders are recorded in each asset's
+    # extras; fetched images only get their manifest on disk, in the background
+    IMAGE_DERIVATIVES_SERVICE.schedule_derivatives_for_urls(fetched_image_urls)
+    await IMAGE_DERIVATIVES_SERVICE.attach_derivatives_to_assets(return_assets)
+
     return return_assets
 
 
@@ -159,6 +167,7 @@ async def process_old_and_new_slides_and_fetch_assets(
 
     # list of new assets
     new_assets = []
+    fetched_image_urls = []
 
     # Sets new image and icon urls for assets that were fetched
     for i, new_image in enumerate(new_images):
@@ -171,6 +180,7 @@ async def process_old_and_new_slides_and_fetch_assets(
                 image_url = fetched_image.path
             else:
                 image_url = fetched_image
+                fetched_image_urls.append(image_url)
             new_image_dicts[i]["__image_url__"] = image_url
 
     for i, new_icon in enumerate(new_icons):
@@ -188,6 +198,9 @@ async def process_old_and_new_slides_and_fetch_assets(
     for i, new_icon_dict in enumerate(new_icon_dicts):
         set_dict_at_path(new_slide_content, new_icon_dict_paths[i], new_icon_dict)
 
+    IMAGE_DERIVATIVES_SERVICE.schedule_derivatives_for_urls(fetched_image_urls)
+    await IMAGE_DERIVATIVES_SERVICE.attach_derivatives_to_assets(new_assets)
+
     return new_assets
 
 
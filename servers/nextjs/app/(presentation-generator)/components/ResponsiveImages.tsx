@@ -0,0 +1,134 @@
+"use client";
+
+import React, { ReactNode, useLayoutEffect, useRef } from "react";
+import { ImagesApi } from "../services/api/images";
+import { ImageVariant } from "../services/api/types";
+
+type ImageConsumer = "editor" | "pdf";
+
+// The backend accepts this many sources per request
+const MAX_SOURCES_PER_REQUEST = 100;
+
+// Variants by consumer and source, shared by every slide view; null if none
+const variantsCache = new Map<string, ImageVariant[] | null>();
+
+function getCacheKey(consumer: ImageConsumer, src: string): string {
+  return `${consumer} ${src}`;
+}
+
+function isVariantSource(src: string | null | undefined): src is string {
+  return !!src && !src.startsWith("data:") && !src.startsWith("/static/");
+}
+
+function getImageSource(img: HTMLImageElement): string | null {
+  const src = img.getAttribute("src");
+  return isVariantSource(src) ? src : null;
+}
+
+/** Every __image_url__ in slide content, for `prefetchImageDerivatives`. */
+export function getSlideImageSources(data: any): string[] {
+  if (!data || typeof data !== "object") return [];
+  const sources: string[] = [];
+  if (typeof data.__image_url__ === "string") sources.push(data.__image_url__);
+  Object.values(data).forEach((value) => {
+    sources.push(...getSlideImageSources(value));
+  });
+  return sources;
+}
+
+/**
+ * Loads the variants of `sources` into the cache. Images rendered after it
+ * resolves get their srcset before the browser picks what to download.
+ */
+export async function prefetchImageDerivatives(
+  sources: string[],
+  consumer: ImageConsumer
+): Promise<void> {
+  const missing = Array.from(new Set(sources)).filter(
+    (src) => isVariantSource(src) && !variantsCache.has(getCacheKey(consumer, src))
+  );
+  for (let start = 0; start < missing.length; start += MAX_SOURCES_PER_REQUEST) {
+    const chunk = missing.slice(start, start + MAX_SOURCES_PER_REQUEST);
+    const derivatives = await ImagesApi.getImageDerivatives(chunk, consumer);
+    chunk.forEach((src) => {
+      variantsCache.set(getCacheKey(consumer, src), derivatives[src] ?? null);
+    });
+  }
+}
+
+function applyVariants(img: HTMLImageElement, src: string, variants: ImageVariant[]) {
+  // Layout width at the slide's own size, so zooming or scaling the slide
+  // view never needs a larger variant than the one picked
+  if (img.offsetWidth > 0) img.sizes = `${img.offsetWidth}px`;
+  img.srcset = variants
+    .map((variant) => `${variant.url} ${variant.width}w`)
+    .join(", ");
+  img.dataset.variantsFor = src;
+}
+
+/**
+ * Gives slide images a srcset of their resized variants, so the browser loads
+ * the smallest one covering the rendered size instead of the original.
+ * `src` is left as is, so code matching images to slide data by URL still works.
+ */
+export default function ResponsiveImages({
+  children,
+  slideData,
+  consumer = "editor",
+}: {
+  children: ReactNode;
+  slideData: any;
+  consumer?: ImageConsumer;
+}) {
+  const containerRef = useRef<HTMLDivElement>(null);
+
+  // A layout effect runs before the browser selects the image source to load
+  useLayoutEffect(() => {
+    const container = containerRef.current;
+    if (!container) return;
+
+    const pending: HTMLImageElement[] = [];
+    container.querySelectorAll("img").forEach((img) => {
+      const src = getImageSource(img);
+      // A replaced image must not keep the previous image's variants
+      if (img.dataset.variantsFor && img.dataset.variantsFor !== src) {
+        img.removeAttribute("srcset");
+        img.removeAttribute("sizes");
+        delete img.dataset.variantsFor;
+      }
+      if (!src || img.dataset.variantsFor) return;
+      const key = getCacheKey(consumer, src);
+      if (!variantsCache.has(key)) {
+        pending.push(img);
+        return;
+      }
+      const variants = variantsCache.get(key);
+      if (variants) applyVariants(img, src, variants);
+    });
+    if (pending.length === 0) return;
+
+    let cancelled = false;
+    prefetchImageDerivatives(
+      pending.map((img) => getImageSource(img)!),
+      consumer
+    )
+      .then(() => {
+        if (cancelled) return;
+        pending.forEach((img) => {
+          const src = getImageSource(img);
+          if (!src || !img.isConnected) return;
+          const variants = variantsCache.get(getCacheKey(consumer, src));
+          if (variants) applyVariants(img, src, variants);
+        });
+      })
+      .catch(() => {
+        // The originals keep loading from src
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [slideData, consumer]);
+
+  return <div ref={containerRef}>{children}</div>;
+}
@@ -10,6 +10,7 @@ import { updateSlideContent } from "../../../store/slices/presentationGeneration
 import { updateTextStyle } from "../../../store/slices/presentationGeneration";
 import { Loader2 } from "lucide-react";
 import TextStyleReplacer from "../components/TextStyleReplacer";
+import ResponsiveImages from "../components/ResponsiveImages";
 
 export const useTemplateLayouts = () => {
   const dispatch = useDispatch();
@@ -30,7 +31,11 @@ export const useTemplateLayouts = () => {
 
   // Render slide content with group validation, automatic Tiptap text editing, and editable images/icons
   const renderSlideContent = useMemo(() => {
-    return (slide: any, isEditMode: boolean) => {
+    return (
+      slide: any,
+      isEditMode: boolean,
+      imageConsumer: "editor" | "pdf" = "editor"
+    ) => {
 
       const Layout = getTemplateLayout(slide.layout, slide.layout_group);
       if (loading) {
@@ -72,67 +77,71 @@ export const useTemplateLayouts = () => {
 
       if (isEditMode) {
         return (
-          <EditableLayoutWrapper
-            slideIndex={slide.index}
-            slideData={slide.content}
-            properties={slide.properties}
-          >
-            <TextStyleReplacer slideData={slide.content} properties={slide.properties}>
-              <LatexTextReplacer slideData={slide.content}>
-                <TiptapTextReplacer
-                  key={slide.id}
-                  slideData={slide.content}
-                  slideIndex={slide.index}
-                  properties={slide.properties}
-                  onContentChange={(
-                    content: string,
-                    dataPath: string,
-                    slideIndex?: number
-                  ) => {
-                    if (dataPath && slideIndex !== undefined) {
-                      dispatch(
-                        updateSlideContent({
-                          slideIndex: slideIndex,
-                          dataPath: dataPath,
-                          content: content,
-                        })
-                      );
-                    }
-                  }}
-                  onTextStyleChange={(dataPath, style, slideIndex) => {
-                    if (!dataPath || slideIndex === undefined) return;
-                    dispatch(updateTextStyle({ slideIndex, dataPath, style }));
-                  }}
-                >
-                  <SlideErrorBoundary label={`Slide ${slide.index + 1}`}>
-                    {(Layout as any)
-                      ? React.createElement(Layout as any, {
-                          data: slide.content,
-                          isEditMode: true,
-                          slideIndex: slide.index,
-                        })
-                      : null}
-                  </SlideErrorBoundary>
-                </TiptapTextReplacer>
-              </LatexTextReplacer>
-            </TextStyleReplacer>
-          </EditableLayoutWrapper>
+          <ResponsiveImages slideData={slide.content} consumer={imageConsumer}>
+            <EditableLayoutWrapper
+              slideIndex={slide.index}
+              slideData={slide.content}
+              properties={slide.properties}
+            >
+              <TextStyleReplacer slideData={slide.content} properties={slide.properties}>
+                <LatexTextReplacer slideData={slide.content}>
+                  <TiptapTextReplacer
+                    key={slide.id}
+                    slideData={slide.content}
+                    slideIndex={slide.index}
+                    properties={slide.properties}
+                    onContentChange={(
+                      content: string,
+                      dataPath: string,
+                      slideIndex?: number
+                    ) => {
+                      if (dataPath && slideIndex !== undefined) {
+                        dispatch(
+                          updateSlideContent({
+                            slideIndex: slideIndex,
+                            dataPath: dataPath,
+                            content: content,
+                          })
+                        );
+                      }
+                    }}
+                    onTextStyleChange={(dataPath, style, slideIndex) => {
+                      if (!dataPath || slideIndex === undefined) return;
+                      dispatch(updateTextStyle({ slideIndex, dataPath, style }));
+                    }}
+                  >
+                    <SlideErrorBoundary label={`Slide ${slide.index + 1}`}>
+                      {(Layout as any)
+                        ? React.createElement(Layout as any, {
+                            data: slide.content,
+                            isEditMode: true,
+                            slideIndex: slide.index,
+                          })
+                        : null}
+                    </SlideErrorBoundary>
+                  </TiptapTextReplacer>
+                </LatexTextReplacer>
+              </TextStyleReplacer>
+            </EditableLayoutWrapper>
+          </ResponsiveImages>
         );
       }
       return (
-        <TextStyleReplacer slideData={slide.content} properties={slide.properties}>
-          <LatexTextReplacer slideData={slide.content}>
-            <SlideErrorBoundary label={`Slide ${slide.index + 1}`}>
-              {(Layout as any)
-                ? React.createElement(Layout as any, {
-                    data: slide.content,
-                    isEditMode: false,
-                    slideIndex: slide.index,
-                  })
-                : null}
-            </SlideErrorBoundary>
-          </LatexTextReplacer>
-        </TextStyleReplacer>
+        <ResponsiveImages slideData={slide.content} consumer={imageConsumer}>
+          <TextStyleReplacer slideData={slide.content} properties={slide.properties}>
+            <LatexTextReplacer slideData={slide.content}>
+              <SlideErrorBoundary label={`Slide ${slide.index + 1}`}>
+                {(Layout as any)
+                  ? React.createElement(Layout as any, {
+                      data: slide.content,
+                      isEditMode: false,
+                      slideIndex: slide.index,
+                    })
+                  : null}
+              </SlideErrorBoundary>
+            </LatexTextReplacer>
+          </TextStyleReplacer>
+        </ResponsiveImages>
       );
     };
   }, [getTemplateLayout, dispatch]);
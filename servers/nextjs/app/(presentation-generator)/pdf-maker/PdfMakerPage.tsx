@@ -14,6 +14,10 @@ import { useLayout } from "../context/LayoutContext";
 import { useFontLoader } from "../hooks/useFontLoader";
 import { useTemplateLayouts } from "../hooks/useTemplateLayouts";
 import SlideViewport from "../components/SlideViewport";
+import {
+  getSlideImageSources,
+  prefetchImageDerivatives,
+} from "../components/ResponsiveImages";
 
 
 
@@ -99,6 +103,11 @@ const PresentationPage = ({ presentation_id }: { presentation_id: string }) => {
   const fetchUserSlides = async () => {
     try {
       const data = await DashboardApi.getPresentation(presentation_id);
+      // Slides then render with their resized variants and never load originals
+      await prefetchImageDerivatives(
+        getSlideImageSources(data?.slides),
+        "pdf"
+      ).catch(() => {});
       dispatch(setPresentationData(data));
       setContentLoading(false);
     } catch (error) {
@@ -167,7 +176,7 @@ const PresentationPage = ({ presentation_id }: { presentation_id: string }) => {
                     // [data-speaker-note] is used to extract the speaker note from the slide for export to pptx
                     <div key={index} className="w-full" data-speaker-note={slide.speaker_note}>
                       <SlideViewport className="shadow-none border-0">
-                        {renderSlideContent(slide, false)}
+                        {renderSlideContent(slide, false, "pdf")}
                       </SlideViewport>
                     </div>
                   ))}
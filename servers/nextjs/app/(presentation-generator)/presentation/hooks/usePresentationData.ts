@@ -4,6 +4,10 @@ import { toast } from "sonner";
 import { setPresentationData } from "@/store/slices/presentationGeneration";
 import { DashboardApi } from '../../services/api/dashboard';
 import {  clearHistory } from "@/store/slices/undoRedoSlice";
+import {
+  getSlideImageSources,
+  prefetchImageDerivatives,
+} from "../../components/ResponsiveImages";
 
 
 export const usePresentationData = (
@@ -17,6 +21,11 @@ export const usePresentationData = (
     try {
       const data = await DashboardApi.getPresentation(presentationId);
       if (data) {
+        // One small request, so the slides' first render uses resized images
+        await prefetchImageDerivatives(
+          getSlideImageSources(data.slides),
+          "editor"
+        ).catch(() => {});
         dispatch(setPresentationData(data));
         dispatch(clearHistory());
         setLoading(false);
@@ -1,6 +1,6 @@
-import { getHeaderForFormData } from "./header";
+import { getHeader, getHeaderForFormData } from "./header";
 import { ApiResponseHandler } from "./api-error-handler";
-import { ImageAssetResponse } from "./types";
+import { ImageAssetResponse, ImageVariant } from "./types";
 
 
 export class ImagesApi {
@@ -53,6 +53,17 @@ export class ImagesApi {
       throw error;
     }
   }
-}
-
 
+  // Resized variants of slide images by source URL; sources without any are left out
+  static async getImageDerivatives(
+    sources: string[],
+    consumer: "editor" | "pdf"
+  ): Promise<Record<string, ImageVariant[]>> {
+    const response = await fetch(`/api/v1/ppt/images/derivatives`, {
+      method: "POST",
+      headers: getHeader(),
+      body: JSON.stringify({ sources, consumer }),
+    });
+    return await ApiResponseHandler.handleResponse(response, "Failed to get image derivatives") as Record<string, ImageVariant[]>;
+  }
+}
@@ -35,4 +35,9 @@ export interface ImageAssetResponse {
       source?: string;
       [key: string]: any;
   };
-}
\ No newline at end of file
+}
+
+export interface ImageVariant {
+  url: string;
+  width: number;
+}